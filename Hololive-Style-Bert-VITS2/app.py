@@ -3,12 +3,17 @@ print("Starting up. Please be patient...")
 import argparse
 import datetime
 import os
+import string
 import sys
+import threading
+import warnings
+from collections import Counter, OrderedDict
 from typing import Optional
 import json
 import utils
 
 import gradio as gr
+from gradio.processing_utils import convert_to_16_bit_wav
 import torch
 import yaml
 
@@ -25,8 +30,9 @@ from common.constants import (
     Languages,
 )
 from common.log import logger
-from common.tts_model import ModelHolder
+from common.tts_model import DEFAULT_MAX_BATCH_SIZE, ModelHolder
 from infer import InvalidToneError
+from text import bert_cache
 from text.japanese import g2kata_tone, kata_tone2phone_tone, text_normalize
 
 # Here we go again with NLTK's bullshit.
@@ -42,6 +48,51 @@ with open(os.path.join("configs", "paths.yml"), "r", encoding="utf-8") as f:
     # dataset_root = path_config["dataset_root"]
     assets_root = path_config["assets_root"]
 
+# Jobs their client gave up on, oldest first; the VTuber sends its Gradio
+# session hash as job_id and reports a cancelled job through cancel_tts
+MAX_CANCELLED_JOBS = 1024
+cancelled_jobs: "OrderedDict[str, None]" = OrderedDict()
+cancelled_jobs_lock = threading.Lock()
+
+
+def cancel_tts(job_id):
+    """Mark a job as cancelled, so it is skipped if it has not been synthesized yet."""
+    if job_id:
+        with cancelled_jobs_lock:
+            cancelled_jobs[job_id] = None
+            while len(cancelled_jobs) > MAX_CANCELLED_JOBS:
+                cancelled_jobs.popitem(last=False)
+        logger.info(f"Job {job_id[:8]} cancelled by its client")
+    return "Cancelled"
+
+
+def is_cancelled(job_id) -> bool:
+    if not job_id:
+        return False
+    with cancelled_jobs_lock:
+        return job_id in cancelled_jobs
+
+
+# How many requests each batched forward pass synthesized (size -> count)
+batch_sizes: Counter = Counter()
+
+
+def check_text(text) -> Optional[str]:
+    """Return why the text cannot be synthesized, or None."""
+    # 수정: 텍스트 길이 검증 - 공백 제거 후 확인
+    text_stripped = text.strip()
+    if len(text_stripped) < 2:
+        return "Please enter some text."
+
+    # 수정: 텍스트가 구두점만으로 이루어져 있는지 확인
+    if all(c in string.punctuation + string.whitespace for c in text_stripped):
+        return "Please enter some meaningful text (not just punctuation)."
+
+    if is_hf_spaces and len(text) > limit:
+        return f"Too long! There is a character limit of {limit} characters."
+    return None
+
+
 def tts_fn(
     model_name,
     model_path,
@@ -62,27 +113,17 @@ def tts_fn(
     kata_tone_json_str,
     use_tone,
     speaker,
+    job_id="",
 ):
-    # 수정: 텍스트 길이 검증 - 공백 제거 후 확인
-    text_stripped = text.strip()
-    if len(text_stripped) < 2:
-        return "Please enter some text.", None, kata_tone_json_str
-    
-    # 수정: 텍스트가 구두점만으로 이루어져 있는지 확인
-    import string
-    if all(c in string.punctuation + string.whitespace for c in text_stripped):
-        return "Please enter some meaningful text (not just punctuation).", None, kata_tone_json_str
-    
-    if is_hf_spaces and len(text) > limit:
-        return f"Too long! There is a character limit of {limit} characters.", None, kata_tone_json_str
-
-    if(not model_holder.current_model):
-        model_holder.load_model_gr(model_name, model_path)
-        logger.info(f"Loaded model '{model_name}'")
-    if(model_holder.current_model.model_path != model_path):
-        model_holder.load_model_gr(model_name, model_path)
-        logger.info(f"Swapped to model '{model_name}'")
-    speaker_id = model_holder.current_model.spk2id[speaker]
+    if is_cancelled(job_id):
+        return "Cancelled", None, kata_tone_json_str
+    text_error = check_text(text)
+    if text_error is not None:
+        return text_error, None, kata_tone_json_str
+
+    # Models stay resident in the holder's LRU, so switching voices is a lookup
+    model = model_holder.get_model(model_name, model_path)
+    speaker_id = model.spk2id[speaker]
     start_time = datetime.datetime.now()
 
     wrong_tone_message = ""
@@ -115,7 +156,7 @@ def tts_fn(
         tone = [t for _, t in phone_tone]
     
     try:
-        sr, audio = model_holder.current_model.infer(
+        sr, audio = model.infer(
             text=text,
             language=language,
             reference_audio_path=reference_audio_path,
@@ -161,6 +202,116 @@ def tts_fn(
         message = wrong_tone_message + "\n" + message
     return message, (sr, audio), kata_tone_json_str
 
+
+def tts_fn_batch(*columns):
+    """
+    Batched `tts_fn` for Gradio's queue, which gathers concurrent requests.
+
+    Plain requests (a single line, no reference audio or tone) that share
+    the model, language and synthesis settings are synthesized in one forward
+    pass; everything else goes through `tts_fn` one by one. Requests whose
+    client cancelled them in the meantime are skipped.
+
+    Args:
+        columns: One list per `tts_fn` argument, one entry per request
+
+    Returns:
+        tuple[list, list, list]: Messages, audios and kata tone JSON strings
+    """
+    requests = list(zip(*columns))
+    outputs = [None] * len(requests)
+    groups: dict[tuple, list[int]] = {}
+    for i, request in enumerate(requests):
+        (
+            model_name, model_path, text, language, reference_audio_path,
+            sdp_ratio, noise_scale, noise_scale_w, length_scale, line_split,
+            _, assist_text, assist_text_weight, use_assist_text, _, _,
+            kata_tone_json_str, use_tone, _, _,
+        ) = request
+        # A single line synthesizes the same with or without line_split
+        if (
+            (line_split and "\n" in text.strip())
+            or reference_audio_path
+            or (use_tone and kata_tone_json_str != "")
+            or check_text(text) is not None
+        ):
+            outputs[i] = tts_fn(*request)
+            continue
+        key = (
+            model_name, model_path, language, sdp_ratio, noise_scale,
+            noise_scale_w, length_scale,
+            assist_text if use_assist_text else None, assist_text_weight,
+        )
+        groups.setdefault(key, []).append(i)
+
+    for key, indices in groups.items():
+        (
+            model_name, model_path, language, sdp_ratio, noise_scale,
+            noise_scale_w, length_scale, assist_text, assist_text_weight,
+        ) = key
+        # Checked again here, as earlier groups may have taken a while
+        for i in indices:
+            if is_cancelled(requests[i][19]):
+                outputs[i] = ("Cancelled", None, requests[i][16])
+        indices = [i for i in indices if outputs[i] is None]
+        if not indices:
+            continue
+        batch = [requests[i] for i in indices]
+        start_time = datetime.datetime.now()
+        try:
+            model = model_holder.get_model(model_name, model_path)
+            audios = model.infer_batch(
+                [r[2].strip() if r[9] else r[2] for r in batch],
+                language=language,
+                sid=[model.spk2id[r[18]] for r in batch],
+                sdp_ratio=sdp_ratio,
+                noise=noise_scale,
+                noisew=noise_scale_w,
+                length=length_scale,
+                assist_text=assist_text,
+                assist_text_weight=assist_text_weight,
+                use_assist_text=assist_text is not None,
+                style=[r[14] for r in batch],
+                style_weight=[r[15] for r in batch],
+                max_batch_size=max_batch_size,
+            )
+        except Exception as e:
+            logger.warning(f"Batched synthesis failed ({e}). Falling back to tts_fn.")
+            audios = [None] * len(batch)
+        duration = (datetime.datetime.now() - start_time).total_seconds()
+        batch_sizes[len(batch)] += 1
+        logger.info(f"Batched inference of {len(batch)} requests took {duration}s")
+
+        for i, request, audio in zip(indices, batch, audios):
+            if audio is None:
+                outputs[i] = tts_fn(*request)
+                continue
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                audio = convert_to_16_bit_wav(audio)
+            text = request[2]
+            kata_tone_json_str = ""
+            if language == "JP":
+                kata_tone = g2kata_tone(text_normalize(text))
+                kata_tone_json_str = json.dumps(kata_tone, ensure_ascii=False)
+            outputs[i] = (
+                f"Success, time: {duration} seconds.",
+                (model.hps.data.sampling_rate, audio),
+                kata_tone_json_str,
+            )
+
+    messages, audios, tones = zip(*outputs)
+    return list(messages), list(audios), list(tones)
+
+def bert_cache_stats():
+    """Hit-rate statistics of the BERT feature caches, for monitoring."""
+    return bert_cache.stats()
+
+
+def batch_stats():
+    """Number of batched forward passes per batch size, for monitoring."""
+    return {str(size): count for size, count in sorted(batch_sizes.items())}
+
 def load_voicedata():
     print("Loading voice data...")
     envoices = []
@@ -237,8 +388,34 @@ if __name__ == "__main__":
         default=False,
         help="Do not launch app automatically",
     )
+    parser.add_argument(
+        "--max-resident-mb",
+        type=int,
+        default=4096,
+        help="Memory budget for loaded models in MiB (0 for unlimited)",
+    )
+    parser.add_argument(
+        "--pin-models",
+        nargs="*",
+        default=[],
+        help="Model names to keep loaded at all times (e.g. the EN and JP voices)",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=DEFAULT_MAX_BATCH_SIZE,
+        help="Most concurrent requests synthesized together in one forward pass",
+    )
+    parser.add_argument(
+        "--bert-cache-size",
+        type=int,
+        default=bert_cache.DEFAULT_FEATURE_CACHE_SIZE,
+        help="Sentences whose BERT features are kept for reuse (0 to disable)",
+    )
     args = parser.parse_args()
     model_dir = args.dir
+    max_batch_size = max(1, args.max_batch_size)
+    bert_cache.features.resize(args.bert_cache_size)
     print(model_dir)
 
     if args.cpu:
@@ -246,7 +423,12 @@ if __name__ == "__main__":
     else:
         device = "cuda" if torch.cuda.is_available() else "cpu"
 
-    model_holder = ModelHolder(model_dir, device)
+    model_holder = ModelHolder(
+        model_dir,
+        device,
+        max_resident_bytes=args.max_resident_mb * 2**20,
+        pinned_model_names=args.pin_models,
+    )
 
     languages = ["EN", "JP", "ZH"]
     langnames = ["English", "Japanese"]
@@ -257,6 +439,7 @@ if __name__ == "__main__":
         sys.exit(1)
     initial_id = 0
     initial_pth_files = model_holder.model_files_dict[model_names[initial_id]]
+    model_holder.preload_pinned()
     #print(initial_pth_files)
 
     voicedata, styledict = load_voicedata()
@@ -312,6 +495,8 @@ if __name__ == "__main__":
             visible=False
         )
         use_tone = gr.Checkbox(label="Use accent adjustment", value=False, visible=False)
+        # Set by API clients so they can cancel the job (see cancel_tts)
+        job_id = gr.Textbox(value="", visible=False)
 
         #for (name, model_path, voice_name, speakerid, datasetauthor, image) in voicedata:
         for vi in range(len(voicedata)):
@@ -351,7 +536,7 @@ if __name__ == "__main__":
                                 audio_output = gr.Audio(label="Result")
 
                                 tts_button.click(
-                                    tts_fn,
+                                    tts_fn_batch,
                                     inputs=[
                                         mn,
                                         mp,
@@ -372,8 +557,11 @@ if __name__ == "__main__":
                                         tone,
                                         use_tone,
                                         spk,
+                                        job_id,
                                     ],
                                     outputs=[text_output, audio_output, tone],
+                                    batch=True,
+                                    max_batch_size=max_batch_size,
                                 )
 
         with gr.Row():
@@ -394,6 +582,33 @@ if __name__ == "__main__":
         with gr.Accordion("Styling Guide", open=False):
             gr.Markdown(style_md)
 
+        # API only: /api/bert_cache_stats
+        cache_stats_button = gr.Button(visible=False)
+        cache_stats_button.click(
+            bert_cache_stats,
+            outputs=[gr.JSON(visible=False)],
+            api_name="bert_cache_stats",
+        )
+
+        # API only: /api/batch_stats
+        batch_stats_button = gr.Button(visible=False)
+        batch_stats_button.click(
+            batch_stats,
+            outputs=[gr.JSON(visible=False)],
+            api_name="batch_stats",
+        )
+
+        # API only: /api/cancel_tts, outside the queue so it is not stuck
+        # behind the jobs it cancels
+        cancel_button = gr.Button(visible=False)
+        cancel_button.click(
+            cancel_tts,
+            inputs=[job_id],
+            outputs=[gr.Textbox(visible=False)],
+            api_name="cancel_tts",
+            queue=False,
+        )
+
     # 수정: WebSocket 403 에러 해결을 위해 CORS 미들웨어 추가
     # Gradio의 user_middleware를 사용하여 launch() 전에 미들웨어 추가
     from starlette.middleware.cors import CORSMiddleware
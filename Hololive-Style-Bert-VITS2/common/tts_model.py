@@ -2,12 +2,14 @@ import numpy as np
 import gradio as gr
 import torch
 import os
+import threading
 import warnings
+from collections import OrderedDict
 from gradio.processing_utils import convert_to_16_bit_wav
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 
 import utils
-from infer import get_net_g, infer
+from infer import get_net_g, infer, infer_batch
 from models import SynthesizerTrn
 from models_jp_extra import SynthesizerTrn as SynthesizerTrnJPExtra
 
@@ -24,6 +26,9 @@ from .constants import (
     DEFAULT_STYLE_WEIGHT,
 )
 
+# Sentences synthesized together in one forward pass
+DEFAULT_MAX_BATCH_SIZE = 8
+
 
 
 print("DEBUG: common/tts_model.py is loaded!")
@@ -66,6 +71,17 @@ class Model:
             hps=self.hps,
         )
 
+    def unload_net_g(self):
+        self.net_g = None
+
+    def memory_bytes(self) -> int:
+        """Approximate resident size of the loaded weights (0 if not loaded)."""
+        if self.net_g is None:
+            return 0
+        params = sum(p.numel() * p.element_size() for p in self.net_g.parameters())
+        buffers = sum(b.numel() * b.element_size() for b in self.net_g.buffers())
+        return params + buffers
+
     def get_style_vector(self, style_id: int, weight: float = 1.0) -> np.ndarray:
         mean = self.style_vectors[0]
         style_vec = self.style_vectors[style_id]
@@ -82,6 +98,106 @@ class Model:
         xvec = mean + (xvec - mean) * weight
         return xvec
 
+    def infer_batch(
+        self,
+        texts: List[str],
+        language: str = "JP",
+        sid: Union[int, List[int]] = 0,
+        sdp_ratio: float = DEFAULT_SDP_RATIO,
+        noise: float = DEFAULT_NOISE,
+        noisew: float = DEFAULT_NOISEW,
+        length: float = DEFAULT_LENGTH,
+        assist_text: Optional[str] = None,
+        assist_text_weight: float = DEFAULT_ASSIST_TEXT_WEIGHT,
+        use_assist_text: bool = False,
+        style: Union[str, List[str]] = DEFAULT_STYLE,
+        style_weight: Union[float, List[float]] = DEFAULT_STYLE_WEIGHT,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Synthesize several sentences, up to `max_batch_size` per forward pass.
+
+        Speaker and style may be given per sentence; the other settings are
+        shared. A chunk that fails as a batch is retried sentence by sentence.
+
+        Returns:
+            List[Optional[np.ndarray]]: Float audio per sentence, None where
+            synthesis failed or produced silence
+        """
+        if language != "JP" and self.hps.version.endswith("JP-Extra"):
+            raise ValueError(
+                "The model is trained with JP-Extra, but the language is not JP"
+            )
+        if assist_text == "" or not use_assist_text:
+            assist_text = None
+        if self.net_g is None:
+            self.load_net_g()
+
+        n = len(texts)
+        sids = sid if isinstance(sid, list) else [sid] * n
+        styles = style if isinstance(style, list) else [style] * n
+        weights = style_weight if isinstance(style_weight, list) else [style_weight] * n
+        style_vecs = [
+            self.get_style_vector(self.style2id[s], w) for s, w in zip(styles, weights)
+        ]
+
+        def _valid(audio):
+            return audio is not None and len(audio) > 0 and not np.all(audio == 0)
+
+        results: List[Optional[np.ndarray]] = [None] * n
+        step = max(1, max_batch_size)
+        with torch.no_grad():
+            for start in range(0, n, step):
+                end = min(start + step, n)
+                try:
+                    audios = infer_batch(
+                        texts=texts[start:end],
+                        style_vecs=style_vecs[start:end],
+                        sdp_ratio=sdp_ratio,
+                        noise_scale=noise,
+                        noise_scale_w=noisew,
+                        length_scale=length,
+                        sids=sids[start:end],
+                        language=language,
+                        hps=self.hps,
+                        net_g=self.net_g,
+                        device=self.device,
+                        assist_text=assist_text,
+                        assist_text_weight=assist_text_weight,
+                    )
+                except Exception as e:
+                    # e.g. one sentence without phonemes; the others still work
+                    logger.warning(f"Batched inference failed ({e}). Retrying one by one.")
+                    audios = [None] * (end - start)
+                for i, audio in enumerate(audios, start):
+                    if _valid(audio):
+                        results[i] = audio
+                        continue
+                    try:
+                        audio = infer(
+                            text=texts[i],
+                            sdp_ratio=sdp_ratio,
+                            noise_scale=noise,
+                            noise_scale_w=noisew,
+                            length_scale=length,
+                            sid=sids[i],
+                            language=language,
+                            hps=self.hps,
+                            net_g=self.net_g,
+                            device=self.device,
+                            assist_text=assist_text,
+                            assist_text_weight=assist_text_weight,
+                            style_vec=style_vecs[i],
+                        )
+                    except Exception as e:
+                        logger.error(f"Error generating audio for segment '{texts[i]}': {e}")
+                        continue
+                    if _valid(audio):
+                        results[i] = audio
+                    else:
+                        logger.warning(f"Segment {i} '{texts[i]}' produced empty audio.")
+        return results
+
     def infer(
         self,
         text: str,
@@ -194,8 +310,34 @@ class Model:
                     return (self.hps.data.sampling_rate, audio)
                 
                 audios = []
+                # Segments left for the one-by-one loop (tones, reference audio)
+                remaining = texts
                 with torch.no_grad():
-                    for i, t in enumerate(texts):
+                    if given_tone is None and reference_audio_path is None:
+                        # All segments in as few forward passes as possible
+                        segments = self.infer_batch(
+                            texts,
+                            language=language,
+                            sid=sid,
+                            sdp_ratio=sdp_ratio,
+                            noise=noise,
+                            noisew=noisew,
+                            length=length,
+                            assist_text=assist_text,
+                            assist_text_weight=assist_text_weight,
+                            use_assist_text=assist_text is not None,
+                            style=style,
+                            style_weight=style_weight,
+                        )
+                        for i, audio_segment in enumerate(segments):
+                            if audio_segment is None:
+                                logger.warning(f"Skipping segment {i} '{texts[i]}' due to empty audio.")
+                                continue
+                            audios.append(audio_segment)
+                            if i != len(texts) - 1:
+                                audios.append(np.zeros(int(44100 * split_interval)))
+                        remaining = []
+                    for i, t in enumerate(remaining):
                         try:
                             logger.info(f"DEBUG: Processing segment {i}: '{t}'")
                             
@@ -276,19 +418,42 @@ class Model:
 
 
 class ModelHolder:
-    def __init__(self, root_dir: str, device: str):
+    """
+    Keeps several `Model` instances resident at once, keyed by model path.
+
+    Models are evicted least-recently-used first once the total size of the
+    loaded weights exceeds `max_resident_bytes` (0 disables the budget).
+    Pinned models (by model name) are never evicted, so voices that are used
+    alternately (e.g. the EN and JP voices of one character) stay loaded.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        device: str,
+        max_resident_bytes: int = 0,
+        pinned_model_names: Optional[Iterable[str]] = None,
+    ):
         self.root_dir: str = root_dir
         self.device: str = device
+        self.max_resident_bytes: int = max_resident_bytes
+        self.pinned_model_names: set[str] = set(pinned_model_names or [])
         self.model_files_dict: Dict[str, List[str]] = {}
         self.current_model: Optional[Model] = None
         self.model_names: List[str] = []
         self.models: List[Model] = []
+        # model path -> (model name, Model), ordered from least to most recently used
+        self.loaded_models: "OrderedDict[str, tuple[str, Model]]" = OrderedDict()
+        self._lock = threading.RLock()
+        # model path -> lock held while that file loads, outside self._lock
+        self._load_locks: Dict[str, threading.Lock] = {}
         self.refresh()
 
     def refresh(self):
         self.model_files_dict = {}
         self.model_names = []
         self.current_model = None
+        self.unload_all()
         model_dirs = [
             d
             for d in os.listdir(self.root_dir)
@@ -309,33 +474,142 @@ class ModelHolder:
             self.model_files_dict[model_name] = model_files
             self.model_names.append(model_name)
 
-    def load_model_gr(
-        self, model_name: str, model_path: str
-    ) -> tuple[gr.Dropdown, gr.Button, gr.Dropdown]:
+    @staticmethod
+    def _cache_key(model_path: str) -> str:
+        # The same file may be referenced by relative, absolute or Windows-style paths
+        return os.path.normcase(os.path.realpath(model_path))
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(model.memory_bytes() for _, model in self.loaded_models.values())
+
+    def pin_model(self, model_name: str) -> None:
+        """Pin a model name so its loaded files are never evicted."""
         if model_name not in self.model_files_dict:
             raise ValueError(f"Model `{model_name}` is not found")
-        #if model_path not in self.model_files_dict[model_name]:
-        #    raise ValueError(f"Model file `{model_path}` is not found")
-        if (
-            self.current_model is not None
-            and self.current_model.model_path == model_path
-        ):
-            # Already loaded
-            speakers = list(self.current_model.spk2id.keys())
-            styles = list(self.current_model.style2id.keys())
-            return (
-                gr.Dropdown(choices=styles, value=styles[0]),
-                gr.Button(interactive=True, value="音声合成"),
-                gr.Dropdown(choices=speakers, value=speakers[0]),
+        with self._lock:
+            self.pinned_model_names.add(model_name)
+
+    def unpin_model(self, model_name: str) -> None:
+        with self._lock:
+            self.pinned_model_names.discard(model_name)
+            self._evict()
+
+    def configured_model_path(self, model_name: str) -> Optional[str]:
+        """The checkpoint voicelist.json voices use: `<name>/<name>.safetensors`.
+
+        Falls back to the only file of the model directory; None if that is
+        ambiguous.
+        """
+        model_files = self.model_files_dict.get(model_name, [])
+        for model_path in model_files:
+            if os.path.basename(model_path) == f"{model_name}.safetensors":
+                return model_path
+        return model_files[0] if len(model_files) == 1 else None
+
+    def preload_pinned(self) -> None:
+        """Load the configured file of every pinned model so the first request is not a cold start."""
+        for model_name in sorted(self.pinned_model_names):
+            if model_name not in self.model_files_dict:
+                logger.warning(f"Pinned model `{model_name}` is not found, so skip it")
+                continue
+            model_path = self.configured_model_path(model_name)
+            if model_path is None:
+                logger.warning(
+                    f"Pinned model `{model_name}` has no {model_name}.safetensors, "
+                    "so it is loaded on first use"
+                )
+                continue
+            self.get_model(model_name, model_path)
+
+    def get_model(self, model_name: str, model_path: str) -> Model:
+        """Return the resident model for `model_path`, loading it if needed.
+
+        The checkpoint is loaded outside the holder lock, so requests for
+        models that are already resident do not wait for it.
+        """
+        if model_name not in self.model_files_dict:
+            raise ValueError(f"Model `{model_name}` is not found")
+        key = self._cache_key(model_path)
+        with self._lock:
+            model = self._get_resident(key)
+            if model is not None:
+                return model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given file; the others wait and reuse it
+        with load_lock:
+            with self._lock:
+                model = self._get_resident(key)
+                if model is not None:
+                    return model
+
+            logger.info(f"Loading model '{model_name}' from {model_path}")
+            model = Model(
+                model_path=model_path,
+                config_path=os.path.join(self.root_dir, model_name, "config.json"),
+                style_vec_path=os.path.join(
+                    self.root_dir, model_name, "style_vectors.npy"
+                ),
+                device=self.device,
             )
-        self.current_model = Model(
-            model_path=model_path,
-            config_path=os.path.join(self.root_dir, model_name, "config.json"),
-            style_vec_path=os.path.join(self.root_dir, model_name, "style_vectors.npy"),
-            device=self.device,
-        )
-        speakers = list(self.current_model.spk2id.keys())
-        styles = list(self.current_model.style2id.keys())
+            model.load_net_g()
+
+            with self._lock:
+                self.loaded_models[key] = (model_name, model)
+                self.current_model = model
+                self._evict()
+                logger.info(
+                    f"Resident models: {len(self.loaded_models)} "
+                    f"({self.resident_bytes() / 2**20:.1f} MiB)"
+                )
+            return model
+
+    def _get_resident(self, key: str) -> Optional[Model]:
+        """Mark a loaded model as most recently used and return it. Call with self._lock held."""
+        entry = self.loaded_models.get(key)
+        if entry is None:
+            return None
+        self.loaded_models.move_to_end(key)
+        self.current_model = entry[1]
+        return entry[1]
+
+    def _evict(self) -> None:
+        if self.max_resident_bytes <= 0:
+            return
+        evicted = False
+        while self.resident_bytes() > self.max_resident_bytes:
+            victim = next(
+                (
+                    key
+                    for key, (name, model) in self.loaded_models.items()
+                    if name not in self.pinned_model_names
+                    and model is not self.current_model
+                ),
+                None,
+            )
+            if victim is None:
+                break
+            # Only drop the reference: a request may still be inferring with
+            # this model, and its weights are freed once that request is done
+            name, model = self.loaded_models.pop(victim)
+            evicted = True
+            logger.info(f"Evicted model '{name}' ({model.model_path}) from memory")
+        if evicted and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def unload_all(self) -> None:
+        with self._lock:
+            # As in _evict, models still in use are freed when their requests end
+            self.loaded_models.clear()
+            self.current_model = None
+
+    def load_model_gr(
+        self, model_name: str, model_path: str
+    ) -> tuple[gr.Dropdown, gr.Button, gr.Dropdown]:
+        model = self.get_model(model_name, model_path)
+        speakers = list(model.spk2id.keys())
+        styles = list(model.style2id.keys())
         return (
             gr.Dropdown(choices=styles, value=styles[0]),
             gr.Button(interactive=True, value="音声合成"),
@@ -1,3 +1,4 @@
+import numpy as np
 import torch
 
 import commons
@@ -119,17 +120,10 @@ def get_text(
     return bert, ja_bert, en_bert, phone, tone, language
 
 
-def infer(
+def prepare_text_inputs(
     text,
-    style_vec,
-    sdp_ratio,
-    noise_scale,
-    noise_scale_w,
-    length_scale,
-    sid: int,  # In the original Bert-VITS2, its speaker_name: str, but here it's id
-    language,
+    language_str,
     hps,
-    net_g,
     device,
     skip_start=False,
     skip_end=False,
@@ -137,10 +131,10 @@ def infer(
     assist_text_weight=0.7,
     given_tone=None,
 ):
-    is_jp_extra = hps.version.endswith("JP-Extra")
+    """`get_text` plus the start/end trimming of `infer`, for one sentence."""
     bert, ja_bert, en_bert, phones, tones, lang_ids = get_text(
         text,
-        language,
+        language_str,
         hps,
         device,
         assist_text=assist_text,
@@ -183,6 +177,39 @@ def infer(
             target_len,
         )
         en_bert = torch.zeros(en_bert.shape[0], target_len)
+    return bert, ja_bert, en_bert, phones, tones, lang_ids
+
+
+def infer(
+    text,
+    style_vec,
+    sdp_ratio,
+    noise_scale,
+    noise_scale_w,
+    length_scale,
+    sid: int,  # In the original Bert-VITS2, its speaker_name: str, but here it's id
+    language,
+    hps,
+    net_g,
+    device,
+    skip_start=False,
+    skip_end=False,
+    assist_text=None,
+    assist_text_weight=0.7,
+    given_tone=None,
+):
+    is_jp_extra = hps.version.endswith("JP-Extra")
+    bert, ja_bert, en_bert, phones, tones, lang_ids = prepare_text_inputs(
+        text,
+        language,
+        hps,
+        device,
+        skip_start=skip_start,
+        skip_end=skip_end,
+        assist_text=assist_text,
+        assist_text_weight=assist_text_weight,
+        given_tone=given_tone,
+    )
     with torch.no_grad():
         x_tst = phones.to(device).unsqueeze(0)
         tones = tones.to(device).unsqueeze(0)
@@ -303,6 +330,126 @@ def infer(
         return audio
 
 
+def infer_batch(
+    texts,
+    style_vecs,
+    sdp_ratio,
+    noise_scale,
+    noise_scale_w,
+    length_scale,
+    sids,
+    language,
+    hps,
+    net_g,
+    device,
+    assist_text=None,
+    assist_text_weight=0.7,
+):
+    """
+    Synthesize several sentences with a single `net_g.infer` call.
+
+    The phone, tone, language and BERT sequences are zero-padded to the
+    longest sentence and `x_lengths` masks the padding, so each sentence is
+    synthesized as if alone; the batch output is cut back per sentence by
+    its predicted frame count (`y_lengths`). Noise and length settings are
+    shared by the batch, while speaker and style may differ per sentence.
+    Apart from the last few milliseconds of each shorter sentence, where the
+    decoder's convolutions see padded frames instead of zero padding, the
+    audio is the same as `infer` gives.
+
+    Args:
+        texts: Sentences to synthesize
+        style_vecs: One style vector per sentence, or one for all
+        sids: One speaker id per sentence, or one for all
+        language: Language of every sentence
+
+    Returns:
+        list[np.ndarray]: One waveform per sentence, in order
+    """
+    is_jp_extra = hps.version.endswith("JP-Extra")
+    n = len(texts)
+    if isinstance(sids, int):
+        sids = [sids] * n
+    style_vecs = np.asarray(style_vecs, dtype=np.float32)
+    if style_vecs.ndim == 1:
+        style_vecs = np.repeat(style_vecs[None, :], n, axis=0)
+
+    items = [
+        prepare_text_inputs(
+            text,
+            language,
+            hps,
+            device,
+            assist_text=assist_text,
+            assist_text_weight=assist_text_weight,
+        )
+        for text in texts
+    ]
+    lengths = [phones.size(0) for _, _, _, phones, _, _ in items]
+    max_len = max(lengths)
+
+    def _pad_seq(index):
+        out = torch.zeros(n, max_len, dtype=torch.long)
+        for i, item in enumerate(items):
+            out[i, : lengths[i]] = item[index]
+        return out
+
+    def _pad_bert(index):
+        out = torch.zeros(n, items[0][index].size(0), max_len)
+        for i, item in enumerate(items):
+            out[i, :, : lengths[i]] = item[index]
+        return out
+
+    with torch.no_grad():
+        x_tst = _pad_seq(3).to(device)
+        tones = _pad_seq(4).to(device)
+        lang_ids = _pad_seq(5).to(device)
+        ja_bert = _pad_bert(1).to(device)
+        x_tst_lengths = torch.LongTensor(lengths).to(device)
+        sid_tensor = torch.LongTensor(sids).to(device)
+        style_vec = torch.from_numpy(style_vecs).to(device)
+        if is_jp_extra:
+            output = net_g.infer(
+                x_tst,
+                x_tst_lengths,
+                sid_tensor,
+                tones,
+                lang_ids,
+                ja_bert,
+                style_vec=style_vec,
+                sdp_ratio=sdp_ratio,
+                noise_scale=noise_scale,
+                noise_scale_w=noise_scale_w,
+                length_scale=length_scale,
+            )
+        else:
+            bert = _pad_bert(0).to(device)
+            en_bert = _pad_bert(2).to(device)
+            output = net_g.infer(
+                x_tst,
+                x_tst_lengths,
+                sid_tensor,
+                tones,
+                lang_ids,
+                bert,
+                ja_bert,
+                en_bert,
+                style_vec=style_vec,
+                sdp_ratio=sdp_ratio,
+                noise_scale=noise_scale,
+                noise_scale_w=noise_scale_w,
+                length_scale=length_scale,
+            )
+        o, _, y_mask, _ = output
+        wav_lengths = (y_mask.sum(dim=(1, 2)).long() * hps.data.hop_length).tolist()
+        wavs = o[:, 0].data.cpu().float().numpy()
+        audios = [wavs[i, : wav_lengths[i]] for i in range(n)]
+        del x_tst, tones, lang_ids, ja_bert, x_tst_lengths, sid_tensor, style_vec, o
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        return audios
+
+
 def infer_multilang(
     text,
     style_vec,
@@ -0,0 +1,100 @@
+"""
+Caches of BERT outputs shared by `japanese_bert` and `english_bert_mock`.
+
+Synthesis repeats itself: the VTuber resends the same short replies and uses
+one constant assist (style) text, and every miss costs a DeBERTa-large
+forward pass. `features` keeps finished phone-level features and
+`assist_means` the mean embedding of each assist text.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from common.log import logger
+
+DEFAULT_FEATURE_CACHE_SIZE = 128
+DEFAULT_ASSIST_CACHE_SIZE = 16
+LOG_INTERVAL = 100  # lookups between hit-rate log lines
+
+
+class BertCache:
+    """Thread-safe LRU of tensors with hit/miss counters."""
+
+    def __init__(self, name: str, max_entries: int):
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a copy of the cached tensor, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            lookups = self.hits + self.misses
+        if lookups % LOG_INTERVAL == 0:
+            logger.info(f"BERT cache: {self.summary()}")
+        # Callers may modify what they get back
+        return None if value is None else value.clone()
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value.clone()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def resize(self, max_entries: int) -> None:
+        """Change the bound; 0 disables the cache."""
+        with self._lock:
+            self.max_entries = max_entries
+            while len(self._entries) > max(0, max_entries):
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (
+            f"{self.name} {s['hit_rate']:.1%} hit ({s['hits']}/{s['hits'] + s['misses']}),"
+            f" {s['entries']}/{s['max_entries']} entries"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+features = BertCache("features", DEFAULT_FEATURE_CACHE_SIZE)
+assist_means = BertCache("assist_means", DEFAULT_ASSIST_CACHE_SIZE)
+
+
+def feature_key(language, text, word2ph, assist_text, assist_text_weight) -> tuple:
+    """Key of the phone-level features of one sentence."""
+    # word2ph is mutated by callers, so key on a snapshot
+    weight = assist_text_weight if assist_text else None
+    return (language, text, tuple(word2ph), assist_text or None, weight)
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Hit-rate statistics of both caches."""
+    return {"features": features.stats(), "assist_means": assist_means.stats()}
@@ -0,0 +1,38 @@
+"""
+Partial-depth loading of the BERT models used for Bert-VITS2 features.
+
+Features are taken from `hidden_states[-3]`, so the last two encoder layers
+and the MLM head never affect them. A model loaded with the encoder cut off
+after that layer returns the feature as its `last_hidden_state`, without
+computing the rest or collecting every hidden state.
+"""
+from transformers import AutoConfig
+
+# Index into `hidden_states` (embeddings, then the output of every layer)
+FEATURE_LAYER = -3
+
+
+def feature_num_layers(path: str, layer: int = FEATURE_LAYER) -> int:
+    """Number of encoder layers needed to produce `hidden_states[layer]`."""
+    num_layers = AutoConfig.from_pretrained(path).num_hidden_layers
+    index = num_layers + 1 + layer if layer < 0 else layer
+    if not 0 < index <= num_layers:
+        raise ValueError(f"hidden_states[{layer}] is not an encoder layer output")
+    return index
+
+
+def load_feature_extractor(model_cls, path: str, layer: int = FEATURE_LAYER, **kwargs):
+    """
+    Load a base (headless) model with only the layers up to `hidden_states[layer]`.
+
+    Weights of the dropped layers and of any task head are skipped.
+
+    Args:
+        model_cls: Base model class, e.g. AutoModel or DebertaV2Model
+        path: Local model directory
+        layer: Hidden state to return as `last_hidden_state`
+        kwargs: Passed to `from_pretrained`
+    """
+    return model_cls.from_pretrained(
+        path, num_hidden_layers=feature_num_layers(path, layer), **kwargs
+    )
@@ -0,0 +1,174 @@
+"""
+Compact, memory-mapped CMU pronouncing dictionary.
+
+Unpickling the whole dictionary into lists of lists costs import time and
+hundreds of MB in every process. Instead, `cmudict.rep` is compiled once into
+a flat file that every process maps read-only and searches lazily:
+
+    magic       8 bytes   b"CMULEX1\\0"
+    count       uint32    number of words N
+    key_offs    uint32 * (N + 1)
+    value_offs  uint32 * (N + 1)
+    keys        UTF-8 words, sorted bytewise, concatenated
+    values      UTF-8 pronunciations in the `cmudict.rep` form
+                ("HH AH0 - L OW1"), concatenated
+
+Offsets are little-endian and relative to the start of their blob.
+
+Build step:
+    python -m text.cmudict_lexicon [--rep text/cmudict.rep] [--out text/cmudict.lex]
+"""
+import argparse
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Optional
+
+MAGIC = b"CMULEX1\0"
+_HEADER = struct.Struct("<8sI")
+_OFFSET = struct.Struct("<I")
+
+current_file_path = os.path.dirname(__file__)
+REP_PATH = os.path.join(current_file_path, "cmudict.rep")
+LEXICON_PATH = os.path.join(current_file_path, "cmudict.lex")
+
+# Entries of cmudict.rep start after its license header
+REP_START_LINE = 49
+
+
+def parse_pronunciation(value: str) -> List[List[str]]:
+    """"EH2 K - S K L AH0" -> [["EH2", "K"], ["S", "K", "L", "AH0"]]"""
+    return [syllable.split(" ") for syllable in value.split(" - ")]
+
+
+def read_rep_entries(rep_path: str = REP_PATH) -> Dict[str, str]:
+    """Words of `cmudict.rep` and their unparsed pronunciations (last one wins)."""
+    entries = {}
+    with open(rep_path) as f:
+        for line_index, line in enumerate(f, 1):
+            if line_index < REP_START_LINE:
+                continue
+            word, value = line.strip().split("  ", 1)
+            entries[word] = value
+    return entries
+
+
+def read_rep(rep_path: str = REP_PATH) -> Dict[str, List[List[str]]]:
+    """`cmudict.rep` parsed into the dict the pickle cache used to hold."""
+    return {w: parse_pronunciation(v) for w, v in read_rep_entries(rep_path).items()}
+
+
+def build_lexicon(rep_path: str = REP_PATH, out_path: str = LEXICON_PATH) -> int:
+    """
+    Compile `cmudict.rep` into the lexicon file.
+
+    Written to a temporary file and renamed, so concurrent builders and
+    readers never see a partial file.
+
+    Returns:
+        int: Number of words written
+    """
+    entries = read_rep_entries(rep_path)
+    items = sorted((w.encode("utf-8"), v.encode("utf-8")) for w, v in entries.items())
+
+    def offsets(blobs):
+        table, position = [0], 0
+        for blob in blobs:
+            position += len(blob)
+            table.append(position)
+        return struct.pack(f"<{len(table)}I", *table)
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(items)))
+        f.write(offsets(k for k, _ in items))
+        f.write(offsets(v for _, v in items))
+        for k, _ in items:
+            f.write(k)
+        for _, v in items:
+            f.write(v)
+    os.replace(tmp_path, out_path)
+    return len(items)
+
+
+class CmuLexicon:
+    """Read-only, dict-like view of a lexicon file (word -> syllables)."""
+
+    def __init__(self, path: str = LEXICON_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a CMU lexicon file: {path}")
+        table_size = (self._count + 1) * _OFFSET.size
+        self._key_offs = _HEADER.size
+        self._value_offs = self._key_offs + table_size
+        self._keys = self._value_offs + table_size
+        self._values = self._keys + self._offset(self._key_offs, self._count)
+
+    def _offset(self, table: int, index: int) -> int:
+        return _OFFSET.unpack_from(self._mm, table + index * _OFFSET.size)[0]
+
+    def _key(self, index: int) -> bytes:
+        start = self._keys + self._offset(self._key_offs, index)
+        end = self._keys + self._offset(self._key_offs, index + 1)
+        return self._mm[start:end]
+
+    def _value(self, index: int) -> str:
+        start = self._values + self._offset(self._value_offs, index)
+        end = self._values + self._offset(self._value_offs, index + 1)
+        return self._mm[start:end].decode("utf-8")
+
+    def _find(self, word: str) -> int:
+        key = word.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key(lo) == key:
+            return lo
+        return -1
+
+    def get(self, word: str, default=None) -> Optional[List[List[str]]]:
+        index = self._find(word)
+        if index < 0:
+            return default
+        return parse_pronunciation(self._value(index))
+
+    def __getitem__(self, word: str) -> List[List[str]]:
+        result = self.get(word)
+        if result is None:
+            raise KeyError(word)
+        return result
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(word) >= 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._key(index).decode("utf-8")
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def load_lexicon(path: str = LEXICON_PATH, rep_path: str = REP_PATH) -> CmuLexicon:
+    """Open the lexicon, building it from `cmudict.rep` on first use."""
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(rep_path):
+        build_lexicon(rep_path, path)
+    return CmuLexicon(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile cmudict.rep into a lexicon")
+    parser.add_argument("--rep", default=REP_PATH, help="Source cmudict.rep")
+    parser.add_argument("--out", default=LEXICON_PATH, help="Lexicon file to write")
+    args = parser.parse_args()
+    count = build_lexicon(args.rep, args.out)
+    print(f"Wrote {count} words to {args.out} ({os.path.getsize(args.out)} bytes)")
@@ -1,15 +1,15 @@
-import pickle
 import os
 import re
+from functools import lru_cache
 from g2p_en import G2p
 from transformers import DebertaV2Tokenizer
 
 from text import symbols
+from text.cmudict_lexicon import load_lexicon, read_rep
 from text.symbols import punctuation
 
 current_file_path = os.path.dirname(__file__)
 CMU_DICT_PATH = os.path.join(current_file_path, "cmudict.rep")
-CACHE_PATH = os.path.join(current_file_path, "cmudict_cache.pickle")
 _g2p = G2p()
 LOCAL_PATH = "./bert/deberta-v3-large"
 tokenizer = DebertaV2Tokenizer.from_pretrained(LOCAL_PATH)
@@ -171,46 +171,24 @@ def replace_punctuation(text):
 
 
 def read_dict():
-    g2p_dict = {}
-    start_line = 49
-    with open(CMU_DICT_PATH) as f:
-        line = f.readline()
-        line_index = 1
-        while line:
-            if line_index >= start_line:
-                line = line.strip()
-                word_split = line.split("  ")
-                word = word_split[0]
+    return read_rep(CMU_DICT_PATH)
 
-                syllable_split = word_split[1].split(" - ")
-                g2p_dict[word] = []
-                for syllable in syllable_split:
-                    phone_split = syllable.split(" ")
-                    g2p_dict[word].append(phone_split)
 
-            line_index = line_index + 1
-            line = f.readline()
-
-    return g2p_dict
-
-
-def cache_dict(g2p_dict, file_path):
-    with open(file_path, "wb") as pickle_file:
-        pickle.dump(g2p_dict, pickle_file)
+def get_dict():
+    # Memory-mapped and looked up lazily; see text/cmudict_lexicon.py
+    return load_lexicon(rep_path=CMU_DICT_PATH)
 
 
-def get_dict():
-    if os.path.exists(CACHE_PATH):
-        with open(CACHE_PATH, "rb") as pickle_file:
-            g2p_dict = pickle.load(pickle_file)
-    else:
-        g2p_dict = read_dict()
-        cache_dict(g2p_dict, CACHE_PATH)
+eng_dict = get_dict()
 
-    return g2p_dict
+# Out-of-vocabulary words seen recently, so the neural G2P runs once per word
+OOV_CACHE_SIZE = 4096
 
 
-eng_dict = get_dict()
+@lru_cache(maxsize=OOV_CACHE_SIZE)
+def oov_g2p(word: str) -> tuple[str, ...]:
+    """Phones predicted by g2p_en for a word missing from the dictionary."""
+    return tuple(p for p in _g2p(word) if p != " ")
 
 
 def refine_ph(phn):
@@ -443,7 +421,7 @@ def g2p(text):
                 temp_tones += tns
                 # w2ph.append(len(phns))
             else:
-                phone_list = list(filter(lambda p: p != " ", _g2p(w)))
+                phone_list = oov_g2p(w)
                 phns = []
                 tns = []
                 for ph in phone_list:
@@ -4,6 +4,8 @@ import torch
 from transformers import DebertaV2Model, DebertaV2Tokenizer
 
 from config import config
+from text import bert_cache
+from text.bert_layers import feature_num_layers
 
 
 LOCAL_PATH = "./bert/deberta-v3-large"
@@ -20,6 +22,13 @@ def get_bert_feature(
     assist_text=None,
     assist_text_weight=0.7,
 ):
+    cache_key = bert_cache.feature_key(
+        "EN", text, word2ph, assist_text, assist_text_weight
+    )
+    cached = bert_cache.features.get(cache_key)
+    if cached is not None:
+        return cached
+
     if (
         sys.platform == "darwin"
         and torch.backends.mps.is_available()
@@ -43,6 +52,8 @@ def get_bert_feature(
         os.environ["ACCELERATE_USE_CPU"] = "1"
         os.environ["TRANSFORMERS_NO_ADVISORY_WARNINGS"] = "1"
         
+        # Encoder up to hidden_states[-3] only
+        num_layers = feature_num_layers(LOCAL_PATH)
         try:
             # 수정: device_map=None과 low_cpu_mem_usage=False를 사용하여
             # 모델이 실제 데이터와 함께 CPU에 로드되도록 함
@@ -50,6 +61,7 @@ def get_bert_feature(
             try:
                 model = DebertaV2Model.from_pretrained(
                     LOCAL_PATH,
+                    num_hidden_layers=num_layers,
                     device_map=None,  # meta device 사용 방지 (명시적)
                     low_cpu_mem_usage=False,  # meta device 사용 방지
                     dtype=torch.float32,  # torch_dtype 대신 dtype 사용
@@ -58,6 +70,7 @@ def get_bert_feature(
                 # 일부 transformers 버전에서는 device_map 파라미터를 지원하지 않을 수 있음
                 model = DebertaV2Model.from_pretrained(
                     LOCAL_PATH,
+                    num_hidden_layers=num_layers,
                     low_cpu_mem_usage=False,
                     dtype=torch.float32,  # torch_dtype 대신 dtype 사용
                 )
@@ -93,6 +106,7 @@ def get_bert_feature(
                         # config를 로드하여 모델 구조 재생성
                         from transformers import AutoConfig
                         config = AutoConfig.from_pretrained(LOCAL_PATH)
+                        config.num_hidden_layers = num_layers
                         model = DebertaV2Model(config)
                         # state_dict 로드
                         state_dict = torch.load(
@@ -109,6 +123,7 @@ def get_bert_feature(
                     logging.warning(f"Failed to fix meta device issue: {e}, retrying with different options")
                     model = DebertaV2Model.from_pretrained(
                         LOCAL_PATH,
+                        num_hidden_layers=num_layers,
                         low_cpu_mem_usage=False,
                         torch_dtype=None,  # dtype 지정 안 함
                     )
@@ -139,6 +154,7 @@ def get_bert_feature(
                         # 모델 구조 재생성
                         from transformers import AutoConfig
                         config = AutoConfig.from_pretrained(LOCAL_PATH)
+                        config.num_hidden_layers = num_layers
                         model = DebertaV2Model(config)
                         model.load_state_dict(state_dict, strict=False)
                         # 이제는 확실히 CPU에 있음
@@ -176,20 +192,23 @@ def get_bert_feature(
                 if device == "cuda" and torch.cuda.is_available():
                     torch.cuda.empty_cache()
                 model = model.to(device)
+        # Any layers past the feature layer would change last_hidden_state
+        model.encoder.layer = model.encoder.layer[:num_layers]
         models[device] = model
     with torch.no_grad():
         inputs = tokenizer(text, return_tensors="pt")
         for i in inputs:
             inputs[i] = inputs[i].to(device)
-        res = models[device](**inputs, output_hidden_states=True)
-        res = torch.cat(res["hidden_states"][-3:-2], -1)[0].cpu()
+        res = models[device](**inputs).last_hidden_state[0].cpu()
         if assist_text:
+            style_res_mean = bert_cache.assist_means.get(("EN", assist_text))
+        if assist_text and style_res_mean is None:
             style_inputs = tokenizer(assist_text, return_tensors="pt")
             for i in style_inputs:
                 style_inputs[i] = style_inputs[i].to(device)
-            style_res = models[device](**style_inputs, output_hidden_states=True)
-            style_res = torch.cat(style_res["hidden_states"][-3:-2], -1)[0].cpu()
+            style_res = models[device](**style_inputs).last_hidden_state[0].cpu()
             style_res_mean = style_res.mean(0)
+            bert_cache.assist_means.put(("EN", assist_text), style_res_mean)
     assert len(word2ph) == res.shape[0], (text, res.shape[0], len(word2ph))
     word2phone = word2ph
     phone_level_feature = []
@@ -205,4 +224,5 @@ def get_bert_feature(
 
     phone_level_feature = torch.cat(phone_level_feature, dim=0)
 
+    bert_cache.features.put(cache_key, phone_level_feature.T)
     return phone_level_feature.T
@@ -2,6 +2,7 @@
 # compatible with Julius https://github.com/julius-speech/segmentation-kit
 import re
 import unicodedata
+from functools import cached_property, lru_cache
 
 import pyopenjtalk
 from num2words import num2words
@@ -145,6 +146,99 @@ def japanese_convert_numbers_to_words(text: str) -> str:
     return res
 
 
+class FrontendAnalysis:
+    """
+    `text_normalize`で正規化済みの`norm_text`に対するpyopenjtalkの解析結果。
+    `pyopenjtalk.run_frontend()`は1回だけ実行し、単語分割（カタカナ読み）、
+    フルコンテキストラベル由来のアクセント、音素・アクセント・word2ph、カタカナアクセントを
+    すべてそこから作る。`analyze()`経由で作ると正規化済みテキストごとにキャッシュされる。
+    """
+
+    def __init__(self, norm_text: str):
+        self.norm_text = norm_text
+        # OpenJTalkの解析結果、単語分割とフルコンテキストラベルの両方に使う
+        self.njd_features = pyopenjtalk.run_frontend(norm_text)
+        self.sep_text, self.sep_kata = features2sep_kata(norm_text, self.njd_features)
+
+    @cached_property
+    def phone_tone_wo_punct(self) -> list[tuple[str, int]]:
+        """`g2phone_tone_wo_punct()`の結果"""
+        labels = pyopenjtalk.make_label(self.njd_features)
+        return prosodies2phone_tone(labels2prosody(labels, drop_unvoiced_vowels=True))
+
+    @cached_property
+    def phone_tone_word2ph(self) -> tuple[list[tuple[str, int]], list[int]]:
+        """
+        最初と最後に("_", 0)を含む音素とアクセントのタプルのリストと、word2ph。
+        「ん」は「N」のまま（`use_jp_extra=True`の場合の`g2p()`と同じ）。
+        """
+        # pyopenjtalkのフルコンテキストラベルを使ってアクセントを取り出すと、punctuationの位置が消えてしまい情報が失われてしまう：
+        # 「こんにちは、世界。」と「こんにちは！世界。」と「こんにちは！！！？？？世界……。」は全て同じになる。
+        # よって、まずpunctuation無しの音素とアクセントのリストを作り、
+        # それとは別にpyopenjtalk.run_frontend()で得られる音素リスト（こちらはpunctuationが保持される）を使い、
+        # アクセント割当をしなおすことによってpunctuationを含めた音素とアクセントのリストを作る。
+
+        # punctuationがすべて消えた、音素とアクセントのタプルのリスト（「ん」は「N」）
+        phone_tone_list_wo_punct = self.phone_tone_wo_punct
+
+        # sep_text: 単語単位の単語のリスト
+        # sep_kata: 単語単位の単語のカタカナ読みのリスト
+        sep_text, sep_kata = self.sep_text, self.sep_kata
+
+        # sep_phonemes: 各単語ごとの音素のリストのリスト
+        sep_phonemes = handle_long([kata2phoneme_list(i) for i in sep_kata])
+
+        # phone_w_punct: sep_phonemesを結合した、punctuationを元のまま保持した音素列
+        phone_w_punct: list[str] = []
+        for i in sep_phonemes:
+            phone_w_punct += i
+
+        # punctuation無しのアクセント情報を使って、punctuationを含めたアクセント情報を作る
+        phone_tone_list = align_tones(phone_w_punct, phone_tone_list_wo_punct)
+        # logger.debug(f"phone_tone_list:\n{phone_tone_list}")
+        # word2phは厳密な解答は不可能なので（「今日」「眼鏡」等の熟字訓が存在）、
+        # Bert-VITS2では、単語単位の分割を使って、単語の文字ごとにだいたい均等に音素を分配する
+
+        # sep_textから、各単語を1文字1文字分割して、文字のリスト（のリスト）を作る
+        sep_tokenized: list[list[str]] = []
+        for i in sep_text:
+            if i not in punctuation:
+                sep_tokenized.append(
+                    tokenizer.tokenize(i)
+                )  # ここでおそらく`i`が文字単位に分割される
+            else:
+                sep_tokenized.append([i])
+
+        # 各単語について、音素の数と文字の数を比較して、均等っぽく分配する
+        word2ph = []
+        for token, phoneme in zip(sep_tokenized, sep_phonemes):
+            phone_len = len(phoneme)
+            word_len = len(token)
+            word2ph += distribute_phone(phone_len, word_len)
+
+        # 最初と最後に`_`記号を追加、アクセントは0（低）、word2phもそれに合わせて追加
+        phone_tone_list = [("_", 0)] + phone_tone_list + [("_", 0)]
+        word2ph = [1] + word2ph + [1]
+
+        assert len(phone_tone_list) == sum(word2ph), f"{len(phone_tone_list)} != {sum(word2ph)}"
+        return phone_tone_list, word2ph
+
+    @cached_property
+    def kata_tone(self) -> list[tuple[str, int]]:
+        """`g2kata_tone()`の結果"""
+        return phone_tone2kata_tone(self.phone_tone_word2ph[0])
+
+
+# 同じフレーズは何度も合成されるので、解析結果を正規化済みテキストごとに保持する
+FRONTEND_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=FRONTEND_CACHE_SIZE)
+def analyze(norm_text: str) -> FrontendAnalysis:
+    """正規化済みの`norm_text`の`FrontendAnalysis`を返す。共有されるので中身は変更しないこと。"""
+    return FrontendAnalysis(norm_text)
+
+
 def g2p(
     norm_text: str, use_jp_extra: bool = True
 ) -> tuple[list[str], list[int], list[int]]:
@@ -157,58 +251,10 @@ def g2p(
     ただし`phones`と`tones`の最初と終わりに`_`が入り、応じて`word2ph`の最初と最後に1が追加される。
     use_jp_extra: Falseの場合、「ん」の音素を「N」ではなく「n」とする。
     """
-    # pyopenjtalkのフルコンテキストラベルを使ってアクセントを取り出すと、punctuationの位置が消えてしまい情報が失われてしまう：
-    # 「こんにちは、世界。」と「こんにちは！世界。」と「こんにちは！！！？？？世界……。」は全て同じになる。
-    # よって、まずpunctuation無しの音素とアクセントのリストを作り、
-    # それとは別にpyopenjtalk.run_frontend()で得られる音素リスト（こちらはpunctuationが保持される）を使い、
-    # アクセント割当をしなおすことによってpunctuationを含めた音素とアクセントのリストを作る。
-
-    # punctuationがすべて消えた、音素とアクセントのタプルのリスト（「ん」は「N」）
-    phone_tone_list_wo_punct = g2phone_tone_wo_punct(norm_text)
-
-    # sep_text: 単語単位の単語のリスト
-    # sep_kata: 単語単位の単語のカタカナ読みのリスト
-    sep_text, sep_kata = text2sep_kata(norm_text)
-
-    # sep_phonemes: 各単語ごとの音素のリストのリスト
-    sep_phonemes = handle_long([kata2phoneme_list(i) for i in sep_kata])
-
-    # phone_w_punct: sep_phonemesを結合した、punctuationを元のまま保持した音素列
-    phone_w_punct: list[str] = []
-    for i in sep_phonemes:
-        phone_w_punct += i
-
-    # punctuation無しのアクセント情報を使って、punctuationを含めたアクセント情報を作る
-    phone_tone_list = align_tones(phone_w_punct, phone_tone_list_wo_punct)
-    # logger.debug(f"phone_tone_list:\n{phone_tone_list}")
-    # word2phは厳密な解答は不可能なので（「今日」「眼鏡」等の熟字訓が存在）、
-    # Bert-VITS2では、単語単位の分割を使って、単語の文字ごとにだいたい均等に音素を分配する
-
-    # sep_textから、各単語を1文字1文字分割して、文字のリスト（のリスト）を作る
-    sep_tokenized: list[list[str]] = []
-    for i in sep_text:
-        if i not in punctuation:
-            sep_tokenized.append(
-                tokenizer.tokenize(i)
-            )  # ここでおそらく`i`が文字単位に分割される
-        else:
-            sep_tokenized.append([i])
-
-    # 各単語について、音素の数と文字の数を比較して、均等っぽく分配する
-    word2ph = []
-    for token, phoneme in zip(sep_tokenized, sep_phonemes):
-        phone_len = len(phoneme)
-        word_len = len(token)
-        word2ph += distribute_phone(phone_len, word_len)
-
-    # 最初と最後に`_`記号を追加、アクセントは0（低）、word2phもそれに合わせて追加
-    phone_tone_list = [("_", 0)] + phone_tone_list + [("_", 0)]
-    word2ph = [1] + word2ph + [1]
-
+    phone_tone_list, word2ph = analyze(norm_text).phone_tone_word2ph
     phones = [phone for phone, _ in phone_tone_list]
     tones = [tone for _, tone in phone_tone_list]
-
-    assert len(phones) == sum(word2ph), f"{len(phones)} != {sum(word2ph)}"
+    word2ph = list(word2ph)
 
     # use_jp_extraでない場合は「N」を「n」に変換
     if not use_jp_extra:
@@ -218,8 +264,7 @@ def g2p(
 
 
 def g2kata_tone(norm_text: str) -> list[tuple[str, int]]:
-    phones, tones, _ = g2p(norm_text, use_jp_extra=True)
-    return phone_tone2kata_tone(list(zip(phones, tones)))
+    return list(analyze(norm_text).kata_tone)
 
 
 def phone_tone2kata_tone(phone_tone: list[tuple[str, int]]) -> list[tuple[str, int]]:
@@ -272,7 +317,11 @@ def g2phone_tone_wo_punct(text: str) -> list[tuple[str, int]]:
     例: "こんにちは、世界ー。。元気？！" →
     [('k', 0), ('o', 0), ('N', 1), ('n', 1), ('i', 1), ('ch', 1), ('i', 1), ('w', 1), ('a', 1), ('s', 1), ('e', 1), ('k', 0), ('a', 0), ('i', 0), ('i', 0), ('g', 1), ('e', 1), ('N', 0), ('k', 0), ('i', 0)]
     """
-    prosodies = pyopenjtalk_g2p_prosody(text, drop_unvoiced_vowels=True)
+    return list(analyze(text).phone_tone_wo_punct)
+
+
+def prosodies2phone_tone(prosodies: list[str]) -> list[tuple[str, int]]:
+    """`pyopenjtalk_g2p_prosody()`の結果から`g2phone_tone_wo_punct()`の結果を作る。"""
     # logger.debug(f"prosodies: {prosodies}")
     result: list[tuple[str, int]] = []
     current_phrase: list[tuple[str, int]] = []
@@ -320,8 +369,14 @@ def text2sep_kata(norm_text: str) -> tuple[list[str], list[str]]:
     `私はそう思う!って感じ?` →
     ["私", "は", "そう", "思う", "!", "って", "感じ", "?"], ["ワタシ", "ワ", "ソー", "オモウ", "!", "ッテ", "カンジ", "?"]
     """
-    # parsed: OpenJTalkの解析結果
-    parsed = pyopenjtalk.run_frontend(norm_text)
+    analysis = analyze(norm_text)
+    return list(analysis.sep_text), list(analysis.sep_kata)
+
+
+def features2sep_kata(
+    norm_text: str, parsed: list[dict]
+) -> tuple[list[str], list[str]]:
+    """`text2sep_kata()`の本体。`parsed`は`pyopenjtalk.run_frontend(norm_text)`の結果。"""
     sep_text: list[str] = []
     sep_kata: list[str] = []
     for parts in parsed:
@@ -389,6 +444,11 @@ def pyopenjtalk_g2p_prosody(text: str, drop_unvoiced_vowels: bool = True) -> lis
 
     """
     labels = pyopenjtalk.make_label(pyopenjtalk.run_frontend(text))
+    return labels2prosody(labels, drop_unvoiced_vowels)
+
+
+def labels2prosody(labels: list[str], drop_unvoiced_vowels: bool = True) -> list[str]:
+    """`pyopenjtalk_g2p_prosody()`の本体。`labels`はフルコンテキストラベル。"""
     N = len(labels)
 
     phones = []
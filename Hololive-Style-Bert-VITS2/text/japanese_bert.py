@@ -1,9 +1,11 @@
 import sys
 
 import torch
-from transformers import AutoModelForMaskedLM, AutoTokenizer
+from transformers import AutoModel, AutoTokenizer
 
 from config import config
+from text import bert_cache
+from text.bert_layers import load_feature_extractor
 from text.japanese import text2sep_kata
 
 LOCAL_PATH = "./bert/deberta-v2-large-japanese-char-wwm"
@@ -20,6 +22,13 @@ def get_bert_feature(
     assist_text=None,
     assist_text_weight=0.7,
 ):
+    cache_key = bert_cache.feature_key(
+        "JP", text, word2ph, assist_text, assist_text_weight
+    )
+    cached = bert_cache.features.get(cache_key)
+    if cached is not None:
+        return cached
+
     text = "".join(text2sep_kata(text)[0])
     if assist_text:
         assist_text = "".join(text2sep_kata(assist_text)[0])
@@ -34,20 +43,22 @@ def get_bert_feature(
     if device == "cuda" and not torch.cuda.is_available():
         device = "cpu"
     if device not in models.keys():
-        models[device] = AutoModelForMaskedLM.from_pretrained(LOCAL_PATH).to(device)
+        # Encoder up to hidden_states[-3] only; no MLM head
+        models[device] = load_feature_extractor(AutoModel, LOCAL_PATH).to(device)
     with torch.no_grad():
         inputs = tokenizer(text, return_tensors="pt")
         for i in inputs:
             inputs[i] = inputs[i].to(device)
-        res = models[device](**inputs, output_hidden_states=True)
-        res = torch.cat(res["hidden_states"][-3:-2], -1)[0].cpu()
+        res = models[device](**inputs).last_hidden_state[0].cpu()
         if assist_text:
+            style_res_mean = bert_cache.assist_means.get(("JP", assist_text))
+        if assist_text and style_res_mean is None:
             style_inputs = tokenizer(assist_text, return_tensors="pt")
             for i in style_inputs:
                 style_inputs[i] = style_inputs[i].to(device)
-            style_res = models[device](**style_inputs, output_hidden_states=True)
-            style_res = torch.cat(style_res["hidden_states"][-3:-2], -1)[0].cpu()
+            style_res = models[device](**style_inputs).last_hidden_state[0].cpu()
             style_res_mean = style_res.mean(0)
+            bert_cache.assist_means.put(("JP", assist_text), style_res_mean)
 
     assert len(word2ph) == len(text) + 2, text
     word2phone = word2ph
@@ -64,4 +75,5 @@ def get_bert_feature(
 
     phone_level_feature = torch.cat(phone_level_feature, dim=0)
 
+    bert_cache.features.put(cache_key, phone_level_feature.T)
     return phone_level_feature.T
@@ -52,3 +52,15 @@ class AgentInterface(ABC):
             history_uid: str - History ID
         """
         pass
+
+    async def aset_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
+        """
+        Load the agent's working memory from chat history without blocking
+        the event loop on file reads. Agents whose loading is cheap can rely
+        on this default, which calls set_memory_from_history.
+
+        Args:
+            conf_uid: str - Configuration ID
+            history_uid: str - History ID
+        """
+        self.set_memory_from_history(conf_uid, history_uid)
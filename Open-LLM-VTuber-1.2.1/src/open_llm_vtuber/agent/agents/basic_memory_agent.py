@@ -1,3 +1,4 @@
+import asyncio
 from typing import (
     AsyncIterator,
     List,
@@ -28,6 +29,8 @@ from ...mcpp.tool_manager import ToolManager
 from ...mcpp.json_detector import StreamJSONDetector
 from ...mcpp.types import ToolCallObject
 from ...mcpp.tool_executor import ToolExecutor
+from ...utils.turn_trace import trace_event_once
+from ..memory_manager import MemoryManager
 
 
 class BasicMemoryAgent(AgentInterface):
@@ -49,10 +52,23 @@ class BasicMemoryAgent(AgentInterface):
         tool_manager: Optional[ToolManager] = None,
         tool_executor: Optional[ToolExecutor] = None,
         mcp_prompt_string: str = "",
+        memory_token_budget: int = 0,
+        summarize_memory: bool = False,
     ):
         """Initialize agent with LLM and configuration."""
         super().__init__()
-        self._memory = []
+        self._summary_prompt = ""
+        if summarize_memory and memory_token_budget:
+            try:
+                self._summary_prompt = prompt_loader.load_util("memory_summary_prompt")
+            except Exception:
+                logger.warning(
+                    "Memory summary prompt unavailable; old turns will be dropped"
+                )
+        self._memory = MemoryManager(
+            token_budget=memory_token_budget,
+            summarizer=self._summarize_memory if self._summary_prompt else None,
+        )
         self._live2d_model = live2d_model
         self._tts_preprocessor_config = tts_preprocessor_config
         self._faster_first_response = faster_first_response
@@ -175,14 +191,25 @@ class BasicMemoryAgent(AgentInterface):
 
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
         """Load memory from chat history."""
-        messages = get_history(conf_uid, history_uid)
+        self._load_memory(get_history(conf_uid, history_uid))
+
+    async def aset_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
+        """Load memory from chat history, reading the file in a worker thread.
 
-        self._memory = []
+        The memory itself is loaded on the event loop, where MemoryManager can
+        schedule summaries of the turns beyond the token budget.
+        """
+        messages = await asyncio.to_thread(get_history, conf_uid, history_uid)
+        self._load_memory(messages)
+
+    def _load_memory(self, messages: List[Dict[str, Any]]) -> None:
+        """Replace memory with the human/AI turns of stored history messages."""
+        memory = []
         for msg in messages:
             role = "user" if msg["role"] == "human" else "assistant"
             content = msg["content"]
             if isinstance(content, str) and content:
-                self._memory.append(
+                memory.append(
                     {
                         "role": role,
                         "content": content,
@@ -190,7 +217,41 @@ class BasicMemoryAgent(AgentInterface):
                 )
             else:
                 logger.warning(f"Skipping invalid message from history: {msg}")
-        logger.info(f"Loaded {len(self._memory)} messages from history.")
+        # Turns beyond the token budget are folded into the summary
+        self._memory.load(memory)
+        logger.info(
+            f"Loaded {len(memory)} messages from history "
+            f"(~{self._memory.prompt_tokens} tokens kept in memory)."
+        )
+
+    async def _summarize_memory(
+        self, previous_summary: str, messages: List[Dict[str, Any]]
+    ) -> str:
+        """Fold messages into the running memory summary with the LLM."""
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        if previous_summary:
+            transcript = (
+                f"Previous summary:\n{previous_summary}\n\nNew messages:\n{transcript}"
+            )
+
+        summary = ""
+        async for event in self._llm.chat_completion(
+            [{"role": "user", "content": transcript}], self._summary_prompt
+        ):
+            if isinstance(event, dict) and event.get("type") == "text_delta":
+                summary += event.get("text", "")
+            elif isinstance(event, str):
+                summary += event
+        return summary
+
+    def _system_prompt(self) -> str:
+        """System prompt with the summary of turns no longer in memory."""
+        if not self._memory.summary:
+            return self._system
+        return (
+            f"{self._system}\n\n[Summary of the earlier conversation]\n"
+            f"{self._memory.summary}"
+        )
 
     def handle_interrupt(self, heard_response: str) -> None:
         """Handle user interruption."""
@@ -200,10 +261,7 @@ class BasicMemoryAgent(AgentInterface):
         self._interrupt_handled = True
 
         if self._memory and self._memory[-1]["role"] == "assistant":
-            if not self._memory[-1]["content"].endswith("..."):
-                self._memory[-1]["content"] = heard_response + "..."
-            else:
-                self._memory[-1]["content"] = heard_response + "..."
+            self._memory.update_last_content(heard_response + "...")
         else:
             if heard_response:
                 self._memory.append(
@@ -241,7 +299,7 @@ class BasicMemoryAgent(AgentInterface):
 
     def _to_messages(self, input_data: BatchInput) -> List[Dict[str, Any]]:
         """Prepare messages for LLM API call."""
-        messages = self._memory.copy()
+        messages = self._memory.to_prompt()
         user_content = []
         text_prompt = self._to_text_prompt(input_data)
         if text_prompt:
@@ -299,7 +357,9 @@ class BasicMemoryAgent(AgentInterface):
         current_assistant_message_content = []
 
         while True:
-            stream = self._llm.chat_completion(messages, self._system, tools=tools)
+            stream = self._llm.chat_completion(
+                messages, self._system_prompt(), tools=tools
+            )
             pending_tool_calls.clear()
             current_assistant_message_content.clear()
 
@@ -409,20 +469,20 @@ class BasicMemoryAgent(AgentInterface):
         messages = initial_messages.copy()
         current_turn_text = ""
         pending_tool_calls: Union[List[ToolCallObject], List[Dict[str, Any]]] = []
-        current_system_prompt = self._system
+        current_system_prompt = self._system_prompt()
 
         while True:
             if self.prompt_mode_flag:
                 if self._mcp_prompt_string:
                     current_system_prompt = (
-                        f"{self._system}\n\n{self._mcp_prompt_string}"
+                        f"{self._system_prompt()}\n\n{self._mcp_prompt_string}"
                     )
                 else:
                     logger.warning("Prompt mode active but mcp_prompt_string is empty!")
-                    current_system_prompt = self._system
+                    current_system_prompt = self._system_prompt()
                 tools_for_api = None
             else:
-                current_system_prompt = self._system
+                current_system_prompt = self._system_prompt()
                 tools_for_api = tools
 
             stream = self._llm.chat_completion(
@@ -630,6 +690,8 @@ class BasicMemoryAgent(AgentInterface):
                 async for output in self._claude_tool_interaction_loop(
                     messages, tools if tools else []
                 ):
+                    if isinstance(output, str):
+                        trace_event_once("llm_first_token")
                     yield output
                 return
             elif self._use_mcpp and tool_mode == "OpenAI":
@@ -639,11 +701,15 @@ class BasicMemoryAgent(AgentInterface):
                 async for output in self._openai_tool_interaction_loop(
                     messages, tools if tools else []
                 ):
+                    if isinstance(output, str):
+                        trace_event_once("llm_first_token")
                     yield output
                 return
             else:
                 logger.info("Starting simple chat completion.")
-                token_stream = self._llm.chat_completion(messages, self._system)
+                token_stream = self._llm.chat_completion(
+                    messages, self._system_prompt()
+                )
                 complete_response = ""
                 async for event in token_stream:
                     text_chunk = ""
@@ -654,6 +720,7 @@ class BasicMemoryAgent(AgentInterface):
                     else:
                         continue
                     if text_chunk:
+                        trace_event_once("llm_first_token")
                         yield text_chunk
                         complete_response += text_chunk
                 if complete_response:
@@ -0,0 +1,203 @@
+"""
+Token-budgeted conversation memory.
+
+The memory keeps a running token estimate of its messages. When the messages
+plus the current summary exceed the budget, the oldest turns are folded into
+the summary by a background task, so the prompt stays bounded however long
+the session runs.
+"""
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+# Kana, CJK ideographs, Hangul and full-width forms: about one token each
+_DENSE_CHARS = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯＀-￯]")
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# (previous summary, messages to fold in) -> new summary
+Summarizer = Callable[[str, List[Dict[str, Any]]], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: About one token per 4 characters, or per CJK character
+    """
+    dense = len(_DENSE_CHARS.findall(text))
+    return (len(text) - dense + 3) // 4 + dense
+
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    content = message.get("content", "")
+    if not isinstance(content, str):
+        content = str(content)
+    return MESSAGE_OVERHEAD_TOKENS + estimate_tokens(content)
+
+
+class MemoryManager:
+    """Conversation messages with a token budget and a rolling summary."""
+
+    def __init__(
+        self, token_budget: int = 0, summarizer: Optional[Summarizer] = None
+    ) -> None:
+        """
+        Args:
+            token_budget: Budget of messages plus summary in estimated tokens;
+                0 keeps every message
+            summarizer: Folds old messages into the summary; without one the
+                oldest messages are dropped instead
+        """
+        self.token_budget = max(0, token_budget)
+        self._summarizer = summarizer
+
+        self._messages: List[Dict[str, Any]] = []
+        self._tokens: List[int] = []
+        self.total_tokens = 0  # of the messages, summary excluded
+
+        self.summary = ""
+        self._summary_tokens = 0
+        # Head messages being summarized; they stay in the prompt until done
+        self._folding = 0
+        self._summary_task: Optional[asyncio.Task] = None
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index):
+        return self._messages[index]
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.total_tokens + self._summary_tokens
+
+    def append(self, message: Dict[str, Any]) -> None:
+        """Add a message and fold old turns if over budget."""
+        self._push(message)
+        self._check_budget()
+
+    def update_last_content(self, content: str) -> None:
+        """Replace the content of the newest message."""
+        if not self._messages:
+            return
+        self._messages[-1]["content"] = content
+        tokens = estimate_message_tokens(self._messages[-1])
+        self.total_tokens += tokens - self._tokens[-1]
+        self._tokens[-1] = tokens
+
+    def load(self, messages: List[Dict[str, Any]]) -> None:
+        """Replace the memory with messages, e.g. loaded from history."""
+        self.clear()
+        for message in messages:
+            self._push(message)
+        self._check_budget()
+
+    def clear(self) -> None:
+        """Forget every message and the summary."""
+        self._generation += 1  # results of a running summary are discarded
+        self._messages = []
+        self._tokens = []
+        self.total_tokens = 0
+        self.summary = ""
+        self._summary_tokens = 0
+        self._folding = 0
+
+    def to_prompt(self) -> List[Dict[str, Any]]:
+        """Messages to send to the LLM (the summary goes in the system prompt)."""
+        return list(self._messages)
+
+    # ==== Budget
+
+    def _push(self, message: Dict[str, Any]) -> None:
+        tokens = estimate_message_tokens(message)
+        self._messages.append(message)
+        self._tokens.append(tokens)
+        self.total_tokens += tokens
+
+    def _drop_head(self, count: int) -> None:
+        self.total_tokens -= sum(self._tokens[:count])
+        del self._messages[:count]
+        del self._tokens[:count]
+
+    def _find_cut(self) -> int:
+        """Number of oldest messages to fold so half the budget is left."""
+        target = self.token_budget // 2 - self._summary_tokens
+        remaining = self.total_tokens
+        cut = 0
+        while cut < len(self._messages) - 1 and remaining > target:
+            remaining -= self._tokens[cut]
+            cut += 1
+        # Keep whole exchanges: the kept part starts with a user message
+        while cut < len(self._messages) - 1 and self._messages[cut]["role"] != "user":
+            cut += 1
+        return cut
+
+    def _check_budget(self) -> None:
+        if (
+            not self.token_budget
+            or self._folding
+            or self.prompt_tokens <= self.token_budget
+        ):
+            return
+        cut = self._find_cut()
+        if not cut:
+            return
+
+        loop = None
+        if self._summarizer is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+        if loop is None:
+            self._drop_head(cut)
+            logger.info(f"Memory over budget: dropped {cut} oldest messages")
+            return
+
+        self._folding = cut
+        batch = [dict(m) for m in self._messages[:cut]]
+        self._summary_task = loop.create_task(self._fold(batch, self._generation))
+
+    async def _fold(self, batch: List[Dict[str, Any]], generation: int) -> None:
+        # Summarize at most a budget's worth of the newest folded messages,
+        # e.g. when a long history was just loaded
+        start = len(batch) - 1
+        tokens = estimate_message_tokens(batch[start])
+        while start > 0:
+            tokens += estimate_message_tokens(batch[start - 1])
+            if tokens > self.token_budget:
+                break
+            start -= 1
+        if start:
+            logger.info(f"Dropping {start} old messages that exceed the summary input")
+
+        summary = ""
+        try:
+            summary = (await self._summarizer(self.summary, batch[start:])).strip()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to summarize memory: {e}")
+
+        if generation != self._generation:
+            return
+        if summary:
+            self.summary = summary
+            self._summary_tokens = estimate_tokens(summary)
+            logger.info(
+                f"Folded {len(batch)} messages into the memory summary "
+                f"({self._summary_tokens} tokens)"
+            )
+        else:
+            logger.warning(f"Dropping {len(batch)} messages without a summary")
+        self._drop_head(len(batch))
+        self._folding = 0
+        self._check_budget()
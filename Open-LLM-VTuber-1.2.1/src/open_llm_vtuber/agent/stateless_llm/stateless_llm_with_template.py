@@ -4,11 +4,11 @@ compatible endpoints for language generation where the language model is not
 trained using a ChatML format.
 """
 
-import requests
 import json
+import httpx
 from jinja2 import Template
 from loguru import logger
-from typing import AsyncIterator, List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from .stateless_llm_interface import StatelessLLMInterface
 
@@ -84,6 +84,11 @@ TEMPLATES = {
 
 
 class AsyncLLMWithTemplate(StatelessLLMInterface):
+    # One connection pool per instance; the instance is shared by all sessions
+    HTTP_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8)
+    # No overall read deadline: a long generation is fine as long as tokens flow
+    HTTP_TIMEOUT = httpx.Timeout(connect=10.0, read=120.0, write=30.0, pool=30.0)
+
     def __init__(
         self,
         model: str,
@@ -114,10 +119,27 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
         self.prompt_headers = {
             "Authorization": llm_api_key or "Bearer your_api_key_here"
         }
+        self._client: Optional[httpx.AsyncClient] = None
         logger.info(
             f"Initialized AsyncLLM with the parameters: {self.completion_url} ({template})"
         )
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.prompt_headers,
+                limits=self.HTTP_LIMITS,
+                timeout=self.HTTP_TIMEOUT,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def chat_completion(
         self, messages: List[Dict[str, Any]], system: str = None
     ) -> AsyncIterator[str]:
@@ -138,7 +160,6 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
         """
         logger.debug(f"Messages: {messages}")
         bos_token = "<|begin_of_text|>"
-        stream = None
         try:
             # If system prompt is provided, add it to the messages
             messages_with_system: List[Dict[str, Any]] = messages
@@ -157,37 +178,45 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
                 "temperature": self.temperature,
                 "prompt": prompt,
             }
-            with requests.post(
-                self.completion_url, headers=self.prompt_headers, json=data, stream=True
+            # Leaving this block for any reason, including the consumer being
+            # cancelled on interrupt, closes the response and with it the
+            # connection, so the server stops generating.
+            async with self._get_client().stream(
+                "POST", self.completion_url, json=data
             ) as response:
-                for line in response.iter_lines():
-                    if line:
-                        line = self._clean_raw_bytes(line)
-                        next_token = self._process_line(line)
-                        if next_token:
-                            if next_token == self.eot_token:
-                                break
-                            yield next_token
+                if response.status_code >= 400:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    raise httpx.HTTPStatusError(
+                        f"HTTP {response.status_code}: {body[:500]}",
+                        request=response.request,
+                        response=response,
+                    )
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = self._parse_line(line)
+                    if chunk is None:
+                        continue
+                    next_token = self._process_line(chunk)
+                    if next_token:
+                        if next_token == self.eot_token:
+                            break
+                        yield next_token
+            logger.debug("Chat completion finished.")
         except Exception as e:
             logger.error(f"LLM API WITH TEMPLATE: Error occurred: {e}")
-            logger.info(f"Base URL: {self.base_url}")
+            logger.info(f"Completion URL: {self.completion_url}")
             logger.info(f"Model: {self.model}")
             logger.info(f"Messages: {messages}")
             logger.info(f"temperature: {self.temperature}")
             yield "Error calling the chat endpoint: Error occurred while generating response. See the logs for details."
-        finally:
-            # make sure the stream is properly closed
-            # so when interrupted, no more tokens will being generated.
-            if stream:
-                logger.debug("Chat completion finished.")
-                await stream.close()
-                logger.debug("Stream closed.")
-
-    def _clean_raw_bytes(self, line):
-        line = line.decode("utf-8")
-        line = line.removeprefix("data: ")
-        line = json.loads(line)
-        return line
+
+    def _parse_line(self, line: str) -> Optional[dict]:
+        """Decode one streamed line; returns None for keep-alives and [DONE]."""
+        line = line.removeprefix("data: ").strip()
+        if not line or line.startswith(":") or line == "[DONE]":
+            return None
+        return json.loads(line)
 
     def _process_line(self, line):
         if not (("stop" in line) and (line["stop"])):
@@ -1,11 +1,28 @@
 import os
 import re
 import json
+import tempfile
 import uuid
+import threading
 from datetime import datetime
-from typing import Literal, List, TypedDict, Optional
+from typing import Dict, Iterator, Literal, List, Tuple, TypedDict, Optional
 from loguru import logger
 
+# History logs are JSON Lines: a metadata record, then one record per message.
+# Changes are appended rather than rewriting the file: later metadata records
+# are merged into the first, and an edit record replaces the content of the
+# message before it.
+HISTORY_SUFFIX = ".jsonl"
+LEGACY_HISTORY_SUFFIX = ".json"
+OP_EDIT_LATEST = "edit_latest"
+
+# Per-conf summary of every history (message count, first/last timestamp and
+# a preview of the latest message), kept up to date on each append so the
+# history list never has to parse the logs. An entry is trusted only while
+# its recorded file size matches the log; otherwise it is rebuilt.
+INDEX_FILENAME = ".history_index"
+PREVIEW_CHARS = 200
+
 
 class HistoryMessage(TypedDict):
     role: Literal["human", "ai"]
@@ -49,17 +66,321 @@ def _ensure_conf_dir(conf_uid: str) -> str:
     return base_dir
 
 
-def _get_safe_history_path(conf_uid: str, history_uid: str) -> str:
+def _get_safe_history_path(
+    conf_uid: str, history_uid: str, suffix: str = HISTORY_SUFFIX
+) -> str:
     """Get sanitized path for history file"""
     safe_conf_uid = _sanitize_path_component(conf_uid)
     safe_history_uid = _sanitize_path_component(history_uid)
     base_dir = os.path.join("chat_history", safe_conf_uid)
-    full_path = os.path.normpath(os.path.join(base_dir, f"{safe_history_uid}.json"))
+    full_path = os.path.normpath(os.path.join(base_dir, f"{safe_history_uid}{suffix}"))
     if not full_path.startswith(base_dir):
         raise ValueError("Invalid path: Path traversal detected")
     return full_path
 
 
+_migration_lock = threading.Lock()
+
+
+def _migrate_legacy_history(legacy_path: str, filepath: str) -> bool:
+    """Convert a legacy JSON-array history file to the JSONL log format
+
+    The new file is written next to the old one and swapped in atomically;
+    the legacy file is removed only once the log is in place.
+    """
+    tmp_path = None
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            history_data = json.load(f)
+        # Unique temp name, so nothing else writing next to the log collides
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for record in history_data:
+                f.write(_dump_record(record))
+        os.replace(tmp_path, filepath)
+        tmp_path = None
+        os.remove(legacy_path)
+    except FileNotFoundError:
+        # Another caller migrated it first
+        if os.path.exists(filepath):
+            return True
+        logger.error(f"Failed to migrate history file {legacy_path}: file vanished")
+        return False
+    except Exception as e:
+        logger.error(f"Failed to migrate history file {legacy_path}: {e}")
+        return False
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(f"Migrated history file to JSONL: {filepath}")
+    return True
+
+
+def _resolve_history_path(conf_uid: str, history_uid: str) -> str:
+    """Get the path of the history log, migrating a legacy JSON file first"""
+    filepath = _get_safe_history_path(conf_uid, history_uid)
+    if not os.path.exists(filepath):
+        legacy_path = _get_safe_history_path(
+            conf_uid, history_uid, LEGACY_HISTORY_SUFFIX
+        )
+        # Re-checked under the lock: a second migration of the same file would
+        # overwrite messages appended since the first one
+        with _migration_lock:
+            if not os.path.exists(filepath) and os.path.exists(legacy_path):
+                _migrate_legacy_history(legacy_path, filepath)
+    return filepath
+
+
+def _dump_record(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _append_records(filepath: str, records: List[dict], fsync: bool = False) -> None:
+    """Append records to a history log in a single write"""
+    with open(filepath, "a+b") as f:
+        start = f.seek(0, os.SEEK_END)
+        # A crash mid-write can leave a torn last line; start on a fresh one
+        # so the torn line does not swallow these records as well
+        if start > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.write("".join(_dump_record(record) for record in records).encode("utf-8"))
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+        end = f.tell()
+    _index_appended(filepath, records, start, end)
+
+
+def _append_record(filepath: str, record: dict) -> None:
+    """Append one record to a history log"""
+    _append_records(filepath, [record])
+
+
+def _iter_records(filepath: str) -> Iterator[dict]:
+    """Yield the records of a history log, skipping unreadable lines"""
+    with open(filepath, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt line {line_no} in {filepath}")
+
+
+def _replay(filepath: str) -> Tuple[dict, List[HistoryMessage]]:
+    """Rebuild metadata and messages from a history log
+
+    Returns:
+        Tuple[dict, List[HistoryMessage]]: (merged metadata, messages)
+    """
+    metadata = {}
+    messages = []
+    for record in _iter_records(filepath):
+        op = record.get("op")
+        if op == OP_EDIT_LATEST:
+            if messages and messages[-1]["role"] == record.get("role"):
+                messages[-1]["content"] = record.get("content", "")
+        elif op is not None:
+            logger.warning(f"Unknown history record op: {op}")
+        elif record.get("role") == "metadata":
+            metadata.update(record)
+        else:
+            messages.append(record)
+    return metadata, messages
+
+
+def _read_first_record(filepath: str) -> Optional[dict]:
+    with open(filepath, "r", encoding="utf-8") as f:
+        line = f.readline().strip()
+    try:
+        return json.loads(line) if line else None
+    except json.JSONDecodeError:
+        return None
+
+
+def _iter_lines_reversed(filepath: str, block_size: int = 8192) -> Iterator[str]:
+    """Yield the lines of a file from the last to the first"""
+    with open(filepath, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + tail).split(b"\n")
+            # The first piece may be the end of a line that started earlier
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode("utf-8", errors="replace")
+        yield tail.decode("utf-8", errors="replace")
+
+
+def _latest_message_role(filepath: str) -> Optional[str]:
+    """Role of the latest message, read from the end of the log"""
+    for line in _iter_lines_reversed(filepath):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        # Edits keep the role of the message they replace
+        if record.get("op") == OP_EDIT_LATEST or (
+            "op" not in record and record.get("role") != "metadata"
+        ):
+            return record.get("role")
+    return None
+
+
+def _read_messages_reversed(filepath: str) -> Iterator[HistoryMessage]:
+    """Yield the messages of a history log newest first, with edits applied"""
+    edits = []
+    for line in _iter_lines_reversed(filepath):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        op = record.get("op")
+        if op == OP_EDIT_LATEST:
+            edits.append(record)
+            continue
+        if op is not None or record.get("role") == "metadata":
+            continue
+        # Edits after a message apply to it; the last matching one wins
+        for edit in edits:
+            if edit.get("role") == record.get("role"):
+                record["content"] = edit.get("content", "")
+                break
+        edits = []
+        yield record
+
+
+# ==== History index
+
+_index_lock = threading.Lock()
+_indexes: Dict[str, Dict[str, dict]] = {}  # conf dir -> {history_uid: entry}
+_dirty_indexes: set = set()
+
+
+def _index_location(filepath: str) -> Tuple[str, str]:
+    """(conf dir, history_uid) of a history log path"""
+    conf_dir, filename = os.path.split(filepath)
+    return conf_dir, filename[: -len(HISTORY_SUFFIX)]
+
+
+def _load_index(conf_dir: str) -> Dict[str, dict]:
+    """Get the index of a conf dir, reading it from disk once (caller holds the lock)"""
+    index = _indexes.get(conf_dir)
+    if index is None:
+        try:
+            with open(
+                os.path.join(conf_dir, INDEX_FILENAME), "r", encoding="utf-8"
+            ) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        _indexes[conf_dir] = index
+    return index
+
+
+def _save_index(conf_dir: str) -> None:
+    """Persist the index of a conf dir if it changed (caller holds the lock)"""
+    if conf_dir not in _dirty_indexes:
+        return
+    index_path = os.path.join(conf_dir, INDEX_FILENAME)
+    try:
+        with open(f"{index_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(_indexes.get(conf_dir, {}), f, ensure_ascii=False)
+        os.replace(f"{index_path}.tmp", index_path)
+        _dirty_indexes.discard(conf_dir)
+    except OSError as e:
+        logger.warning(f"Failed to save history index: {e}")
+
+
+def _preview(message: dict) -> dict:
+    preview = dict(message)
+    content = preview.get("content")
+    if isinstance(content, str) and len(content) > PREVIEW_CHARS:
+        preview["content"] = content[:PREVIEW_CHARS] + "…"
+    return preview
+
+
+def _build_index_entry(filepath: str) -> dict:
+    # Stat before reading: a concurrent append then shows up as a size
+    # mismatch and the entry gets rebuilt again rather than going stale
+    size = os.path.getsize(filepath)
+    _, messages = _replay(filepath)
+    return {
+        "size": size,
+        "count": len(messages),
+        "first_timestamp": messages[0].get("timestamp") if messages else None,
+        "last_timestamp": messages[-1].get("timestamp") if messages else None,
+        "latest_message": _preview(messages[-1]) if messages else None,
+    }
+
+
+def _get_index_entry(filepath: str) -> dict:
+    """Get the up-to-date index entry of a history log"""
+    conf_dir, history_uid = _index_location(filepath)
+    size = os.path.getsize(filepath)
+    with _index_lock:
+        entry = _load_index(conf_dir).get(history_uid)
+        if entry is not None and entry.get("size") == size:
+            return entry
+
+    entry = _build_index_entry(filepath)
+    with _index_lock:
+        _load_index(conf_dir)[history_uid] = entry
+        _dirty_indexes.add(conf_dir)
+    return entry
+
+
+def _index_appended(filepath: str, records: List[dict], start: int, end: int) -> None:
+    """Fold records just appended between offsets start and end into the index"""
+    conf_dir, history_uid = _index_location(filepath)
+    with _index_lock:
+        index = _load_index(conf_dir)
+        entry = index.get(history_uid)
+        _dirty_indexes.add(conf_dir)
+        if entry is None or entry.get("size") != start:
+            # Not indexed yet, or another write got in between: rebuild lazily
+            index.pop(history_uid, None)
+            return
+
+        for record in records:
+            op = record.get("op")
+            if op == OP_EDIT_LATEST:
+                latest = entry["latest_message"]
+                if latest and latest.get("role") == record.get("role"):
+                    entry["latest_message"] = _preview(
+                        {**latest, "content": record.get("content", "")}
+                    )
+            elif op is None and record.get("role") != "metadata":
+                entry["count"] += 1
+                entry["first_timestamp"] = entry["first_timestamp"] or record.get(
+                    "timestamp"
+                )
+                entry["last_timestamp"] = record.get("timestamp")
+                entry["latest_message"] = _preview(record)
+        entry["size"] = end
+
+
+def _drop_index_entry(conf_uid: str, history_uid: str) -> Optional[dict]:
+    conf_dir = os.path.dirname(_get_safe_history_path(conf_uid, history_uid))
+    with _index_lock:
+        _dirty_indexes.add(conf_dir)
+        return _load_index(conf_dir).pop(history_uid, None)
+
+
 def create_new_history(conf_uid: str) -> str:
     """Create a new history file with a unique ID and return the history_uid"""
     if not conf_uid:
@@ -73,15 +394,22 @@ def create_new_history(conf_uid: str) -> str:
 
     # Create history file with empty metadata
     try:
-        filepath = os.path.join(conf_dir, f"{history_uid}.json")
-        initial_data = [
-            {
-                "role": "metadata",
-                "timestamp": datetime.now().isoformat(timespec="seconds"),
-            }
-        ]
+        filepath = os.path.join(conf_dir, f"{history_uid}{HISTORY_SUFFIX}")
+        initial_data = {
+            "role": "metadata",
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        }
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(initial_data, f, ensure_ascii=False, indent=2)
+            f.write(_dump_record(initial_data))
+        with _index_lock:
+            _load_index(conf_dir)[history_uid] = {
+                "size": os.path.getsize(filepath),
+                "count": 0,
+                "first_timestamp": None,
+                "last_timestamp": None,
+                "latest_message": None,
+            }
+            _dirty_indexes.add(conf_dir)
     except Exception as e:
         logger.error(f"Failed to create new history file: {e}")
         return ""
@@ -90,6 +418,53 @@ def create_new_history(conf_uid: str) -> str:
     return history_uid
 
 
+def build_message_record(
+    role: Literal["human", "ai", "system"],
+    content: str,
+    name: str | None = None,
+    avatar: str | None = None,
+) -> dict:
+    """Build the history record of a message, timestamped now
+
+    Args:
+        role: Message role ("human", "ai" or "system")
+        content: Message content
+        name: Optional display name (default None)
+        avatar: Optional avatar URL (default None)
+
+    Returns:
+        dict: The record to append to the history log
+    """
+    now_str = datetime.now().isoformat(timespec="seconds")
+    new_item = {
+        "role": role,
+        "timestamp": now_str,
+        "content": content,
+    }
+
+    # Add optional display information if provided
+    if name is not None:
+        new_item["name"] = name
+    if avatar is not None:
+        new_item["avatar"] = avatar
+    return new_item
+
+
+def append_history_records(
+    conf_uid: str, history_uid: str, records: List[dict], fsync: bool = False
+) -> None:
+    """Append prepared records to a specific history file
+
+    Args:
+        conf_uid: Configuration unique identifier
+        history_uid: History unique identifier
+        records: Records built with build_message_record
+        fsync: Force the records to disk before returning
+    """
+    filepath = _resolve_history_path(conf_uid, history_uid)
+    _append_records(filepath, records, fsync=fsync)
+
+
 def store_message(
     conf_uid: str,
     history_uid: str,
@@ -115,35 +490,10 @@ def store_message(
             logger.warning("Missing history_uid")
         return
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
-    logger.debug(f"Storing {role} message to {filepath}")
-
-    history_data = []
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
-        except Exception:
-            logger.error(f"Failed to load history file: {filepath}")
-            pass
-
-    now_str = datetime.now().isoformat(timespec="seconds")
-    new_item = {
-        "role": role,
-        "timestamp": now_str,
-        "content": content,
-    }
-
-    # Add optional display information if provided
-    if name is not None:
-        new_item["name"] = name
-    if avatar is not None:
-        new_item["avatar"] = avatar
-
-    history_data.append(new_item)
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(history_data, f, ensure_ascii=False, indent=2)
+    logger.debug(f"Storing {role} message to history {history_uid}")
+    append_history_records(
+        conf_uid, history_uid, [build_message_record(role, content, name, avatar)]
+    )
     logger.debug(f"Successfully stored {role} message")
 
 
@@ -152,16 +502,13 @@ def get_metadata(conf_uid: str, history_uid: str) -> dict:
     if not conf_uid or not history_uid:
         return {}
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    filepath = _resolve_history_path(conf_uid, history_uid)
     if not os.path.exists(filepath):
         return {}
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if history_data and history_data[0]["role"] == "metadata":
-            return history_data[0]
+        metadata, _ = _replay(filepath)
+        return metadata
     except Exception as e:
         logger.error(f"Failed to get metadata: {e}")
     return {}
@@ -176,28 +523,21 @@ def update_metadate(conf_uid: str, history_uid: str, metadata: dict) -> bool:
     if not conf_uid or not history_uid:
         return False
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    filepath = _resolve_history_path(conf_uid, history_uid)
     if not os.path.exists(filepath):
         return False
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if history_data and history_data[0]["role"] == "metadata":
-            # Update existing metadata while preserving other fields
-            history_data[0].update(metadata)
-        else:
+        # The new fields are appended and merged over the existing ones on read
+        new_metadata = {"role": "metadata"}
+        first_record = _read_first_record(filepath)
+        if not first_record or first_record.get("role") != "metadata":
             # Create new metadata with timestamp if none exists
-            new_metadata = {
-                "role": "metadata",
-                "timestamp": datetime.now().isoformat(timespec="seconds"),
-            }
-            new_metadata.update(metadata)  # Add new fields
-            history_data.insert(0, new_metadata)
+            new_metadata["timestamp"] = datetime.now().isoformat(timespec="seconds")
+        new_metadata.update(metadata)  # Add new fields
+        new_metadata["role"] = "metadata"
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(history_data, f, ensure_ascii=False, indent=2)
+        _append_record(filepath, new_metadata)
 
         logger.debug(f"Updated metadata for history {history_uid}")
         return True
@@ -215,17 +555,15 @@ def get_history(conf_uid: str, history_uid: str) -> List[HistoryMessage]:
             logger.warning("Missing history_uid")
         return []
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    filepath = _resolve_history_path(conf_uid, history_uid)
 
     if not os.path.exists(filepath):
         logger.warning(f"History file not found: {filepath}")
         return []
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-            # Filter out metadata
-            return [msg for msg in history_data if msg["role"] != "metadata"]
+        _, messages = _replay(filepath)
+        return messages
     except Exception:
         return []
 
@@ -236,11 +574,16 @@ def delete_history(conf_uid: str, history_uid: str) -> bool:
         logger.warning("Missing conf_uid or history_uid")
         return False
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    deleted = False
     try:
-        if os.path.exists(filepath):
-            os.remove(filepath)
-            logger.debug(f"Successfully deleted history file: {filepath}")
+        _drop_index_entry(conf_uid, history_uid)
+        for suffix in (HISTORY_SUFFIX, LEGACY_HISTORY_SUFFIX):
+            filepath = _get_safe_history_path(conf_uid, history_uid, suffix)
+            if os.path.exists(filepath):
+                os.remove(filepath)
+                logger.debug(f"Successfully deleted history file: {filepath}")
+                deleted = True
+        if deleted:
             return True
     except Exception as e:
         logger.error(f"Failed to delete history file: {e}")
@@ -248,7 +591,11 @@ def delete_history(conf_uid: str, history_uid: str) -> bool:
 
 
 def get_history_list(conf_uid: str) -> List[dict]:
-    """Get list of histories with their latest messages"""
+    """Get list of histories with their latest messages
+
+    Served from the history index; only logs changed since they were last
+    indexed are read.
+    """
     if not conf_uid:
         return []
 
@@ -257,47 +604,57 @@ def get_history_list(conf_uid: str) -> List[dict]:
     empty_history_uids = []
 
     try:
+        # Convert legacy JSON histories before listing the logs
+        for filename in os.listdir(conf_dir):
+            if filename.endswith(LEGACY_HISTORY_SUFFIX):
+                # Migrates under _migration_lock, like every other reader
+                _resolve_history_path(conf_uid, filename[: -len(LEGACY_HISTORY_SUFFIX)])
+
+        history_uids = []
         for filename in os.listdir(conf_dir):
-            if not filename.endswith(".json"):
+            if not filename.endswith(HISTORY_SUFFIX):
                 continue
 
-            history_uid = filename[:-5]
+            history_uid = filename[: -len(HISTORY_SUFFIX)]
+            history_uids.append(history_uid)
             filepath = os.path.join(conf_dir, filename)
 
             try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    messages = json.load(f)
-
-                    # Filter out metadata for checking if history is empty
-                    actual_messages = [
-                        msg for msg in messages if msg["role"] != "metadata"
-                    ]
-                    if not actual_messages:
-                        empty_history_uids.append(history_uid)
-                        continue
-
-                    latest_message = actual_messages[-1]
-                    history_info = {
-                        "uid": history_uid,
-                        "latest_message": latest_message,
-                        "timestamp": (
-                            latest_message["timestamp"] if latest_message else None
-                        ),
-                    }
-                    histories.append(history_info)
+                entry = _get_index_entry(filepath)
+                if not entry["count"]:
+                    empty_history_uids.append(history_uid)
+                    continue
+
+                history_info = {
+                    "uid": history_uid,
+                    "latest_message": entry["latest_message"],
+                    "timestamp": entry["last_timestamp"],
+                    "first_timestamp": entry["first_timestamp"],
+                    "message_count": entry["count"],
+                }
+                histories.append(history_info)
             except Exception as e:
                 logger.error(f"Error reading history file {filename}: {e}")
                 continue
 
         # Clean up empty histories if there are other non-empty ones
-        if len(empty_history_uids) > 0 and len(os.listdir(conf_dir)) > 1:
+        if len(empty_history_uids) > 0 and len(history_uids) > 1:
             for uid in empty_history_uids:
                 try:
-                    os.remove(os.path.join(conf_dir, f"{uid}.json"))
+                    os.remove(os.path.join(conf_dir, f"{uid}{HISTORY_SUFFIX}"))
+                    history_uids.remove(uid)
                     logger.info(f"Removed empty history file: {uid}")
                 except Exception as e:
                     logger.error(f"Failed to remove empty history file {uid}: {e}")
 
+        with _index_lock:
+            # Forget histories whose files are gone
+            index = _load_index(conf_dir)
+            for uid in set(index) - set(history_uids):
+                del index[uid]
+                _dirty_indexes.add(conf_dir)
+            _save_index(conf_dir)
+
         histories.sort(
             key=lambda x: x["timestamp"] if x["timestamp"] else "", reverse=True
         )
@@ -308,6 +665,60 @@ def get_history_list(conf_uid: str) -> List[dict]:
         return []
 
 
+def get_history_page(
+    conf_uid: str, history_uid: str, limit: int, before: Optional[int] = None
+) -> dict:
+    """Read one page of a history, reading the log from its end
+
+    Messages are numbered from 0 (oldest) to total - 1 (newest). A page holds
+    up to `limit` messages ending just before position `before`, so the
+    newest messages are fetched first and older pages by passing the
+    previous page's start as `before`.
+
+    Args:
+        conf_uid: Configuration unique identifier
+        history_uid: History unique identifier
+        limit: Maximum number of messages in the page
+        before: Position to read up to (exclusive); None for the newest page
+
+    Returns:
+        dict: messages (oldest first), total, start position and has_more
+    """
+    empty_page = {"messages": [], "total": 0, "start": 0, "has_more": False}
+    if not conf_uid or not history_uid:
+        logger.warning("Missing conf_uid or history_uid")
+        return empty_page
+
+    filepath = _resolve_history_path(conf_uid, history_uid)
+    if not os.path.exists(filepath):
+        logger.warning(f"History file not found: {filepath}")
+        return empty_page
+
+    try:
+        total = _get_index_entry(filepath)["count"]
+        end = total if before is None else max(0, min(before, total))
+        start = max(0, end - max(0, limit))
+
+        messages = []
+        position = total
+        for message in _read_messages_reversed(filepath):
+            position -= 1
+            if position < start:
+                break
+            if position < end:
+                messages.append(message)
+        messages.reverse()
+        return {
+            "messages": messages,
+            "total": total,
+            "start": start,
+            "has_more": start > 0,
+        }
+    except Exception as e:
+        logger.error(f"Failed to read history page: {e}")
+        return empty_page
+
+
 def modify_latest_message(
     conf_uid: str,
     history_uid: str,
@@ -319,29 +730,26 @@ def modify_latest_message(
         logger.warning("Missing conf_uid or history_uid")
         return False
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    filepath = _resolve_history_path(conf_uid, history_uid)
     if not os.path.exists(filepath):
         logger.warning(f"History file not found: {filepath}")
         return False
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if not history_data:
+        latest_role = _latest_message_role(filepath)
+        if latest_role is None:
             logger.warning("History is empty")
             return False
 
-        latest_message = history_data[-1]
-        if latest_message["role"] != role:
+        if latest_role != role:
             logger.warning(
-                f"Latest message role ({latest_message['role']}) doesn't match requested role ({role})"
+                f"Latest message role ({latest_role}) doesn't match requested role ({role})"
             )
             return False
 
-        latest_message["content"] = new_content
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(history_data, f, ensure_ascii=False, indent=2)
+        _append_record(
+            filepath, {"op": OP_EDIT_LATEST, "role": role, "content": new_content}
+        )
 
         logger.debug(f"Successfully modified latest {role} message")
         return True
@@ -359,12 +767,17 @@ def rename_history_file(
         logger.warning("Missing required parameters for rename")
         return False
 
-    old_filepath = _get_safe_history_path(conf_uid, old_history_uid)
+    old_filepath = _resolve_history_path(conf_uid, old_history_uid)
     new_filepath = _get_safe_history_path(conf_uid, new_history_uid)
 
     try:
         if os.path.exists(old_filepath):
             os.rename(old_filepath, new_filepath)
+            entry = _drop_index_entry(conf_uid, old_history_uid)
+            if entry is not None:
+                conf_dir, _ = _index_location(new_filepath)
+                with _index_lock:
+                    _load_index(conf_dir)[new_history_uid] = entry
             logger.info(
                 f"Renamed history file from {old_history_uid} to {new_history_uid}"
             )
@@ -7,7 +7,7 @@ and utility functions for loading/saving configurations.
 
 # Import main configuration classes
 from .main import Config
-from .system import SystemConfig
+from .system import SystemConfig, ChatHistoryConfig
 from .character import CharacterConfig
 from .live import LiveConfig, BiliBiliLiveConfig
 from .stateless_llm import (
@@ -37,6 +37,7 @@ from .tts import (
     GPTSoVITSConfig,
     FishAPITTSConfig,
     SherpaOnnxTTSConfig,
+    TTSCacheConfig,
 )
 from .vad import (
     VADConfig,
@@ -68,6 +69,7 @@ __all__ = [
     # Main configuration classes
     "Config",
     "SystemConfig",
+    "ChatHistoryConfig",
     "CharacterConfig",
     "LiveConfig",
     "BiliBiliLiveConfig",
@@ -105,6 +107,7 @@ __all__ = [
     "GPTSoVITSConfig",
     "FishAPITTSConfig",
     "SherpaOnnxTTSConfig",
+    "TTSCacheConfig",
     # VAD related classes
     "VADConfig",
     "SileroVADConfig",
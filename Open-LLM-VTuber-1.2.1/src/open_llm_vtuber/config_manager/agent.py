@@ -34,6 +34,15 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
     use_mcpp: Optional[bool] = Field(False, alias="use_mcpp")
     mcp_enabled_servers: Optional[List[str]] = Field([], alias="mcp_enabled_servers")
+    tool_concurrency: int = Field(4, alias="tool_concurrency")
+    tool_timeout: float = Field(60.0, alias="tool_timeout")
+    tool_cache_ttl: Dict[str, float] = Field({}, alias="tool_cache_ttl")
+    tool_cache_size: int = Field(128, alias="tool_cache_size")
+    tool_cache_invalidations: Dict[str, Dict[str, Optional[str]]] = Field(
+        {}, alias="tool_cache_invalidations"
+    )
+    memory_token_budget: int = Field(0, alias="memory_token_budget")
+    summarize_memory: bool = Field(False, alias="summarize_memory")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "llm_provider": Description(
@@ -56,6 +65,34 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
             en="List of MCP servers to enable for the agent",
             zh="为智能体启用 MCP 服务器列表",
         ),
+        "tool_concurrency": Description(
+            en="Most tool calls from one LLM response that run at the same time (default: 4)",
+            zh="同一次大模型回复中可同时执行的工具调用数量上限（默认：4）",
+        ),
+        "tool_timeout": Description(
+            en="Seconds before a single tool call is abandoned; 0 waits indefinitely (default: 60)",
+            zh="单个工具调用的超时秒数；0 表示一直等待（默认：60）",
+        ),
+        "tool_cache_ttl": Description(
+            en="Read-only tools whose results are cached, with the seconds each result stays valid (default: none)",
+            zh="结果可缓存的只读工具及其结果的有效秒数（默认：不缓存）",
+        ),
+        "tool_cache_size": Description(
+            en="Most cached tool results kept per session (default: 128)",
+            zh="每个会话最多缓存的工具结果数量（默认：128）",
+        ),
+        "tool_cache_invalidations": Description(
+            en="For each write tool, the cached tools it makes stale and the argument that must match (null: all entries); Obsidian tools are built in",
+            zh="每个写入类工具会使哪些缓存工具失效，以及需要匹配的参数（null 表示全部失效）；Obsidian 工具已内置",
+        ),
+        "memory_token_budget": Description(
+            en="Estimated tokens of conversation memory sent with each request; 0 keeps everything (default: 0)",
+            zh="每次请求携带的对话记忆估算 token 上限；0 表示保留全部（默认：0）",
+        ),
+        "summarize_memory": Description(
+            en="Summarize turns that no longer fit the budget instead of dropping them; each summary is an extra call to the same LLM (default: False)",
+            zh="将超出预算的早期对话总结保留，而不是直接丢弃；每次总结都会额外调用同一个 LLM（默认：False）",
+        ),
     }
 
 
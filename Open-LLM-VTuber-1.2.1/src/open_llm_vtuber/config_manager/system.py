@@ -1,9 +1,27 @@
 # config_manager/system.py
 from pydantic import Field, model_validator
-from typing import Dict, ClassVar
+from typing import Dict, ClassVar, Literal
 from .i18n import I18nMixin, Description
 
 
+class ChatHistoryConfig(I18nMixin):
+    """Configuration for the background chat history writer."""
+
+    durability: Literal["async", "fsync", "sync"] = Field("async", alias="durability")
+    flush_interval_ms: int = Field(200, alias="flush_interval_ms")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "durability": Description(
+            en="async: write in the background; fsync: also force each batch to disk; sync: wait for each message to reach the disk",
+            zh="async：后台写入；fsync：每批写入后强制落盘；sync：等待每条消息落盘",
+        ),
+        "flush_interval_ms": Description(
+            en="How long writes are held to be batched together (ms)",
+            zh="写入合并等待时间（毫秒）",
+        ),
+    }
+
+
 class SystemConfig(I18nMixin):
     """System configuration settings."""
 
@@ -15,6 +33,9 @@ class SystemConfig(I18nMixin):
     enable_proxy: bool = Field(False, alias="enable_proxy")
     # 수정: Obsidian Vault 경로 설정 추가
     obsidian_vault_path: str | None = Field(None, alias="obsidian_vault_path")
+    chat_history: ChatHistoryConfig = Field(
+        default_factory=ChatHistoryConfig, alias="chat_history"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
@@ -35,6 +56,9 @@ class SystemConfig(I18nMixin):
             en="Path to Obsidian Vault directory for note management",
             zh="Obsidian Vault目录路径，用于笔记管理",
         ),
+        "chat_history": Description(
+            en="Chat history writer settings", zh="聊天记录写入设置"
+        ),
     }
 
     @model_validator(mode="after")
@@ -471,6 +471,7 @@ class BertVITS2TTSConfig(I18nMixin):
     style_text: str = Field("", alias="style_text")
     style_text_weight: float = Field(0.7, alias="style_text_weight")
     reference_audio_path: Optional[str] = Field(None, alias="reference_audio_path")
+    max_concurrency: int = Field(8, alias="max_concurrency")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "client_url": Description(
@@ -509,6 +510,37 @@ class BertVITS2TTSConfig(I18nMixin):
         "reference_audio_path": Description(
             en="Path to reference audio (optional)", zh="参考音频路径（可选）"
         ),
+        "max_concurrency": Description(
+            en="Sentences sent to the server at once; match its --max-batch-size",
+            zh="同时发送给服务器的句子数；应与服务器的 --max-batch-size 一致",
+        ),
+    }
+
+
+class TTSCacheConfig(I18nMixin):
+    """Configuration for the shared TTS result cache."""
+
+    enabled: bool = Field(True, alias="enabled")
+    max_memory_mb: int = Field(64, alias="max_memory_mb")
+    disk_dir: Optional[str] = Field(None, alias="disk_dir")
+    max_disk_mb: int = Field(512, alias="max_disk_mb")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Reuse synthesized audio for repeated sentences",
+            zh="对重复的句子复用已合成的音频",
+        ),
+        "max_memory_mb": Description(
+            en="Memory budget of the cache in MB", zh="缓存内存上限（MB）"
+        ),
+        "disk_dir": Description(
+            en="Directory for the persistent cache tier (optional)",
+            zh="持久化缓存目录（可选）",
+        ),
+        "max_disk_mb": Description(
+            en="Disk budget of the persistent cache tier in MB",
+            zh="持久化缓存磁盘上限（MB）",
+        ),
     }
 
 
@@ -554,6 +586,7 @@ class TTSConfig(I18nMixin):
     spark_tts: Optional[SparkTTSConfig] = Field(None, alias="spark_tts")
     minimax_tts: Optional[MinimaxTTSConfig] = Field(None, alias="minimax_tts")
     bert_vits2_tts: Optional[BertVITS2TTSConfig] = Field(None, alias="bert_vits2_tts")
+    tts_cache: TTSCacheConfig = Field(default_factory=TTSCacheConfig, alias="tts_cache")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "tts_model": Description(
@@ -593,6 +626,9 @@ class TTSConfig(I18nMixin):
         "bert_vits2_tts": Description(
             en="Configuration for Bert-VITS2 TTS", zh="Bert-VITS2 TTS 配置"
         ),
+        "tts_cache": Description(
+            en="Configuration for the shared TTS result cache", zh="TTS 结果缓存配置"
+        ),
     }
 
     @model_validator(mode="after")
@@ -7,7 +7,6 @@ from fastapi import WebSocket
 from loguru import logger
 
 from ..chat_group import ChatGroupManager
-from ..chat_history_manager import store_message
 from ..service_context import ServiceContext
 from .group_conversation import process_group_conversation
 from .single_conversation import process_single_conversation
@@ -127,7 +126,7 @@ async def handle_individual_interrupt(
             logger.error(f"Error handling interrupt: {e}")
 
         if context.history_uid:
-            store_message(
+            await context.history_writer.store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="ai",
@@ -135,7 +134,7 @@ async def handle_individual_interrupt(
                 name=context.character_config.character_name,
                 avatar=context.character_config.avatar,
             )
-            store_message(
+            await context.history_writer.store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="system",
@@ -187,7 +186,7 @@ async def handle_group_interrupt(
                 try:
                     member_ctx = client_contexts[member_uid]
                     member_ctx.agent_engine.handle_interrupt(heard_response)
-                    store_message(
+                    await member_ctx.history_writer.store_message(
                         conf_uid=member_ctx.character_config.conf_uid,
                         history_uid=member_ctx.history_uid,
                         role="ai",
@@ -195,7 +194,7 @@ async def handle_group_interrupt(
                         name=context.character_config.character_name,
                         avatar=context.character_config.avatar,
                     )
-                    store_message(
+                    await member_ctx.history_writer.store_message(
                         conf_uid=member_ctx.character_config.conf_uid,
                         history_uid=member_ctx.history_uid,
                         role="system",
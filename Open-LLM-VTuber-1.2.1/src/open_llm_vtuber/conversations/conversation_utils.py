@@ -14,6 +14,7 @@ from ..asr.asr_interface import ASRInterface
 from ..live2d_model import Live2dModel
 from ..tts.tts_interface import TTSInterface
 from ..utils.stream_audio import prepare_audio_payload
+from ..utils.turn_trace import trace_event
 
 
 # Convert class methods to standalone functions
@@ -151,7 +152,9 @@ async def process_user_input(
     """Process user input, converting audio to text if needed"""
     if isinstance(user_input, np.ndarray):
         logger.info("Transcribing audio input...")
+        trace_event("asr_start", samples=len(user_input))
         input_text = await asr_engine.async_transcribe_np(user_input)
+        trace_event("asr_end", chars=len(input_text))
         await websocket_send(
             json.dumps({"type": "user-input-transcription", "text": input_text})
         )
@@ -22,7 +22,6 @@ from .types import (
     WebSocketSend,
 )
 from ..service_context import ServiceContext
-from ..chat_history_manager import store_message
 from .tts_manager import TTSTaskManager
 
 
@@ -51,7 +50,14 @@ async def process_group_conversation(
         metadata: Optional metadata for special processing flags
     """
     # Create TTSTaskManager for each member
-    tts_managers = {uid: TTSTaskManager() for uid in group_members}
+    tts_managers = {
+        uid: TTSTaskManager(
+            audio_protocol=client_contexts[uid].audio_protocol,
+            websocket_send_bytes=client_contexts[uid].send_bytes,
+            tts_cache=client_contexts[uid].tts_cache,
+        )
+        for uid in group_members
+    }
 
     try:
         logger.info(f"Group Conversation Chain {session_emoji} started!")
@@ -93,7 +99,7 @@ async def process_group_conversation(
         if not skip_history:
             for member_uid in group_members:
                 member_context = client_contexts[member_uid]
-                store_message(
+                await member_context.history_writer.store_message(
                     conf_uid=member_context.character_config.conf_uid,
                     history_uid=member_context.history_uid,
                     role="human",
@@ -291,7 +297,7 @@ async def handle_group_member_turn(
 
         for member_uid in group_members:
             member_context = client_contexts[member_uid]
-            store_message(
+            await member_context.history_writer.store_message(
                 conf_uid=member_context.character_config.conf_uid,
                 history_uid=member_context.history_uid,
                 role="ai",
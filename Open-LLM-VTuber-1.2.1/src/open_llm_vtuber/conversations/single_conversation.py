@@ -15,7 +15,7 @@ from .conversation_utils import (
 )
 from .types import WebSocketSend
 from .tts_manager import TTSTaskManager
-from ..chat_history_manager import store_message
+from ..utils.turn_trace import start_turn_trace, finish_turn_trace
 from ..service_context import ServiceContext
 
 # Import necessary types from agent outputs
@@ -46,8 +46,14 @@ async def process_single_conversation(
         str: Complete response text
     """
     # Create TTSTaskManager for this conversation
-    tts_manager = TTSTaskManager()
+    tts_manager = TTSTaskManager(
+        audio_protocol=context.audio_protocol,
+        websocket_send_bytes=context.send_bytes,
+        tts_cache=context.tts_cache,
+    )
     full_response = ""  # Initialize full_response here
+    # Timestamps ASR, LLM, sentence, TTS and send stages of this turn
+    turn_trace = start_turn_trace(client_uid)
 
     try:
         # Send initial signals
@@ -70,7 +76,7 @@ async def process_single_conversation(
         # Store user message (check if we should skip storing to history)
         skip_history = metadata and metadata.get("skip_history", False)
         if context.history_uid and not skip_history:
-            store_message(
+            await context.history_writer.store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="human",
@@ -148,8 +154,12 @@ async def process_single_conversation(
             client_uid=client_uid,
         )
 
+        await websocket_send(
+            json.dumps({"type": "turn-trace", "trace": finish_turn_trace(turn_trace)})
+        )
+
         if context.history_uid and full_response:  # Check full_response before storing
-            store_message(
+            await context.history_writer.store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="ai",
@@ -8,15 +8,43 @@ from loguru import logger
 
 from ..agent.output_types import DisplayText, Actions
 from ..live2d_model import Live2dModel
+from ..tts.tts_cache import CachedAudio, TTSResultCache
 from ..tts.tts_interface import TTSInterface
-from ..utils.stream_audio import prepare_audio_payload
-from .types import WebSocketSend
+from ..tts.tts_scheduler import get_tts_scheduler
+from ..utils.turn_trace import trace_event
+from ..utils.stream_audio import (
+    load_audio_data,
+    prepare_audio_payload,
+    split_binary_audio_payload,
+)
+from .types import AudioProtocol, WebSocketSend, WebSocketSendBytes
 
 
 class TTSTaskManager:
-    """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation"""
+    """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation
 
-    def __init__(self) -> None:
+    Generation is throttled by the engine's shared TTSScheduler, so each
+    sentence task waits for a slot in sequence order.
+    """
+
+    def __init__(
+        self,
+        audio_protocol: AudioProtocol = "base64",
+        websocket_send_bytes: Optional[WebSocketSendBytes] = None,
+        tts_cache: Optional[TTSResultCache] = None,
+    ) -> None:
+        """
+        Args:
+            audio_protocol: How audio is delivered to the client ("base64" or "binary")
+            websocket_send_bytes: Binary send function, required for the binary protocol
+            tts_cache: Shared synthesized-audio cache consulted before the TTS engine
+        """
+        if audio_protocol == "binary" and websocket_send_bytes is None:
+            logger.warning("Binary audio protocol requested without a binary sender")
+            audio_protocol = "base64"
+        self._audio_protocol: AudioProtocol = audio_protocol
+        self._websocket_send_bytes = websocket_send_bytes
+        self._tts_cache = tts_cache
         self.task_list: List[asyncio.Task] = []
         self._lock = asyncio.Lock()
         # Queue to store ordered payloads
@@ -26,6 +54,12 @@ class TTSTaskManager:
         # Counter for maintaining order
         self._sequence_counter = 0
         self._next_sequence_to_send = 0
+        # Text of unfinished TTS tasks, and which of them reached the engine.
+        # Keyed by task: sequence numbers restart at 0 after every clear()
+        self._pending_texts: Dict[asyncio.Task, str] = {}
+        self._in_flight: set[asyncio.Task] = set()
+        # Synthesis work avoided by interrupts (see clear)
+        self.cancel_stats = {"skipped": 0, "aborted": 0, "chars_avoided": 0}
 
     async def speak(
         self,
@@ -87,6 +121,7 @@ class TTSTaskManager:
                 sequence_number=current_sequence,
             )
         )
+        self._pending_texts[task] = tts_text
         self.task_list.append(task)
 
     async def _process_payload_queue(self, websocket_send: WebSocketSend) -> None:
@@ -105,7 +140,9 @@ class TTSTaskManager:
                 # Send payloads in order
                 while self._next_sequence_to_send in buffered_payloads:
                     next_payload = buffered_payloads.pop(self._next_sequence_to_send)
-                    await websocket_send(json.dumps(next_payload))
+                    await self._send_payload(
+                        websocket_send, next_payload, self._next_sequence_to_send
+                    )
                     self._next_sequence_to_send += 1
 
                 self._payload_queue.task_done()
@@ -113,6 +150,23 @@ class TTSTaskManager:
             except asyncio.CancelledError:
                 break
 
+    async def _send_payload(
+        self, websocket_send: WebSocketSend, payload: Dict, sequence_number: int
+    ) -> None:
+        """Send one payload using the negotiated audio protocol"""
+        if self._audio_protocol != "binary":
+            await websocket_send(json.dumps(payload))
+        else:
+            header, audio_bytes = split_binary_audio_payload(payload, sequence_number)
+            await websocket_send(json.dumps(header))
+            if audio_bytes is not None:
+                await self._websocket_send_bytes(audio_bytes)
+        trace_event(
+            "payload_sent",
+            sequence=sequence_number,
+            audio=payload.get("audio") is not None,
+        )
+
     async def _send_silent_payload(
         self,
         display_text: DisplayText,
@@ -138,12 +192,42 @@ class TTSTaskManager:
     ) -> None:
         """Process TTS generation and queue the result for ordered delivery"""
         audio_file_path = None
+        audio_pcm = None
+        new_entry = None
+        task = asyncio.current_task()
         try:
-            audio_file_path = await self._generate_audio(tts_engine, tts_text)
+            cache_key = self._cache_key(tts_engine, tts_text)
+            cached = await self._tts_cache.aget(cache_key) if cache_key else None
+            if cached is not None:
+                logger.debug(f"TTS cache hit for '{tts_text}'")
+                trace_event("tts_cache_hit", sequence=sequence_number)
+                audio_data = (cached.audio_bytes, cached.volumes)
+            else:
+                # Lowest sequence number first, capped per engine across sessions
+                async with get_tts_scheduler(tts_engine).slot(sequence_number):
+                    self._in_flight.add(task)
+                    trace_event("tts_start", sequence=sequence_number)
+                    if tts_engine.supports_pcm:
+                        # Engine hands back decoded audio; skip the cache file entirely
+                        audio_pcm = await self._generate_pcm(tts_engine, tts_text)
+                    else:
+                        audio_file_path = await self._generate_audio(
+                            tts_engine, tts_text
+                        )
+                    trace_event("tts_end", sequence=sequence_number)
+
+                audio_data = None
+                if audio_file_path or audio_pcm is not None:
+                    audio_data = load_audio_data(audio_file_path, audio_pcm)
+                    if cache_key:
+                        new_entry = CachedAudio(*audio_data)
+
             payload = prepare_audio_payload(
-                audio_path=audio_file_path,
+                audio_path=None,
                 display_text=display_text,
                 actions=actions,
+                encode_base64=self._audio_protocol != "binary",
+                audio_data=audio_data,
             )
             # Queue the payload with its sequence number
             await self._payload_queue.put((payload, sequence_number))
@@ -159,10 +243,26 @@ class TTSTaskManager:
             await self._payload_queue.put((payload, sequence_number))
 
         finally:
+            self._pending_texts.pop(task, None)
+            self._in_flight.discard(task)
             if audio_file_path:
                 tts_engine.remove_file(audio_file_path)
                 logger.debug("Audio cache file cleaned.")
 
+        if new_entry is not None:
+            # Only after queueing, so the disk write never delays playback
+            await self._tts_cache.aput(cache_key, new_entry)
+
+    def _cache_key(self, tts_engine: TTSInterface, text: str) -> Optional[str]:
+        """Cache key for text spoken by tts_engine, or None if caching is off"""
+        if self._tts_cache is None or tts_engine.voice_params is None:
+            return None
+        return self._tts_cache.make_key(
+            text,
+            tts_engine.voice_params,
+            slice_length=20,  # prepare_audio_payload's default chunk length
+        )
+
     async def _generate_audio(self, tts_engine: TTSInterface, text: str) -> str:
         """Generate audio file from text"""
         logger.debug(f"🏃Generating audio for '''{text}'''...")
@@ -171,8 +271,14 @@ class TTSTaskManager:
             file_name_no_ext=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
         )
 
+    async def _generate_pcm(self, tts_engine: TTSInterface, text: str):
+        """Generate in-memory (audio_array, sample_rate) from text"""
+        logger.debug(f"🏃Generating in-memory audio for '''{text}'''...")
+        return await tts_engine.async_generate_pcm(text=text)
+
     def clear(self) -> None:
-        """Clear all pending tasks and reset state"""
+        """Cancel unfinished TTS work, clear all pending tasks and reset state"""
+        self._cancel_pending_tasks()
         self.task_list.clear()
         if self._sender_task:
             self._sender_task.cancel()
@@ -180,3 +286,33 @@ class TTSTaskManager:
         self._next_sequence_to_send = 0
         # Create a new queue to clear any pending items
         self._payload_queue = asyncio.Queue()
+
+    def _cancel_pending_tasks(self) -> None:
+        """
+        Cancel TTS tasks that have not finished yet.
+
+        Sentences still waiting for a scheduler slot never reach the engine;
+        in-flight ones are cancelled down to the engine's HTTP request, which
+        aborts the job server-side where the engine supports it.
+        """
+        skipped = aborted = chars = 0
+        for task, text in self._pending_texts.items():
+            if task in self._in_flight:
+                aborted += 1
+            else:
+                skipped += 1
+            chars += len(text)
+        for task in self.task_list:
+            if not task.done():
+                task.cancel()
+        self._pending_texts.clear()
+        self._in_flight.clear()
+
+        if skipped or aborted:
+            self.cancel_stats["skipped"] += skipped
+            self.cancel_stats["aborted"] += aborted
+            self.cancel_stats["chars_avoided"] += chars
+            logger.info(
+                f"🛑 Cancelled TTS work: {skipped} queued sentence(s) skipped, "
+                f"{aborted} in-flight aborted ({chars} chars not synthesized)"
+            )
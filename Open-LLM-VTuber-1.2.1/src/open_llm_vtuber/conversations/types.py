@@ -1,4 +1,13 @@
-from typing import List, Dict, Callable, Optional, TypedDict, Awaitable, ClassVar
+from typing import (
+    List,
+    Dict,
+    Callable,
+    Optional,
+    TypedDict,
+    Awaitable,
+    ClassVar,
+    Literal,
+)
 from dataclasses import dataclass, field
 from pydantic import BaseModel
 
@@ -6,8 +15,14 @@ from ..agent.output_types import Actions, DisplayText
 
 # Type definitions
 WebSocketSend = Callable[[str], Awaitable[None]]
+WebSocketSendBytes = Callable[[bytes], Awaitable[None]]
 BroadcastFunc = Callable[[List[str], dict, Optional[str]], Awaitable[None]]
 
+# "base64": audio inlined in the JSON payload (default, understood by every client)
+# "binary": JSON header frame followed by a raw WAV binary frame
+AudioProtocol = Literal["base64", "binary"]
+AUDIO_PROTOCOLS = ("base64", "binary")
+
 
 class AudioPayload(TypedDict):
     """Type definition for audio payload"""
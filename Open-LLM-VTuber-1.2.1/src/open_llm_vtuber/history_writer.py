@@ -0,0 +1,193 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Literal, Optional, Tuple
+
+from loguru import logger
+
+from .chat_history_manager import append_history_records, build_message_record
+
+Durability = Literal["async", "fsync", "sync"]
+
+# (conf_uid, history_uid, record, done) - a flush marker has no record
+_WriteItem = Tuple[
+    Optional[str], Optional[str], Optional[dict], Optional[asyncio.Future]
+]
+
+
+class HistoryWriter:
+    """
+    Write-behind chat history writer, shared by every session.
+
+    Messages are queued from the event loop and written by one background
+    worker, which drains the queue in batches and appends each history file's
+    records in a single write on a dedicated thread, so disk latency never
+    blocks a WebSocket.
+
+    Durability modes:
+        async: queued writes, left to the OS page cache (default)
+        fsync: queued writes, each batch forced to disk
+        sync: like fsync, and callers wait until their message is on disk
+    """
+
+    def __init__(
+        self,
+        durability: Durability = "async",
+        flush_interval_ms: int = 200,
+        max_batch_size: int = 256,
+    ) -> None:
+        """
+        Args:
+            durability: One of "async", "fsync" or "sync"
+            flush_interval_ms: How long the worker waits to coalesce writes
+            max_batch_size: Most queued items written in one batch
+        """
+        self.durability = durability
+        self.flush_interval = max(0, flush_interval_ms) / 1000
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queue: Optional[asyncio.Queue[_WriteItem]] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.records_written = 0
+        self.batches_written = 0
+
+    async def store_message(
+        self,
+        conf_uid: str,
+        history_uid: str,
+        role: Literal["human", "ai", "system"],
+        content: str,
+        name: str | None = None,
+        avatar: str | None = None,
+    ) -> None:
+        """
+        Queue a message for a specific history file.
+
+        The message is timestamped now, not when it reaches the disk.
+
+        Args:
+            conf_uid: Configuration unique identifier
+            history_uid: History unique identifier
+            role: Message role ("human", "ai" or "system")
+            content: Message content
+            name: Optional display name (default None)
+            avatar: Optional avatar URL (default None)
+        """
+        if not conf_uid or not history_uid:
+            if not conf_uid:
+                logger.warning("Missing conf_uid")
+            if not history_uid:
+                logger.warning("Missing history_uid")
+            return
+
+        record = build_message_record(role, content, name, avatar)
+        if self.durability == "sync":
+            await self._submit(conf_uid, history_uid, record)
+        else:
+            self._enqueue((conf_uid, history_uid, record, None))
+
+    async def flush(self) -> None:
+        """Wait until every message queued so far is written."""
+        if self._queue is None:
+            return
+        await self._submit(None, None, None)
+
+    async def close(self) -> None:
+        """Flush pending messages, then stop the worker and its thread.
+
+        A message stored afterwards starts them again.
+        """
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # ==== Worker
+
+    def _enqueue(self, item: _WriteItem) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._wakeup = self._wakeup or asyncio.Event()
+            self._executor = self._executor or ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="history-writer"
+            )
+            self._worker = asyncio.create_task(self._run())
+        self._queue.put_nowait(item)
+        if item[3] is not None:
+            # Someone is waiting: skip the coalescing delay
+            self._wakeup.set()
+
+    async def _submit(
+        self,
+        conf_uid: Optional[str],
+        history_uid: Optional[str],
+        record: Optional[dict],
+    ) -> None:
+        done = asyncio.get_running_loop().create_future()
+        self._enqueue((conf_uid, history_uid, record, done))
+        await done
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.flush_interval and batch[0][3] is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Coalesce into one append per history file, in arrival order
+            groups: Dict[Tuple[str, str], List[dict]] = {}
+            for conf_uid, history_uid, record, _ in batch:
+                if record is not None:
+                    groups.setdefault((conf_uid, history_uid), []).append(record)
+
+            errors: Dict[Tuple[str, str], Exception] = {}
+            if groups:
+                try:
+                    errors = await loop.run_in_executor(
+                        self._executor, self._write, groups
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to write chat history batch: {e}")
+                    errors = dict.fromkeys(groups, e)
+
+            for conf_uid, history_uid, record, done in batch:
+                if done is not None and not done.done():
+                    # Flush markers complete either way; failures were logged
+                    error = errors.get((conf_uid, history_uid))
+                    if error is not None and record is not None:
+                        done.set_exception(error)
+                    else:
+                        done.set_result(None)
+                self._queue.task_done()
+
+    def _write(
+        self, groups: Dict[Tuple[str, str], List[dict]]
+    ) -> Dict[Tuple[str, str], Exception]:
+        """Append each file's records; return the error of each file that failed."""
+        fsync = self.durability != "async"
+        errors = {}
+        for (conf_uid, history_uid), records in groups.items():
+            try:
+                append_history_records(conf_uid, history_uid, records, fsync=fsync)
+                self.records_written += len(records)
+            except Exception as e:
+                # Keep writing the other files
+                logger.error(f"Failed to write history {history_uid}: {e}")
+                errors[(conf_uid, history_uid)] = e
+        self.batches_written += 1
+        return errors
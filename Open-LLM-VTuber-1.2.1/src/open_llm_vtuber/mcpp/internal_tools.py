@@ -1,10 +1,51 @@
 """Internal MCP tools for Open-LLM-VTuber (not from external MCP servers)."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from loguru import logger
 
 from .types import FormattedTool
 
+# Cached Obsidian results each write tool makes stale (see ToolResultCache):
+# reads of the same note_path, and every search or listing
+OBSIDIAN_CACHE_INVALIDATIONS = {
+    "obsidian_write_note": {
+        "obsidian_read_note": "note_path",
+        "obsidian_search_notes": None,
+        "obsidian_list_notes": None,
+    },
+    "obsidian_append_to_note": {
+        "obsidian_read_note": "note_path",
+        "obsidian_search_notes": None,
+        "obsidian_list_notes": None,
+    },
+    # The daily note path is derived from the date, so drop every read
+    "obsidian_create_daily_note": {
+        "obsidian_read_note": None,
+        "obsidian_search_notes": None,
+        "obsidian_list_notes": None,
+    },
+}
+
+# Obsidian tools that change the vault; the others only read it
+OBSIDIAN_WRITE_TOOLS = frozenset(
+    {"obsidian_write_note", "obsidian_append_to_note", "obsidian_create_daily_note"}
+)
+
+
+def obsidian_note_scope(tool_name: str, tool_args: Any) -> Optional[str]:
+    """Note path an Obsidian call is limited to, or None for the whole vault.
+
+    Searches and listings read every note, and the daily note path is
+    derived from the date, so those calls cover the whole vault.
+    """
+    if tool_name in (
+        "obsidian_read_note",
+        "obsidian_write_note",
+        "obsidian_append_to_note",
+    ) and isinstance(tool_args, dict):
+        return tool_args.get("note_path") or None
+    return None
+
 
 def get_obsidian_tools(obsidian_vault_manager) -> Dict[str, FormattedTool]:
     """Get Obsidian Vault tools as FormattedTool objects.
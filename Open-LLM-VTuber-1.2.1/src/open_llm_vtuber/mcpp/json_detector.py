@@ -1,16 +1,46 @@
 import json
+from collections import deque
 from typing import List, Dict, Any, Optional, Tuple
 from loguru import logger
 
+# Characters json.loads accepts outside strings (incl. NaN and Infinity)
+_JSON_CHARS = frozenset(' \t\n\r{}[]:,"+-.0123456789eEtruefalsnNaIiy')
+# What may follow a closed string (a key or a value) in JSON
+_AFTER_STRING = frozenset(":,}]")
+
 
 class StreamJSONDetector:
-    """Detector for real-time JSON detection in streaming text."""
+    """Detector for real-time JSON detection in streaming text.
+
+    Works as a single-pass state machine: every character is inspected exactly
+    once when it arrives, tracking brace depth and whether the scan is inside a
+    JSON string. A candidate object is only handed to json.loads once its
+    outermost closing brace has arrived, so the per-chunk cost does not depend
+    on how long the response already is.
+
+    A candidate that can no longer become JSON (text outside its strings that
+    JSON does not allow) or that stays open for more than `max_object_chars`
+    is dropped and the text after it is scanned again, so it neither hides
+    later objects nor keeps the buffer growing.
+    """
 
-    def __init__(self):
-        self.buffer = ""  # Store text that has not been fully processed
-        self.potential_jsons = []  # Store possible JSON starting positions
+    def __init__(self, max_object_chars: int = 65536):
+        """
+        Args:
+            max_object_chars (int): Longest object to wait for; an open
+                candidate that started earlier than this is given up
+        """
+        self.max_object_chars = max(1, max_object_chars)
+        self._parts: deque = deque()  # Chunks from the oldest still-open "{" onwards
         self.completed_jsons = []  # Store completed JSON objects
-        self.processed_ranges = []  # Store processed intervals [start, end]
+        self._offset = 0  # Absolute stream position of _parts[0][0]
+        self._end = 0  # Absolute stream position after the last chunk
+        self._open_starts: List[int] = []  # Absolute positions of unclosed "{"
+        self._closed_spans: List[Tuple[int, int]] = []  # Closed inside an open one
+        self._in_string = False
+        self._escaped = False
+        self._validating = False  # Last "{" still needs its next character
+        self._after_string = False  # A string just closed inside a candidate
 
     def process_chunk(self, chunk: str) -> List[Dict[str, Any]]:
         """Process a single text chunk, return a list of complete JSON objects found in this chunk.
@@ -21,104 +51,165 @@ class StreamJSONDetector:
         Returns:
             List[Dict[str, Any]]: List of complete JSON objects parsed from the current chunk
         """
-        # Add new chunk to buffer
-        old_length = len(self.buffer)
-        self.buffer += chunk
+        start = self._end
+        self._parts.append(chunk)
+        self._end += len(chunk)
 
-        # Update potential JSON starting positions
-        self._find_potential_starts(old_length)
-
-        # Try to parse potential JSON objects
-        new_jsons = self._try_parse_jsons()
+        new_jsons = self._scan(chunk, start)
 
+        self._trim_buffer()
         return new_jsons
 
-    def _find_potential_starts(self, start_from: int) -> None:
-        """Find new potential JSON starting positions in the buffer.
+    def _scan(self, chunk: str, start: int) -> List[Dict[str, Any]]:
+        """Advance the brace/string state machine over newly arrived text.
 
-        Args:
-            start_from (int): Position to start searching from
-        """
-        for i in range(start_from, len(self.buffer)):
-            if self.buffer[i] == "{" and not self._is_in_processed_range(i):
-                self.potential_jsons.append(i)
-
-    def _is_in_processed_range(self, pos: int) -> bool:
-        """Check if a specified position is within a processed range.
+        When candidates are dropped, the text after the oldest one is scanned
+        again from a clean state: a prose "{" followed by '"' may have turned
+        a real object into part of a bogus string. An age-based drop rescans
+        from the oldest position still allowed, so each chunk rescans at most
+        `max_object_chars` per dropped candidate.
 
         Args:
-            pos (int): Position to check
+            chunk (str): Newly arrived text
+            start (int): Absolute stream position of chunk[0]
 
         Returns:
-            bool: True if position is within a processed range, otherwise False
+            List[Dict[str, Any]]: JSON objects completed in this chunk
         """
-        for start, end in self.processed_ranges:
-            if start <= pos <= end:
-                return True
-        return False
+        new_jsons = []
+        text, position = chunk, start
+        while True:
+            restart = self._scan_text(text, position, new_jsons)
+            if restart is None:
+                limit = self._end - self.max_object_chars
+                if not self._open_starts or self._open_starts[0] >= limit:
+                    return new_jsons
+                logger.debug("Dropping JSON candidate(s) open for too long")
+                restart = limit
+            self._reset_candidates()
+            text, position = self.buffer[restart - self._offset :], restart
+
+    def _scan_text(
+        self, text: str, start: int, new_jsons: List[Dict[str, Any]]
+    ) -> Optional[int]:
+        """Run the state machine over `text`, appending completed objects.
+
+        A "{" only opens a candidate if the next non-whitespace character is
+        '"' or "}", so braces in ordinary prose do not swallow later objects.
+        Objects are parsed once the outermost candidate closes.
 
-    def _try_parse_jsons(self) -> List[Dict[str, Any]]:
-        """Try to parse JSON objects from the current buffer.
+        Args:
+            text (str): Text to scan
+            start (int): Absolute stream position of text[0]
+            new_jsons (List[Dict[str, Any]]): Receives the completed objects
 
         Returns:
-            List[Dict[str, Any]]: List of newly parsed JSON objects
+            Optional[int]: Position to rescan from if the open candidates can
+            no longer be JSON, otherwise None
         """
-        new_jsons = []
-        remaining_potential = []
-
-        # Sort by starting position, process outermost JSON first
-        self.potential_jsons.sort()
-
-        for start_idx in self.potential_jsons:
-            # Skip if this position is already within a processed range
-            if self._is_in_processed_range(start_idx):
+        open_starts = self._open_starts
+        in_string = self._in_string
+        escaped = self._escaped
+        validating = self._validating
+        after_string = self._after_string
+
+        for i, char in enumerate(text, start):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                    after_string = True
                 continue
 
-            result, end_idx = self._extract_json(start_idx)
-            if result is not None:
-                new_jsons.append(result)
-                # Mark this range as processed
-                self.processed_ranges.append((start_idx, end_idx))
-                self.completed_jsons.append(result)
-            else:
-                # This JSON may not be complete yet, keep it
-                remaining_potential.append(start_idx)
-
-        self.potential_jsons = remaining_potential
-        return new_jsons
-
-    def _extract_json(self, start_idx: int) -> Tuple[Optional[Dict[str, Any]], int]:
-        """Try to extract a complete JSON object from the given position.
+            if after_string and not char.isspace():
+                after_string = False
+                if open_starts and char not in _AFTER_STRING:
+                    # e.g. outer "{" {"a": 1}: the quotes were prose and the
+                    # "string" swallowed the start of a real object
+                    return open_starts[0] + 1
+
+            if validating and not char.isspace():
+                validating = False
+                if char != '"' and char != "}":
+                    open_starts.pop()  # Not an object, just a brace in text
+
+            if char == "{":
+                open_starts.append(i)
+                validating = True
+            elif char == "}":
+                if open_starts:
+                    self._closed_spans.append((open_starts.pop(), i))
+                    if not open_starts:
+                        new_jsons.extend(self._parse_spans(self._closed_spans))
+                        self._closed_spans = []
+            elif char == '"' and open_starts:
+                # Quotes only delimit strings inside a candidate object
+                in_string = True
+            elif open_starts and char not in _JSON_CHARS:
+                # No open candidate can be JSON any more, e.g. the model
+                # stopped mid-object and went on with prose
+                return open_starts[0] + 1
+
+        self._in_string = in_string
+        self._escaped = escaped
+        self._validating = validating
+        self._after_string = after_string
+        return None
+
+    def _reset_candidates(self) -> None:
+        """Forget all open candidates and the objects closed inside them."""
+        self._open_starts = []
+        self._closed_spans = []
+        self._in_string = False
+        self._escaped = False
+        self._validating = False
+        self._after_string = False
+
+    def _parse_spans(self, spans: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """Parse closed objects, outermost first.
+
+        Objects nested in one that parsed successfully are not reported on
+        their own; if an outer object is not valid JSON its inner objects are
+        tried instead.
 
         Args:
-            start_idx (int): Potential starting position of JSON
+            spans (List[Tuple[int, int]]): Absolute (start, end) of closed objects
 
         Returns:
-            Tuple[Optional[Dict[str, Any]], int]: Parsed JSON object and ending position,
-                                               or (None, -1) if incomplete
+            List[Dict[str, Any]]: Newly parsed JSON objects
         """
-        stack = 1
-        i = start_idx + 1
-
-        while i < len(self.buffer) and stack > 0:
-            if self.buffer[i] == "{":
-                stack += 1
-            elif self.buffer[i] == "}":
-                stack -= 1
-            i += 1
-
-        # If complete JSON is found
-        if stack == 0:
-            json_str = self.buffer[start_idx:i]
+        new_jsons = []
+        covered_until = -1
+        buffer = self.buffer
+        for start_idx, end_idx in sorted(spans):
+            if start_idx <= covered_until:
+                continue
+            json_str = buffer[start_idx - self._offset : end_idx - self._offset + 1]
             try:
                 json_data = json.loads(json_str)
-                return json_data, i - 1
             except json.JSONDecodeError:
                 logger.warning(
                     f"JSON structure found but parsing failed: {json_str[:50]}..."
                 )
+                continue
+            new_jsons.append(json_data)
+            self.completed_jsons.append(json_data)
+            covered_until = end_idx
+        return new_jsons
+
+    @property
+    def buffer(self) -> str:
+        """Text that may still be part of a JSON object."""
+        return "".join(self._parts)
 
-        return None, -1
+    def _trim_buffer(self) -> None:
+        """Drop chunks that can no longer be part of a JSON object."""
+        keep_from = self._open_starts[0] if self._open_starts else self._end
+        while self._parts and self._offset + len(self._parts[0]) <= keep_from:
+            self._offset += len(self._parts.popleft())
 
     def get_all_jsons(self) -> List[Dict[str, Any]]:
         """Get all JSON objects parsed so far.
@@ -130,10 +221,16 @@ class StreamJSONDetector:
 
     def reset(self) -> None:
         """Reset detector state, prepare to process a new stream."""
-        self.buffer = ""
-        self.potential_jsons = []
+        self._parts = deque()
         self.completed_jsons = []
-        self.processed_ranges = []
+        self._offset = 0
+        self._end = 0
+        self._open_starts = []
+        self._closed_spans = []
+        self._in_string = False
+        self._escaped = False
+        self._validating = False
+        self._after_string = False
 
 
 # Usage example
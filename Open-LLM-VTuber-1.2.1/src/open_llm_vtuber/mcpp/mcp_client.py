@@ -1,22 +1,19 @@
 """MCP Client for Open-LLM-Vtuber."""
 
-from contextlib import AsyncExitStack
 from typing import Dict, Any, List, Callable
 from loguru import logger
-from datetime import timedelta
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession
 from mcp.types import Tool
-from mcp.client.stdio import stdio_client
 
 from .server_registry import ServerRegistry
-
-DEFAULT_TIMEOUT = timedelta(seconds=30)
+from .session_pool import MCPSessionPool
 
 
 class MCPClient:
     """MCP Client for Open-LLM-Vtuber.
-    Manages persistent connections to multiple MCP servers.
+    Calls tools through an MCPSessionPool, which keeps the server processes
+    running and shares them with every other client of the pool.
     """
 
     def __init__(
@@ -24,11 +21,13 @@ class MCPClient:
         server_registery: ServerRegistry,
         send_text: Callable = None,
         client_uid: str = None,
+        session_pool: MCPSessionPool | None = None,
     ) -> None:
-        """Initialize the MCP Client."""
-        self.exit_stack: AsyncExitStack = AsyncExitStack()
-        self.active_sessions: Dict[str, ClientSession] = {}
-        self._list_tools_cache: Dict[str, List[Tool]] = {}  # Cache for list_tools
+        """Initialize the MCP Client.
+
+        Without a session_pool, the client starts a private pool whose servers
+        are stopped by aclose().
+        """
         self._send_text: Callable = send_text
         self._client_uid: str = client_uid
 
@@ -38,65 +37,23 @@ class MCPClient:
             raise TypeError(
                 "MCPC: Invalid server manager. Must be an instance of ServerRegistry."
             )
+        self._owns_pool = session_pool is None
+        self.session_pool = session_pool or MCPSessionPool(server_registery)
         logger.info("MCPC: Initialized MCPClient instance.")
 
     async def _ensure_server_running_and_get_session(
         self, server_name: str
     ) -> ClientSession:
-        """Gets the existing session or creates a new one."""
-        if server_name in self.active_sessions:
-            return self.active_sessions[server_name]
-
-        logger.info(f"MCPC: Starting and connecting to server '{server_name}'...")
-        server = self.server_registery.get_server(server_name)
-        if not server:
-            raise ValueError(
-                f"MCPC: Server '{server_name}' not found in available servers."
-            )
-
-        timeout = server.timeout if server.timeout else DEFAULT_TIMEOUT
-
-        server_params = StdioServerParameters(
-            command=server.command, args=server.args, env=server.env, cwd=server.cwd
-        )
-
-        try:
-            stdio_transport = await self.exit_stack.enter_async_context(
-                stdio_client(server_params)
-            )
-            read, write = stdio_transport
-
-            session = await self.exit_stack.enter_async_context(
-                ClientSession(read, write, read_timeout_seconds=timeout)
-            )
-            await session.initialize()
+        """Gets the pooled session, starting the server if needed."""
+        return await self.session_pool.get_session(server_name)
 
-            self.active_sessions[server_name] = session
-            logger.info(f"MCPC: Successfully connected to server '{server_name}'.")
-            return session
-        except Exception as e:
-            logger.exception(f"MCPC: Failed to connect to server '{server_name}': {e}")
-            raise RuntimeError(
-                f"MCPC: Failed to connect to server '{server_name}'."
-            ) from e
+    async def connect(self, server_name: str) -> None:
+        """Start the server and connect to it, if not connected yet."""
+        await self._ensure_server_running_and_get_session(server_name)
 
     async def list_tools(self, server_name: str) -> List[Tool]:
-        """List all available tools on the specified server."""
-        # Check cache first
-        if server_name in self._list_tools_cache:
-            logger.debug(f"MCPC: Cache hit for list_tools on server '{server_name}'.")
-            return self._list_tools_cache[server_name]
-
-        logger.debug(
-            f"MCPC: Cache miss for list_tools on server '{server_name}'. Fetching..."
-        )
-        session = await self._ensure_server_running_and_get_session(server_name)
-        response = await session.list_tools()
-
-        # Store in cache before returning
-        self._list_tools_cache[server_name] = response.tools
-        logger.debug(f"MCPC: Cached list_tools result for server '{server_name}'.")
-        return response.tools
+        """List all available tools on the specified server (cached by the pool)."""
+        return await self.session_pool.list_tools(server_name)
 
     async def call_tool(
         self, server_name: str, tool_name: str, tool_args: Dict[str, Any]
@@ -106,9 +63,8 @@ class MCPClient:
         Returns:
             Dict containing the metadata and content_items from the tool response.
         """
-        session = await self._ensure_server_running_and_get_session(server_name)
         logger.info(f"MCPC: Calling tool '{tool_name}' on server '{server_name}'...")
-        response = await session.call_tool(tool_name, tool_args)
+        response = await self.session_pool.call_tool(server_name, tool_name, tool_args)
 
         if response.isError:
             error_text = (
@@ -155,14 +111,10 @@ class MCPClient:
         return result
 
     async def aclose(self) -> None:
-        """Closes all active server connections."""
-        logger.info(
-            f"MCPC: Closing client instance and {len(self.active_sessions)} active connections..."
-        )
-        await self.exit_stack.aclose()
-        self.active_sessions.clear()
-        self._list_tools_cache.clear()  # Clear cache on close
-        self.exit_stack = AsyncExitStack()
+        """Release the client; servers of a shared pool keep running."""
+        if self._owns_pool:
+            logger.info("MCPC: Closing client instance and its private servers...")
+            await self.session_pool.close()
         logger.info("MCPC: Client instance closed.")
 
     async def __aenter__(self) -> "MCPClient":
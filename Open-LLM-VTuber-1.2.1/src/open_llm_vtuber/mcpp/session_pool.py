@@ -0,0 +1,241 @@
+"""Process-wide pool of MCP server sessions for Open-LLM-Vtuber."""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import anyio
+from loguru import logger
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult, Tool
+
+from .server_registry import ServerRegistry
+
+# Errors from the stdio streams themselves: the server process is gone
+_TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    EOFError,
+)
+
+DEFAULT_TIMEOUT = timedelta(seconds=30)
+HEALTH_CHECK_INTERVAL = 30.0  # seconds between pings of an idle server
+PING_TIMEOUT = 10.0
+
+
+class _PooledServer:
+    """State of one server process kept by the pool."""
+
+    def __init__(self, name: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.name = name
+        self.session: Optional[ClientSession] = None
+        self.task: Optional[asyncio.Task] = None
+        self.ready: asyncio.Future = loop.create_future()
+        self.unhealthy = asyncio.Event()
+        self.restarts = 0
+
+
+class MCPSessionPool:
+    """Shares one running process and session per MCP server across all clients.
+
+    Each server is owned by a long-lived task that starts the process, keeps
+    the session open and pings it periodically; a failed ping or transport
+    error restarts the process. Other request errors (bad arguments, invalid
+    responses, timeouts) only fail the calling request. Sessions multiplex requests by JSON-RPC id, so
+    every connected client can call tools on the same session concurrently.
+    `list_tools` results are cached for the life of the pool.
+    """
+
+    def __init__(
+        self,
+        server_registery: ServerRegistry,
+        health_check_interval: float = HEALTH_CHECK_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            server_registery: Registry describing how to start each server
+            health_check_interval: Seconds between pings of a running server
+        """
+        if not isinstance(server_registery, ServerRegistry):
+            raise TypeError(
+                "MCPSP: Invalid server manager. Must be an instance of ServerRegistry."
+            )
+        self.server_registery = server_registery
+        self.health_check_interval = health_check_interval
+
+        self._servers: Dict[str, _PooledServer] = {}
+        self._tools_cache: Dict[str, List[Tool]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self, server_names: List[str]) -> None:
+        """Start the given servers ahead of their first use."""
+        names = [n for n in server_names if n in self.server_registery.servers]
+        results = await asyncio.gather(
+            *(self.get_session(name) for name in names), return_exceptions=True
+        )
+        started = [n for n, r in zip(names, results) if not isinstance(r, Exception)]
+        logger.info(
+            f"MCPSP: Pre-started {len(started)}/{len(names)} servers: {started}"
+        )
+
+    async def get_session(self, server_name: str) -> ClientSession:
+        """Return the running session of a server, starting it if needed."""
+        entry = self._get_entry(server_name)
+        if entry.task is None or entry.task.done():
+            entry.ready = asyncio.get_running_loop().create_future()
+            entry.task = asyncio.create_task(self._serve(entry))
+        # Shield: a cancelled caller must not fail the start for everyone
+        return await asyncio.shield(entry.ready)
+
+    async def list_tools(self, server_name: str) -> List[Tool]:
+        """List the tools of a server, cached for every client."""
+        if server_name in self._tools_cache:
+            logger.debug(f"MCPSP: Cache hit for list_tools on server '{server_name}'.")
+            return self._tools_cache[server_name]
+
+        session = await self.get_session(server_name)
+        response = await self._request(server_name, session.list_tools())
+        self._tools_cache[server_name] = response.tools
+        logger.debug(f"MCPSP: Cached list_tools result for server '{server_name}'.")
+        return response.tools
+
+    async def call_tool(
+        self, server_name: str, tool_name: str, tool_args: Dict[str, Any]
+    ) -> CallToolResult:
+        """Call a tool on the shared session of a server."""
+        session = await self.get_session(server_name)
+        return await self._request(server_name, session.call_tool(tool_name, tool_args))
+
+    async def close(self) -> None:
+        """Stop every server process."""
+        logger.info(f"MCPSP: Stopping {len(self._servers)} MCP servers...")
+        tasks = [e.task for e in self._servers.values() if e.task and not e.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._servers.clear()
+        logger.info("MCPSP: Session pool closed.")
+
+    # ==== Server tasks
+
+    def _get_entry(self, server_name: str) -> _PooledServer:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Started under another event loop (e.g. during boot): those tasks
+            # are gone. Cached tool lists stay valid.
+            self._servers.clear()
+            self._loop = loop
+        if server_name not in self._servers:
+            if server_name not in self.server_registery.servers:
+                raise ValueError(
+                    f"MCPSP: Server '{server_name}' not found in available servers."
+                )
+            self._servers[server_name] = _PooledServer(server_name, loop)
+        return self._servers[server_name]
+
+    async def _request(self, server_name: str, request):
+        """Await a request, restarting the server if the transport failed.
+
+        The session is shared, so one caller's error must not restart it for
+        everyone; a server that is broken in some other way is caught by the
+        next health check.
+        """
+        try:
+            return await request
+        except McpError as e:
+            # Other errors are answers from a live server
+            if e.error.code == CONNECTION_CLOSED:
+                self._mark_unhealthy(server_name)
+            raise
+        except _TRANSPORT_ERRORS:
+            self._mark_unhealthy(server_name)
+            raise
+
+    def _mark_unhealthy(self, server_name: str) -> None:
+        entry = self._servers.get(server_name)
+        if entry is not None:
+            entry.unhealthy.set()
+
+    async def _serve(self, entry: _PooledServer) -> None:
+        """Run a server, restarting it whenever it stops responding."""
+        server = self.server_registery.get_server(entry.name)
+        server_params = StdioServerParameters(
+            command=server.command, args=server.args, env=server.env, cwd=server.cwd
+        )
+        timeout = server.timeout if server.timeout else DEFAULT_TIMEOUT
+
+        while True:
+            ready = entry.ready
+            restart = False
+            logger.info(f"MCPSP: Starting and connecting to server '{entry.name}'...")
+            try:
+                async with stdio_client(server_params) as (read, write):
+                    async with ClientSession(
+                        read, write, read_timeout_seconds=timeout
+                    ) as session:
+                        await session.initialize()
+                        entry.session = session
+                        entry.unhealthy.clear()
+                        ready.set_result(session)
+                        logger.info(
+                            f"MCPSP: Successfully connected to server '{entry.name}'."
+                        )
+                        await self._monitor(entry, session)
+                        restart = True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not ready.done():
+                    logger.exception(
+                        f"MCPSP: Failed to connect to server '{entry.name}': {e}"
+                    )
+                    ready.set_exception(
+                        RuntimeError(
+                            f"MCPSP: Failed to connect to server '{entry.name}'."
+                        )
+                    )
+                    # Mark the exception retrieved; the next request retries
+                    ready.exception()
+                    return
+                logger.warning(f"MCPSP: Server '{entry.name}' stopped: {e}")
+                restart = True
+            finally:
+                entry.session = None
+
+            if not restart:
+                # Cancelled (pool closed or event loop ending); the transport's
+                # task groups may have swallowed the CancelledError
+                if not ready.done():
+                    ready.cancel()
+                return
+            entry.restarts += 1
+            entry.ready = asyncio.get_running_loop().create_future()
+            logger.warning(
+                f"MCPSP: Restarting server '{entry.name}' (restart #{entry.restarts})"
+            )
+
+    async def _monitor(self, entry: _PooledServer, session: ClientSession) -> None:
+        """Return once the session should be restarted."""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    entry.unhealthy.wait(), self.health_check_interval
+                )
+                logger.warning(f"MCPSP: Request to server '{entry.name}' failed.")
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.wait_for(session.send_ping(), PING_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"MCPSP: Health check of server '{entry.name}' failed: {e}"
+                )
+                return
@@ -5,6 +5,7 @@ from loguru import logger
 
 from .types import FormattedTool
 from .mcp_client import MCPClient
+from .session_pool import MCPSessionPool
 from .server_registry import ServerRegistry
 from .internal_tools import get_obsidian_tools
 
@@ -16,15 +17,19 @@ class ToolAdapter:
         self,
         server_registery: Optional[ServerRegistry] = None,
         obsidian_vault_manager=None,
+        session_pool: Optional[MCPSessionPool] = None,
     ) -> None:
         """Initialize with an ServerRegistry.
 
         Args:
             server_registery: ServerRegistry instance for external MCP servers.
             obsidian_vault_manager: ObsidianVaultManager instance for internal Obsidian tools.
+            session_pool: Shared MCPSessionPool; tool lists are then fetched once
+                and the servers keep running for the sessions.
         """
         self.server_registery = server_registery or ServerRegistry()
         self.obsidian_vault_manager = obsidian_vault_manager
+        self.session_pool = session_pool
 
     async def get_server_and_tool_info(
         self, enabled_servers: List[str]
@@ -61,7 +66,9 @@ class ToolAdapter:
         logger.debug(f"MC: Fetching tool info for enabled servers: {enabled_servers}")
 
         # Use a single client instance for efficiency
-        async with MCPClient(self.server_registery) as client:
+        async with MCPClient(
+            self.server_registery, session_pool=self.session_pool
+        ) as client:
             for server_name in enabled_servers:
                 if server_name not in self.server_registery.servers:
                     logger.warning(
@@ -0,0 +1,170 @@
+"""TTL cache for results of read-only tool calls."""
+
+import copy
+import json
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+# (is_error, text_content, metadata, content_items), as run_single_tool returns
+ToolResult = Tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]]
+
+# write tool -> {cached tool: argument both share, or None to drop all its entries}
+InvalidationRules = Dict[str, Dict[str, Optional[str]]]
+
+
+# Every live cache, so a write in one session invalidates the others as well
+_live_caches: "weakref.WeakSet[ToolResultCache]" = weakref.WeakSet()
+
+
+def canonical_arguments(tool_input: Any) -> str:
+    """Serialize tool arguments so equal arguments give equal keys."""
+    return json.dumps(
+        tool_input or {},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+class ToolResultCache:
+    """
+    Opt-in cache of tool results, keyed by tool name and arguments.
+
+    Only tools with a TTL are cached, and only successful results. Running a
+    write tool drops the cached results it may have made stale, following
+    the invalidation rules, in this cache and in every other session's.
+    """
+
+    def __init__(
+        self,
+        ttls: Dict[str, float],
+        max_entries: int = 128,
+        invalidations: Optional[InvalidationRules] = None,
+    ) -> None:
+        """
+        Args:
+            ttls: Seconds each cacheable tool's results stay valid
+            max_entries: Most results kept; the least recently used go first
+            invalidations: For each write tool, the cached tools it affects
+                and the argument that must match (None drops every entry)
+        """
+        self.ttls = {name: ttl for name, ttl in ttls.items() if ttl and ttl > 0}
+        self.max_entries = max(1, max_entries)
+        self.invalidations = invalidations or {}
+        # (tool_name, arguments) -> (expires_at, tool_input, result)
+        self._entries: OrderedDict[Tuple[str, str], Tuple[float, Any, ToolResult]] = (
+            OrderedDict()
+        )
+
+        # cached tool -> writes (in any session) that may have made it stale
+        self._writes: Dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        _live_caches.add(self)
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return tool_name in self.ttls
+
+    def get(self, tool_name: str, tool_input: Any) -> Optional[ToolResult]:
+        """Return a fresh cached result, or None."""
+        if not self.is_cacheable(tool_name):
+            return None
+        key = (tool_name, canonical_arguments(tool_input))
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[2])
+
+    def generation(self, tool_name: str) -> int:
+        """Count of writes that may have made `tool_name` results stale; see put."""
+        return self._writes.get(tool_name, 0)
+
+    def put(
+        self,
+        tool_name: str,
+        tool_input: Any,
+        result: ToolResult,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Cache a result if the tool is cacheable and the call succeeded.
+
+        Args:
+            generation: `generation(tool_name)` from before the call ran; if a
+                write (e.g. from another session) has happened since, the
+                result may already be stale and is not cached
+        """
+        if not self.is_cacheable(tool_name) or result[0]:
+            return
+        if generation is not None and generation != self.generation(tool_name):
+            logger.debug(f"Not caching '{tool_name}': a write ran during the call")
+            return
+        key = (tool_name, canonical_arguments(tool_input))
+        expires_at = time.monotonic() + self.ttls[tool_name]
+        self._entries[key] = (expires_at, tool_input, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidates(
+        self, write_tool: str, write_input: Any, tool_name: str, tool_input: Any
+    ) -> bool:
+        """Whether a call to `write_tool` makes a result of `tool_name` stale."""
+        rules = self.invalidations.get(write_tool)
+        if not rules or tool_name not in rules:
+            return False
+        argument = rules[tool_name]
+        if argument is None:
+            return True
+        if not isinstance(write_input, dict) or not isinstance(tool_input, dict):
+            return True
+        return tool_input.get(argument) == write_input.get(argument)
+
+    def invalidate_for(self, tool_name: str, tool_input: Any) -> int:
+        """Drop the results a call to a write tool may make stale.
+
+        The executor calls it before the write runs, and keeps the affected
+        calls of the same batch from overlapping the write. The write changes
+        state every session sees (the vault, shared MCP servers), so every
+        live cache drops its stale entries, each by its own rules.
+
+        Returns:
+            int: Number of entries dropped
+        """
+        return sum(
+            cache._drop_stale(tool_name, tool_input) for cache in list(_live_caches)
+        )
+
+    def _drop_stale(self, tool_name: str, tool_input: Any) -> int:
+        """Drop this cache's entries a call to a write tool may make stale."""
+        rules = self.invalidations.get(tool_name)
+        if not rules:
+            return 0
+        for cached_tool in rules:
+            self._writes[cached_tool] = self._writes.get(cached_tool, 0) + 1
+        stale = [
+            key
+            for key, (_, cached_input, _) in self._entries.items()
+            if self.invalidates(tool_name, tool_input, key[0], cached_input)
+        ]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            logger.debug(f"'{tool_name}' invalidated {len(stale)} cached tool results")
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,4 +1,5 @@
 import json
+import asyncio
 import datetime
 from loguru import logger
 from typing import (
@@ -13,7 +14,12 @@ from typing import (
 from .types import ToolCallObject
 from .mcp_client import MCPClient
 from .tool_manager import ToolManager
-from .internal_tools import execute_obsidian_tool
+from .tool_cache import ToolResultCache
+from .internal_tools import (
+    OBSIDIAN_WRITE_TOOLS,
+    execute_obsidian_tool,
+    obsidian_note_scope,
+)
 
 
 class ToolExecutor:
@@ -22,10 +28,26 @@ class ToolExecutor:
         mcp_client: MCPClient,
         tool_manager: ToolManager,
         obsidian_vault_manager=None,
+        max_concurrency: int = 4,
+        tool_timeout: float | None = 60.0,
+        result_cache: ToolResultCache | None = None,
     ):
+        """
+        Args:
+            mcp_client: Client used to call MCP server tools
+            tool_manager: Registry of the available tools
+            obsidian_vault_manager: Vault for the internal Obsidian tools
+            max_concurrency: Most tool calls of one batch run at the same time
+            tool_timeout: Seconds before a single tool call is abandoned;
+                None or 0 waits indefinitely
+            result_cache: Cache of read-only tool results (default None, no caching)
+        """
         self._mcp_client = mcp_client
         self._tool_manager = tool_manager
         self._obsidian_vault_manager = obsidian_vault_manager
+        self.max_concurrency = max(1, max_concurrency)
+        self.tool_timeout = tool_timeout or None
+        self._result_cache = result_cache
 
     def parse_tool_call(self, call: Union[Dict[str, Any], ToolCallObject]) -> tuple:
         """Parse tool call from different formats.
@@ -160,11 +182,18 @@ class ToolExecutor:
         tool_calls: Union[List[Dict[str, Any]], List[ToolCallObject]],
         caller_mode: Literal["Claude", "OpenAI", "Prompt"],
     ) -> AsyncIterator[Dict[str, Any]]:
-        """Execute tools and yield status updates."""
-        tool_results_for_llm = []
+        """Execute tools concurrently and yield status updates.
+
+        Up to `max_concurrency` calls run at once. Calls that share a resource
+        (see `_must_follow`) still run in the order of `tool_calls`. Status
+        updates are yielded as each call starts and completes, while the
+        `final_tool_results` keep the order of `tool_calls`.
+        """
+        results: List[Dict[str, Any] | None] = [None] * len(tool_calls)
+        runnable = []  # (index, tool_name, tool_id, tool_input)
 
         logger.info(f"Executing {len(tool_calls)} tool(s) for {caller_mode} caller.")
-        for call in tool_calls:
+        for index, call in enumerate(tool_calls):
             (
                 tool_name,
                 tool_id,
@@ -174,16 +203,17 @@ class ToolExecutor:
                 parse_error,
             ) = self.parse_tool_call(call)
 
-            logger.info(f"Executing tool: {call}")
-
             if parse_error:
                 logger.warning(
                     f"Skipping tool call due to parsing error: {result_content}"
                 )
-                status_update = {
+                tool_id = (
+                    tool_id
+                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}"
+                )
+                yield {
                     "type": "tool_call_status",
-                    "tool_id": tool_id
-                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
+                    "tool_id": tool_id,
                     "tool_name": tool_name or "Unknown Tool",
                     "status": "error",
                     "content": result_content,
@@ -192,116 +222,280 @@ class ToolExecutor:
                     ).isoformat()
                     + "Z",
                 }
-                yield status_update
-                # Even on parse error, we might need to format a result for the LLM
-                # Use dummy values or the error message
-                formatted_result = self.format_tool_result(
-                    caller_mode,
-                    tool_id
-                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
-                    result_content,
-                    True,  # is_error
+                # Even on parse error, the LLM gets a result for the call
+                results[index] = self.format_tool_result(
+                    caller_mode, tool_id, result_content, True
                 )
-                if formatted_result:
-                    tool_results_for_llm.append(formatted_result)
-                continue  # Skip execution logic for this call
+                continue
 
-            # Yield 'running' status before execution
-            yield {
-                "type": "tool_call_status",
-                "tool_id": tool_id,
-                "tool_name": tool_name,
-                "status": "running",
-                "content": f"Input: {json.dumps(tool_input)}",
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
-                + "Z",
-            }
-
-            # Execute the tool
-            (
-                is_error,
-                text_content,
-                metadata,
-                content_items,
-            ) = await self.run_single_tool(tool_name, tool_id, tool_input)
-
-            # Determine content for status update and LLM result format
-            status_content = text_content  # Default to text content
-            llm_formatted_content = text_content  # Default to text content for LLM
-
-            if content_items:
-                image_items = [
-                    item for item in content_items if item.get("type") == "image"
+            logger.info(f"Executing tool: {call}")
+            runnable.append((index, tool_name, tool_id, tool_input))
+
+        if runnable:
+            # Bring the servers up first, so a server that fails to start
+            # fails its calls at once instead of each call waiting on it
+            await self._connect_servers([name for _, name, _, _ in runnable])
+
+            events: asyncio.Queue = asyncio.Queue()
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            tasks = []
+            for position, call in enumerate(runnable):
+                # Wait for the earlier calls this one must not overtake
+                after = [
+                    tasks[earlier]
+                    for earlier in range(position)
+                    if self._must_follow(runnable[earlier], call)
                 ]
-                if image_items:
-                    num_images = len(image_items)
-                    status_content = (
-                        f"{text_content}\n[Tool returned {num_images} image(s)]".strip()
+                tasks.append(
+                    asyncio.create_task(
+                        self._run_queued_tool(
+                            semaphore, events, caller_mode, *call, after=after
+                        )
                     )
+                )
+            try:
+                pending = len(tasks)
+                while pending:
+                    index, status_update, formatted_result = await events.get()
+                    if status_update["status"] != "running":
+                        pending -= 1
+                        results[index] = formatted_result
+                    yield status_update
+            finally:
+                # The consumer went away (e.g. interrupted): stop running calls
+                for task in tasks:
+                    task.cancel()
+
+        tool_results_for_llm = [result for result in results if result]
+        logger.info(
+            f"Finished executing tools with {len(tool_results_for_llm)} results."
+        )
+        yield {"type": "final_tool_results", "results": tool_results_for_llm}
 
-                    if caller_mode == "Claude":
-                        # Format for Claude: list of blocks
-                        claude_blocks = []
-                        if text_content:
-                            claude_blocks.append({"type": "text", "text": text_content})
-                        for item in content_items:
-                            if (
-                                item.get("type") == "image"
-                                and "data" in item
-                                and "mimeType" in item
-                            ):
-                                claude_blocks.append(
-                                    {
-                                        "type": "image",
-                                        "source": {
-                                            "type": "base64",
-                                            "media_type": item["mimeType"],
-                                            "data": item["data"],
-                                        },
-                                    }
-                                )
-                            # Add other non-text types here
-                        llm_formatted_content = (
-                            claude_blocks if claude_blocks else ""
-                        )  # Use blocks or empty string
-                    elif caller_mode in ["OpenAI", "Prompt"]:
-                        llm_formatted_content = status_content
-
-            # Prepare and yield tool call status update
-            status_update = {
-                "type": "tool_call_status",
-                "tool_id": tool_id,
-                "tool_name": tool_name,
-                "status": "error" if is_error else "completed",
-                "content": status_content
-                if not is_error
-                else f"Error: {text_content}",  # Use descriptive content or error message
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
-                + "Z",
-            }
-
-            # For stagehand_navigate tool, include browser view links if available
-            if tool_name == "stagehand_navigate" and not is_error:
-                live_view_data = metadata.get("liveViewData", {})
-                if live_view_data:
-                    logger.info(
-                        f"Found live view data for stagehand_navigate: {live_view_data}"
-                    )
-                    status_update["browser_view"] = live_view_data
+    async def _connect_servers(self, tool_names: List[str]) -> None:
+        """Start the MCP servers the given tools need."""
+        servers = []
+        for tool_name in tool_names:
+            tool_info = self._tool_manager.get_tool(tool_name)
+            if (
+                tool_info
+                and tool_info.related_server
+                and tool_info.related_server != "__internal__obsidian"
+                and tool_info.related_server not in servers
+            ):
+                servers.append(tool_info.related_server)
+        results = await asyncio.gather(
+            *(self._mcp_client.connect(server_name) for server_name in servers),
+            return_exceptions=True,
+        )
+        for server_name, result in zip(servers, results):
+            if isinstance(result, Exception):
+                # run_single_tool reports the failure for each affected call
+                logger.warning(f"Could not connect to server '{server_name}': {result}")
+
+    def _must_follow(self, earlier: tuple, later: tuple) -> bool:
+        """Whether call `later` has to wait for call `earlier` of the same batch.
+
+        Both are (index, tool_name, tool_id, tool_input). Obsidian calls on
+        the same note, or on the whole vault, keep their order when either of
+        them writes. So do a write and a call whose cached results it makes
+        stale, so a read never sees the cache from before an earlier write,
+        nor caches its result while a later write runs. Every other pair runs
+        independently.
+        """
+        _, earlier_name, _, earlier_input = earlier
+        _, later_name, _, later_input = later
+        cache = self._result_cache
+        if cache is not None and (
+            cache.invalidates(earlier_name, earlier_input, later_name, later_input)
+            or cache.invalidates(later_name, later_input, earlier_name, earlier_input)
+        ):
+            return True
+        if not (
+            self._is_obsidian_tool(earlier_name) and self._is_obsidian_tool(later_name)
+        ):
+            return False
+        if (
+            earlier_name not in OBSIDIAN_WRITE_TOOLS
+            and later_name not in OBSIDIAN_WRITE_TOOLS
+        ):
+            return False
+        earlier_note = obsidian_note_scope(earlier_name, earlier_input)
+        later_note = obsidian_note_scope(later_name, later_input)
+        return earlier_note is None or later_note is None or earlier_note == later_note
+
+    def _is_obsidian_tool(self, tool_name: str) -> bool:
+        tool_info = self._tool_manager.get_tool(tool_name)
+        return bool(tool_info and tool_info.related_server == "__internal__obsidian")
 
-            yield status_update
+    async def _run_queued_tool(
+        self,
+        semaphore: asyncio.Semaphore,
+        events: asyncio.Queue,
+        caller_mode: Literal["Claude", "OpenAI", "Prompt"],
+        index: int,
+        tool_name: str,
+        tool_id: str,
+        tool_input: Any,
+        after: List[asyncio.Task] | None = None,
+    ) -> None:
+        """Run one call under the concurrency limit, reporting to `events`.
 
-            # Format result for LLM and add to list
-            formatted_result = self.format_tool_result(
-                caller_mode, tool_id, llm_formatted_content, is_error
+        The call starts only once the `after` calls have finished.
+        """
+        if after:
+            # Waits outside the semaphore, so earlier calls can take a slot
+            await asyncio.wait(after)
+
+        cache = self._result_cache
+        cached = cache.get(tool_name, tool_input) if cache is not None else None
+        if cached is not None:
+            logger.info(f"Tool '{tool_name}' (ID: {tool_id}) served from cache")
+            status_update, formatted_result = self._build_tool_result(
+                caller_mode, tool_name, tool_id, cached
             )
-            if formatted_result:
-                tool_results_for_llm.append(formatted_result)
+            status_update["cached"] = True
+            events.put_nowait((index, status_update, formatted_result))
+            return
+
+        if cache is not None:
+            # Before the write runs, so nothing cached during it outlives it.
+            # Dropped even if the write then fails, as it may have half-applied
+            cache.invalidate_for(tool_name, tool_input)
+            generation = cache.generation(tool_name)
+
+        async with semaphore:
+            events.put_nowait(
+                (
+                    index,
+                    {
+                        "type": "tool_call_status",
+                        "tool_id": tool_id,
+                        "tool_name": tool_name,
+                        "status": "running",
+                        "content": f"Input: {json.dumps(tool_input)}",
+                        "timestamp": datetime.datetime.now(
+                            datetime.timezone.utc
+                        ).isoformat()
+                        + "Z",
+                    },
+                    None,
+                )
+            )
+            try:
+                result = await asyncio.wait_for(
+                    self.run_single_tool(tool_name, tool_id, tool_input),
+                    timeout=self.tool_timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"Tool '{tool_name}' (ID: {tool_id}) timed out after {self.tool_timeout}s"
+                )
+                result = self._error_result(
+                    f"Tool '{tool_name}' timed out after {self.tool_timeout} seconds."
+                )
+            except Exception as e:
+                # Every call must report back, or execute_tools would wait forever
+                logger.exception(f"Unexpected error executing tool '{tool_name}': {e}")
+                result = self._error_result(
+                    f"Unexpected error executing tool '{tool_name}': {e}"
+                )
+        if cache is not None:
+            cache.put(tool_name, tool_input, result, generation)
+        status_update, formatted_result = self._build_tool_result(
+            caller_mode, tool_name, tool_id, result
+        )
+        events.put_nowait((index, status_update, formatted_result))
 
-        logger.info(
-            f"Finished executing tools with {len(tool_results_for_llm)} results."
+    @staticmethod
+    def _error_result(
+        text_content: str,
+    ) -> tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]]:
+        """A failed call's result, in the form `run_single_tool` returns."""
+        return True, text_content, {}, [{"type": "error", "text": text_content}]
+
+    def _build_tool_result(
+        self,
+        caller_mode: Literal["Claude", "OpenAI", "Prompt"],
+        tool_name: str,
+        tool_id: str,
+        result: tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]],
+    ) -> tuple[Dict[str, Any], Dict[str, Any] | None]:
+        """Build the status update and the LLM result for a finished call.
+
+        Returns:
+            tuple: (status_update, formatted_result)
+        """
+        is_error, text_content, metadata, content_items = result
+
+        # Determine content for status update and LLM result format
+        status_content = text_content  # Default to text content
+        llm_formatted_content = text_content  # Default to text content for LLM
+
+        if content_items:
+            image_items = [
+                item for item in content_items if item.get("type") == "image"
+            ]
+            if image_items:
+                num_images = len(image_items)
+                status_content = (
+                    f"{text_content}\n[Tool returned {num_images} image(s)]".strip()
+                )
+
+                if caller_mode == "Claude":
+                    # Format for Claude: list of blocks
+                    claude_blocks = []
+                    if text_content:
+                        claude_blocks.append({"type": "text", "text": text_content})
+                    for item in content_items:
+                        if (
+                            item.get("type") == "image"
+                            and "data" in item
+                            and "mimeType" in item
+                        ):
+                            claude_blocks.append(
+                                {
+                                    "type": "image",
+                                    "source": {
+                                        "type": "base64",
+                                        "media_type": item["mimeType"],
+                                        "data": item["data"],
+                                    },
+                                }
+                            )
+                        # Add other non-text types here
+                    llm_formatted_content = (
+                        claude_blocks if claude_blocks else ""
+                    )  # Use blocks or empty string
+                elif caller_mode in ["OpenAI", "Prompt"]:
+                    llm_formatted_content = status_content
+
+        # Prepare tool call status update
+        status_update = {
+            "type": "tool_call_status",
+            "tool_id": tool_id,
+            "tool_name": tool_name,
+            "status": "error" if is_error else "completed",
+            "content": status_content
+            if not is_error
+            else f"Error: {text_content}",  # Use descriptive content or error message
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat() + "Z",
+        }
+
+        # For stagehand_navigate tool, include browser view links if available
+        if tool_name == "stagehand_navigate" and not is_error:
+            live_view_data = metadata.get("liveViewData", {})
+            if live_view_data:
+                logger.info(
+                    f"Found live view data for stagehand_navigate: {live_view_data}"
+                )
+                status_update["browser_view"] = live_view_data
+
+        # Format result for LLM
+        formatted_result = self.format_tool_result(
+            caller_mode, tool_id, llm_formatted_content, is_error
         )
-        yield {"type": "final_tool_results", "results": tool_results_for_llm}
+        return status_update, formatted_result
 
     async def run_single_tool(
         self, tool_name: str, tool_id: str, tool_input: Any
@@ -233,6 +233,9 @@ class ProxyHandler:
                         except json.JSONDecodeError as e:
                             logger.error(f"Failed to parse message data: {e}")
                             continue
+                    elif msg.type == aiohttp.WSMsgType.BINARY:
+                        # Raw audio frame of the binary protocol; follows its JSON header
+                        await self.broadcast_bytes_to_clients(msg.data)
                     elif msg.type == aiohttp.WSMsgType.ERROR:
                         logger.error(f"WebSocket error: {self.server_ws.exception()}")
                         break
@@ -293,6 +296,24 @@ class ProxyHandler:
         for client_id in disconnected_clients:
             await self.handle_client_disconnect(client_id)
 
+    async def broadcast_bytes_to_clients(self, data: bytes):
+        """
+        Broadcast a binary frame (raw audio) to all connected clients.
+
+        Args:
+            data: The binary frame to broadcast
+        """
+        disconnected_clients = []
+        for client_id, websocket in self.clients.items():
+            try:
+                await websocket.send_bytes(data)
+            except Exception as e:
+                logger.error(f"Error sending binary frame to client {client_id}: {e}")
+                disconnected_clients.append(client_id)
+
+        for client_id in disconnected_clients:
+            await self.handle_client_disconnect(client_id)
+
     async def forward_with_broadcast(
         self, message: dict, sender_id: Optional[str] = None
     ):
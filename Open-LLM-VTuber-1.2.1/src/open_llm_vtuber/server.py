@@ -79,6 +79,16 @@ class WebSocketServer:
         )  # Use provided context or initialize a new empty one waiting to be loaded
         # It will be populated during the initialize method call
 
+        # Start the shared MCP servers in the serving event loop
+        self.app.add_event_handler(
+            "startup", self.default_context_cache.start_mcp_session_pool
+        )
+        # Write out queued chat history before the process exits
+        self.app.add_event_handler("shutdown", self.default_context_cache.close)
+        self.app.add_event_handler(
+            "shutdown", self.default_context_cache.close_mcp_session_pool
+        )
+
         # Add global CORS middleware
         self.app.add_middleware(
             CORSMiddleware,
@@ -8,6 +8,8 @@ from prompts import prompt_loader
 from .live2d_model import Live2dModel
 from .asr.asr_interface import ASRInterface
 from .tts.tts_interface import TTSInterface
+from .tts.tts_cache import TTSResultCache
+from .history_writer import HistoryWriter
 from .vad.vad_interface import VADInterface
 from .agent.agents.agent_interface import AgentInterface
 from .translate.translate_interface import TranslateInterface
@@ -15,8 +17,11 @@ from .translate.translate_interface import TranslateInterface
 from .mcpp.server_registry import ServerRegistry
 from .mcpp.tool_manager import ToolManager
 from .mcpp.mcp_client import MCPClient
+from .mcpp.session_pool import MCPSessionPool
 from .mcpp.tool_executor import ToolExecutor
 from .mcpp.tool_adapter import ToolAdapter
+from .mcpp.tool_cache import ToolResultCache
+from .mcpp.internal_tools import OBSIDIAN_CACHE_INVALIDATIONS
 
 # 수정: Obsidian Vault Manager import 추가
 from .obsidian import ObsidianVaultManager
@@ -30,6 +35,7 @@ from .translate.translate_factory import TranslateFactory
 from .config_manager import (
     Config,
     AgentConfig,
+    BasicMemoryAgentConfig,
     CharacterConfig,
     SystemConfig,
     ASRConfig,
@@ -53,6 +59,11 @@ class ServiceContext:
         self.live2d_model: Live2dModel = None
         self.asr_engine: ASRInterface = None
         self.tts_engine: TTSInterface = None
+        # Shared by every session, like the engines themselves
+        self.tts_cache: TTSResultCache | None = None
+        self.history_writer: HistoryWriter | None = None
+        # Only the context that created the shared writer stops it
+        self._owns_history_writer = False
         self.agent_engine: AgentInterface = None
         # translate_engine can be none if translation is disabled
         self.vad_engine: VADInterface | None = None
@@ -60,6 +71,8 @@ class ServiceContext:
 
         self.mcp_server_registery: ServerRegistry | None = None
         self.tool_adapter: ToolAdapter | None = None
+        # Shared by every session: one process per MCP server
+        self.mcp_session_pool: MCPSessionPool | None = None
         self.tool_manager: ToolManager | None = None
         self.mcp_client: MCPClient | None = None
         self.tool_executor: ToolExecutor | None = None
@@ -78,6 +91,10 @@ class ServiceContext:
         self.send_text: Callable = None
         self.client_uid: str = None
 
+        # Negotiated per connection via "set-audio-protocol"; base64 is the fallback
+        self.audio_protocol: str = "base64"
+        self.send_bytes: Callable | None = None
+
     def __str__(self):
         return (
             f"ServiceContext:\n"
@@ -99,7 +116,12 @@ class ServiceContext:
 
     # ==== Initializers
 
-    async def _init_mcp_components(self, use_mcpp, enabled_servers):
+    async def _init_mcp_components(
+        self,
+        use_mcpp,
+        enabled_servers,
+        agent_settings: BasicMemoryAgentConfig | None = None,
+    ):
         """Initializes MCP components based on configuration, dynamically fetching tool info."""
         logger.debug(
             f"Initializing MCP components: use_mcpp={use_mcpp}, enabled_servers={enabled_servers}"
@@ -166,7 +188,10 @@ class ServiceContext:
             # 4. Initialize MCPClient
             if self.mcp_server_registery:
                 self.mcp_client = MCPClient(
-                    self.mcp_server_registery, self.send_text, self.client_uid
+                    self.mcp_server_registery,
+                    self.send_text,
+                    self.client_uid,
+                    session_pool=self.mcp_session_pool,
                 )
                 logger.info("MCPClient initialized for this session.")
             else:
@@ -178,10 +203,26 @@ class ServiceContext:
             # 5. Initialize ToolExecutor
             if self.mcp_client and self.tool_manager:
                 # 수정: Obsidian Vault Manager를 ToolExecutor에 전달
+                executor_options = {}
+                if agent_settings is not None:
+                    executor_options = {
+                        "max_concurrency": agent_settings.tool_concurrency,
+                        "tool_timeout": agent_settings.tool_timeout,
+                    }
+                    if agent_settings.tool_cache_ttl:
+                        executor_options["result_cache"] = ToolResultCache(
+                            ttls=agent_settings.tool_cache_ttl,
+                            max_entries=agent_settings.tool_cache_size,
+                            invalidations={
+                                **OBSIDIAN_CACHE_INVALIDATIONS,
+                                **agent_settings.tool_cache_invalidations,
+                            },
+                        )
                 self.tool_executor = ToolExecutor(
                     self.mcp_client,
                     self.tool_manager,
                     obsidian_vault_manager=self.obsidian_vault_manager,
+                    **executor_options,
                 )
                 logger.info("ToolExecutor initialized for this session.")
             else:
@@ -210,8 +251,28 @@ class ServiceContext:
             self.mcp_client = None
         if self.agent_engine and hasattr(self.agent_engine, "close"):
             await self.agent_engine.close()  # Ensure agent resources are also closed
+        if self.history_writer:
+            if self._owns_history_writer:
+                # Server shutdown: stop the worker task and its thread
+                await self.history_writer.close()
+            else:
+                # The writer is shared; only make sure this session's messages landed
+                await self.history_writer.flush()
         logger.info("ServiceContext closed.")
 
+    async def start_mcp_session_pool(self) -> None:
+        """Start the enabled MCP servers so the first tool call does not wait."""
+        if not self.mcp_session_pool or not self.character_config:
+            return
+        settings = self.character_config.agent_config.agent_settings.basic_memory_agent
+        if settings.use_mcpp and settings.mcp_enabled_servers:
+            await self.mcp_session_pool.start(settings.mcp_enabled_servers)
+
+    async def close_mcp_session_pool(self) -> None:
+        """Stop the shared MCP server processes."""
+        if self.mcp_session_pool:
+            await self.mcp_session_pool.close()
+
     async def load_cache(
         self,
         config: Config,
@@ -225,8 +286,11 @@ class ServiceContext:
         translate_engine: TranslateInterface | None,
         mcp_server_registery: ServerRegistry | None = None,
         tool_adapter: ToolAdapter | None = None,
+        mcp_session_pool: MCPSessionPool | None = None,
         send_text: Callable = None,
         client_uid: str = None,
+        tts_cache: TTSResultCache | None = None,
+        history_writer: HistoryWriter | None = None,
     ) -> None:
         """
         Load the ServiceContext with the reference of the provided instances.
@@ -243,12 +307,15 @@ class ServiceContext:
         self.live2d_model = live2d_model
         self.asr_engine = asr_engine
         self.tts_engine = tts_engine
+        self.tts_cache = tts_cache
+        self.history_writer = history_writer
         self.vad_engine = vad_engine
         self.agent_engine = agent_engine
         self.translate_engine = translate_engine
         # Load potentially shared components by reference
         self.mcp_server_registery = mcp_server_registery
         self.tool_adapter = tool_adapter
+        self.mcp_session_pool = mcp_session_pool
         self.send_text = send_text
         self.client_uid = client_uid
 
@@ -263,6 +330,7 @@ class ServiceContext:
         await self._init_mcp_components(
             self.character_config.agent_config.agent_settings.basic_memory_agent.use_mcpp,
             self.character_config.agent_config.agent_settings.basic_memory_agent.mcp_enabled_servers,
+            self.character_config.agent_config.agent_settings.basic_memory_agent,
         )
 
         logger.debug(f"Loaded service context with cache: {character_config}")
@@ -298,6 +366,8 @@ class ServiceContext:
         # init vad from character config
         self.init_vad(config.character_config.vad_config)
 
+        self.init_history_writer(config.system_config)
+
         # 수정: Obsidian Vault Manager 초기화
         self.init_obsidian_vault(config.system_config)
 
@@ -311,17 +381,21 @@ class ServiceContext:
                     "Initializing shared ServerRegistry within load_from_config."
                 )
                 self.mcp_server_registery = ServerRegistry()
+            if not self.mcp_session_pool:
+                self.mcp_session_pool = MCPSessionPool(self.mcp_server_registery)
             logger.info("Initializing shared ToolAdapter within load_from_config.")
             # 수정: Obsidian Vault Manager를 ToolAdapter에 전달
             self.tool_adapter = ToolAdapter(
                 server_registery=self.mcp_server_registery,
                 obsidian_vault_manager=self.obsidian_vault_manager,
+                session_pool=self.mcp_session_pool,
             )
 
         # Initialize MCP Components before initializing Agent
         await self._init_mcp_components(
             config.character_config.agent_config.agent_settings.basic_memory_agent.use_mcpp,
             config.character_config.agent_config.agent_settings.basic_memory_agent.mcp_enabled_servers,
+            config.character_config.agent_config.agent_settings.basic_memory_agent,
         )
 
         # init agent from character config
@@ -363,14 +437,45 @@ class ServiceContext:
     def init_tts(self, tts_config: TTSConfig) -> None:
         if not self.tts_engine or (self.character_config.tts_config != tts_config):
             logger.info(f"Initializing TTS: {tts_config.tts_model}")
+            engine_config = getattr(tts_config, tts_config.tts_model.lower()).model_dump()
             self.tts_engine = TTSFactory.get_tts_engine(
                 tts_config.tts_model,
-                **getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
+                **engine_config,
             )
+            self.tts_engine.voice_params = {
+                "tts_model": tts_config.tts_model,
+                **engine_config,
+            }
             # saving config should be done after successful initialization
             self.character_config.tts_config = tts_config
         else:
             logger.info("TTS already initialized with the same config.")
+        self.init_tts_cache(tts_config)
+
+    def init_tts_cache(self, tts_config: TTSConfig) -> None:
+        cache_config = tts_config.tts_cache
+        if not cache_config.enabled:
+            self.tts_cache = None
+            return
+        if self.tts_cache is None:
+            logger.info("Initializing TTS result cache")
+            self.tts_cache = TTSResultCache(
+                max_memory_bytes=cache_config.max_memory_mb * 1024 * 1024,
+                disk_dir=cache_config.disk_dir,
+                max_disk_bytes=cache_config.max_disk_mb * 1024 * 1024,
+            )
+
+    def init_history_writer(self, system_config: SystemConfig) -> None:
+        if self.history_writer is None:
+            history_config = system_config.chat_history
+            logger.info(
+                f"Initializing chat history writer ({history_config.durability})"
+            )
+            self.history_writer = HistoryWriter(
+                durability=history_config.durability,
+                flush_interval_ms=history_config.flush_interval_ms,
+            )
+            self._owns_history_writer = True
 
     def init_vad(self, vad_config: VADConfig) -> None:
         if vad_config.vad_model is None:
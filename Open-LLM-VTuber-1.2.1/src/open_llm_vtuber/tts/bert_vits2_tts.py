@@ -4,8 +4,12 @@ Bert-VITS2 TTS Engine for Open-LLM-VTuber.
 This module provides integration with Hololive-Style-Bert-VITS2 via Gradio Client API.
 """
 
+import asyncio
+import io
+import json
 import os
 import re
+import uuid
 from pathlib import Path
 from typing import Optional
 
@@ -13,60 +17,17 @@ import httpx
 from gradio_client import Client
 from loguru import logger
 
+from ..utils.language_id import identify_language, tts_language
+from ..utils.stream_audio import read_pcm16_wav
 from .tts_interface import TTSInterface
 
 
-def detect_language(text: str) -> str:
-    """
-    Detect language from text (EN or JP only).
-
-    Detection logic:
-    - If Japanese characters (hiragana, katakana, or kanji with Japanese context) found -> JP
-    - Otherwise -> EN
-
-    Args:
-        text: Input text to analyze
-
-    Returns:
-        'JP' or 'EN'
-    """
-    # Japanese character ranges
-    # Hiragana: U+3040 - U+309F
-    # Katakana: U+30A0 - U+30FF
-    # CJK (Kanji): U+4E00 - U+9FFF
-
-    hiragana_count = 0
-    katakana_count = 0
-    kanji_count = 0
-    latin_count = 0
-
-    for char in text:
-        code = ord(char)
-        if 0x3040 <= code <= 0x309F:  # Hiragana
-            hiragana_count += 1
-        elif 0x30A0 <= code <= 0x30FF:  # Katakana
-            katakana_count += 1
-        elif 0x4E00 <= code <= 0x9FFF:  # CJK (Kanji)
-            kanji_count += 1
-        elif code < 128 and char.isalpha():  # ASCII letters
-            latin_count += 1
-
-    # If any hiragana or katakana found, it's Japanese
-    if hiragana_count > 0 or katakana_count > 0:
-        return "JP"
-
-    # If kanji found, check context (could be Chinese, but we don't support ZH)
-    # Treat kanji-only text as Japanese
-    if kanji_count > 0:
-        return "JP"
-
-    # Default to English
-    return "EN"
-
-
 class TTSEngine(TTSInterface):
     """Bert-VITS2 TTS Engine using Gradio Client."""
 
+    # The server already returns decoded audio, so skip the cache file round trip
+    supports_pcm = True
+
     def __init__(
         self,
         client_url: str = "http://127.0.0.1:7860",
@@ -86,6 +47,7 @@ class TTSEngine(TTSInterface):
         style_text: str = "",
         style_text_weight: float = 0.7,
         reference_audio_path: Optional[str] = None,
+        max_concurrency: int = 8,
     ):
         """
         Initialize Bert-VITS2 TTS Engine with per-language settings.
@@ -106,6 +68,9 @@ class TTSEngine(TTSInterface):
             style_text: Text for style guidance
             style_text_weight: Style text weight (0-1)
             reference_audio_path: Path to reference audio for style
+            max_concurrency: Most sentences sent to the server at once. The
+                server synthesizes the requests queued together in one batch,
+                so match its --max-batch-size (default 8)
         """
         self.client_url = client_url
         self.auto_detect_language = auto_detect_language
@@ -133,10 +98,19 @@ class TTSEngine(TTSInterface):
         self.style_text = style_text
         self.style_text_weight = style_text_weight
         self.reference_audio_path = reference_audio_path
+        self.max_concurrency = max(1, max_concurrency)
 
         self.client: Optional[Client] = None
         self._output_dir: Optional[str] = None
         self._http_client: Optional[httpx.Client] = None
+        # Pooled keep-alive client used by async_generate_audio
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        # Requests using the pool, and whether it should be rebuilt once idle
+        self._async_requests = 0
+        self._async_client_broken = False
+        # Fire-and-forget abort requests for cancelled jobs
+        self._abort_tasks: set[asyncio.Task] = set()
+        self.aborted_jobs = 0
         self._api_info: Optional[dict] = None
 
         # Log initialization
@@ -188,6 +162,28 @@ class TTSEngine(TTSInterface):
                 self._api_info = {}
         return self._api_info
     
+    def _resolve_audio_url(self, audio_data) -> str:
+        """Build the download URL for an audio output (FileData dict or path string)."""
+        # audio_data는 파일 경로 문자열 또는 딕셔너리일 수 있음
+        if isinstance(audio_data, dict):
+            # Gradio의 FileData 형식: {"path": "...", "url": "...", ...}
+            # url 필드를 우선 사용 (Gradio가 제공하는 완전한 URL)
+            if audio_data.get("url"):
+                return audio_data["url"]
+            audio_path = audio_data.get("path")
+            if not audio_path:
+                raise Exception(f"Invalid audio data format: {audio_data}")
+        elif isinstance(audio_data, str):
+            audio_path = audio_data
+        else:
+            raise Exception(f"Unexpected audio data type: {type(audio_data)}")
+
+        if audio_path.startswith("http://") or audio_path.startswith("https://"):
+            return audio_path
+        if audio_path.startswith("/"):
+            return f"{self.client_url}{audio_path}"
+        return f"{self.client_url}/file={audio_path}"
+
     def _predict_via_http(self, fn_index: int, data: list) -> tuple:
         """수정: requests를 사용하여 직접 HTTP API 호출 (WebSocket 완전 우회, gradio_client와 동일한 형식)"""
         import time
@@ -354,34 +350,8 @@ class TTSEngine(TTSInterface):
                 logger.error(f"❌ TTS generation failed: {message}")
                 raise Exception(f"TTS generation failed: {message}")
             
-            # audio_data는 파일 경로 문자열 또는 딕셔너리일 수 있음
-            if isinstance(audio_data, dict):
-                # Gradio의 FileData 형식: {"path": "...", "url": "...", ...}
-                # 수정: url 필드를 우선 사용 (Gradio가 제공하는 완전한 URL)
-                audio_url = audio_data.get("url")
-                if not audio_url:
-                    # url이 없으면 path를 사용하여 URL 구성
-                    audio_path = audio_data.get("path")
-                    if not audio_path:
-                        raise Exception(f"Invalid audio data format: {audio_data}")
-                    if audio_path.startswith("http://") or audio_path.startswith("https://"):
-                        audio_url = audio_path
-                    elif audio_path.startswith("/"):
-                        audio_url = f"{self.client_url}{audio_path}"
-                    else:
-                        audio_url = f"{self.client_url}/file={audio_path}"
-            elif isinstance(audio_data, str):
-                # 문자열인 경우 URL로 변환
-                audio_path = audio_data
-                if audio_path.startswith("http://") or audio_path.startswith("https://"):
-                    audio_url = audio_path
-                elif audio_path.startswith("/"):
-                    audio_url = f"{self.client_url}{audio_path}"
-                else:
-                    audio_url = f"{self.client_url}/file={audio_path}"
-            else:
-                raise Exception(f"Unexpected audio data type: {type(audio_data)}")
-            
+            audio_url = self._resolve_audio_url(audio_data)
+
             logger.debug(f"📥 Downloading audio from {audio_url}")
             # 수정: requests 사용 (httpx 대신)
             import requests
@@ -390,7 +360,6 @@ class TTSEngine(TTSInterface):
             audio_response.raise_for_status()
             
             # WAV 파일을 읽어서 numpy 배열로 변환
-            import io
             import scipy.io.wavfile as wavfile
             audio_bytes = io.BytesIO(audio_response.content)
             sample_rate, audio_array = wavfile.read(audio_bytes)
@@ -404,6 +373,190 @@ class TTSEngine(TTSInterface):
             logger.error(f"❌ HTTP predict failed: {error_msg}")
             raise
 
+    def _get_async_http_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled keep-alive client for the async path."""
+        if self._async_http_client is None or self._async_http_client.is_closed:
+            self._async_http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(300.0, connect=10.0),
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+            )
+        return self._async_http_client
+
+    async def _async_predict(self, fn_index: int, data: list) -> tuple:
+        """
+        Run a prediction through Gradio's queue and wait for the result event.
+
+        The job is submitted with POST /queue/join and the result is read from
+        the /queue/data SSE stream as soon as `process_completed` arrives, so
+        there is no polling delay. Servers without the queue API fall back to
+        a single POST /api/predict/ over the same pooled connection.
+
+        Returns:
+            tuple: (message, audio_data, kata_tone) as returned by the server
+        """
+        client = self._get_async_http_client()
+        base_url = self.client_url.rstrip("/")
+        # A dedicated session per job keeps the SSE stream free of other jobs' events
+        session_hash = uuid.uuid4().hex
+        # ...and doubles as the job id the server checks for cancellation
+        data = [*data[:-1], session_hash]
+
+        join_response = await client.post(
+            f"{base_url}/queue/join",
+            json={
+                "data": data,
+                "fn_index": fn_index,
+                "session_hash": session_hash,
+                "event_data": None,
+            },
+        )
+        if join_response.status_code == 404:
+            logger.debug("Queue API not available, falling back to /api/predict/")
+            response = await client.post(
+                f"{base_url}/api/predict/",
+                json={"data": data, "fn_index": fn_index, "session_hash": session_hash},
+            )
+            response.raise_for_status()
+            result = response.json().get("data")
+        else:
+            join_response.raise_for_status()
+            event_id = join_response.json().get("event_id")
+            try:
+                result = await self._await_queue_result(
+                    client, base_url, session_hash, event_id
+                )
+            except asyncio.CancelledError:
+                # Leaving the SSE stream already drops a still-queued job;
+                # also tell the server, in case it is batched or running
+                self._schedule_abort(base_url, fn_index, session_hash, event_id)
+                raise
+
+        if not isinstance(result, (list, tuple)) or len(result) < 2:
+            raise Exception(f"Unexpected result format: {result}")
+        message = result[0] if result[0] is not None else ""
+        kata_tone = result[2] if len(result) > 2 else ""
+        return message, result[1], kata_tone
+
+    async def _await_queue_result(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str,
+        session_hash: str,
+        event_id: Optional[str],
+    ) -> list:
+        """Consume the /queue/data SSE stream until the job's completion event."""
+        async with client.stream(
+            "GET",
+            f"{base_url}/queue/data",
+            params={"session_hash": session_hash},
+            headers={"Accept": "text/event-stream"},
+        ) as stream:
+            stream.raise_for_status()
+            async for line in stream.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                message = json.loads(line[len("data:") :].strip())
+                if event_id and message.get("event_id") not in (None, event_id):
+                    continue
+
+                msg_type = message.get("msg")
+                if msg_type == "process_completed":
+                    output = message.get("output") or {}
+                    if not message.get("success", True) or "error" in output:
+                        raise Exception(
+                            f"TTS job failed: {output.get('error', 'Unknown error')}"
+                        )
+                    return output.get("data", [])
+                if msg_type == "unexpected_error":
+                    raise Exception(
+                        f"TTS job failed: {message.get('message', 'Unknown error')}"
+                    )
+                if msg_type == "close_stream":
+                    break
+        raise Exception("TTS queue stream closed before the job completed")
+
+    def _schedule_abort(
+        self,
+        base_url: str,
+        fn_index: int,
+        session_hash: str,
+        event_id: Optional[str],
+    ) -> None:
+        """Abort a cancelled queue job on the server without blocking the caller."""
+        self.aborted_jobs += 1
+        task = asyncio.create_task(
+            self._abort_job(base_url, fn_index, session_hash, event_id)
+        )
+        self._abort_tasks.add(task)
+        task.add_done_callback(self._abort_tasks.discard)
+
+    async def _abort_job(
+        self,
+        base_url: str,
+        fn_index: int,
+        session_hash: str,
+        event_id: Optional[str],
+    ) -> None:
+        """
+        Cancel a queue job on the server.
+
+        Gradio's /cancel drops the queued event and cancels an unbatched task,
+        but cannot stop a synthesis already running in a worker thread or a
+        job gathered into a batch. The server's cancel_tts endpoint marks the
+        job id, so the server skips the job if it has not synthesized it yet.
+        """
+        client = self._get_async_http_client()
+        try:
+            if event_id:
+                response = await client.post(
+                    f"{base_url}/cancel",
+                    json={
+                        "session_hash": session_hash,
+                        "fn_index": fn_index,
+                        "event_id": event_id,
+                    },
+                    timeout=5.0,
+                )
+                if response.is_error:
+                    logger.debug(f"Gradio /cancel returned {response.status_code}")
+            response = await client.post(
+                f"{base_url}/api/cancel_tts/",
+                json={"data": [session_hash]},
+                timeout=5.0,
+            )
+            response.raise_for_status()
+            logger.debug(f"🛑 Aborted Bert-VITS2 job {session_hash[:8]}")
+        except httpx.HTTPError as e:
+            logger.debug(f"Abort request for job {session_hash[:8]} failed: {e}")
+
+    async def _async_download_audio(self, audio_data) -> tuple:
+        """Fetch the generated WAV over the pooled connection and decode it.
+
+        Returns:
+            tuple: (audio_array, sample_rate), plus the downloaded bytes when
+            they are already 16-bit PCM and can be sent to the client as-is
+        """
+        audio_url = self._resolve_audio_url(audio_data)
+        logger.debug(f"📥 Downloading audio from {audio_url}")
+        response = await self._get_async_http_client().get(audio_url)
+        response.raise_for_status()
+
+        pcm16 = read_pcm16_wav(response.content)
+        if pcm16 is not None:
+            return (*pcm16, response.content)
+
+        import scipy.io.wavfile as wavfile
+
+        sample_rate, audio_array = wavfile.read(io.BytesIO(response.content))
+        return audio_array, sample_rate
+
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP client."""
+        client, self._async_http_client = self._async_http_client, None
+        if client is not None:
+            # Detached first, so requests starting meanwhile get a new pool
+            await client.aclose()
+
     def _get_client(self) -> Client:
         """Get or create Gradio client."""
         if self.client is None:
@@ -498,23 +651,22 @@ class TTSEngine(TTSInterface):
                     raise
         return self.client
 
-    def generate_audio(self, text: str, file_name_no_ext: str | None = None) -> str:
+    def _prepare_request(self, text: str) -> Optional[list]:
         """
-        Generate speech audio file using Bert-VITS2 TTS.
+        Build the Gradio `tts_fn` input list for the given text.
 
         Args:
             text: The text to speak
-            file_name_no_ext: Name of the file without file extension (optional)
 
         Returns:
-            str: The path to the generated audio file
+            Optional[list]: The request data, or None if the text cannot be synthesized
         """
         # Clean text (remove special markers)
         cleaned_text = re.sub(r"\[.*?\]", "", text)
 
         # Detect language if auto_detect_language is enabled
         if self.auto_detect_language:
-            detected_lang = detect_language(cleaned_text)
+            detected_lang = tts_language(cleaned_text)
             if detected_lang != self.default_language:
                 logger.info(
                     f"🌐 Language auto-detected: {detected_lang} (default: {self.default_language})"
@@ -531,8 +683,7 @@ class TTSEngine(TTSInterface):
             current_language = "EN"
 
         # Korean text warning (will be processed as EN)
-        korean_pattern = re.compile(r'[\uAC00-\uD7AF\u1100-\u11FF]')
-        if korean_pattern.search(cleaned_text):
+        if identify_language(cleaned_text) == "ko":
             logger.warning(
                 f"🇰🇷 Korean text detected. Korean is not supported, processing as {current_language}. "
                 f"Text: {cleaned_text[:50]}..."
@@ -540,52 +691,68 @@ class TTSEngine(TTSInterface):
 
         if len(cleaned_text) < 2:
             logger.warning("Text too short for TTS generation")
-            return ""
+            return None
+
+        # Get language-specific config
+        lang_config = self._get_lang_config(current_language)
+        if not lang_config.get("model_name"):
+            logger.error(f"❌ No model configured for language: {current_language}")
+            return None
+
+        model_name = lang_config.get("model_name", "")
+        model_path = lang_config.get("model_path", "")
+        speaker = lang_config.get("speaker", "")
+        style = lang_config.get("style", "Neutral")
+        style_weight = lang_config.get("style_weight", 3.0)
+
+        reference_audio = None
+        if self.reference_audio_path:
+            reference_audio = self.reference_audio_path
+
+        logger.info(f"🌐 TTS: lang={current_language}, speaker={speaker}, model={model_name}")
+
+        # HTTP API를 직접 호출하여 WebSocket 완전 우회 및 deserialize 문제 해결
+        data = [
+            model_name,  # model_name
+            model_path,  # model_path
+            cleaned_text,  # text
+            current_language,  # language (auto-detected or default)
+            reference_audio,  # reference_audio_path
+            self.sdp_ratio,  # sdp_ratio
+            self.noise_scale,  # noise_scale
+            self.noise_scale_w,  # noise_scale_w
+            self.length_scale,  # length_scale
+            self.line_split,  # line_split
+            self.split_interval,  # split_interval
+            self.style_text if self.use_style_text else "",  # assist_text
+            self.style_text_weight,  # assist_text_weight
+            self.use_style_text,  # use_assist_text
+            style,  # style
+            style_weight,  # style_weight
+            "",  # kata_tone_json_str
+            False,  # use_tone
+            speaker,  # speaker
+            "",  # job_id, set to the session hash by _async_predict
+        ]
+        return data
+
+    def generate_pcm(self, text: str) -> Optional[tuple]:
+        """
+        Generate speech audio in memory using Bert-VITS2 TTS.
+
+        Args:
+            text: The text to speak
+
+        Returns:
+            Optional[tuple]: (audio_array, sample_rate), or None on failure
+        """
+        data = self._prepare_request(text)
+        if data is None:
+            return None
 
         try:
             self._get_client()
 
-            # Get language-specific config
-            lang_config = self._get_lang_config(current_language)
-            if not lang_config.get("model_name"):
-                logger.error(f"❌ No model configured for language: {current_language}")
-                return ""
-
-            model_name = lang_config.get("model_name", "")
-            model_path = lang_config.get("model_path", "")
-            speaker = lang_config.get("speaker", "")
-            style = lang_config.get("style", "Neutral")
-            style_weight = lang_config.get("style_weight", 3.0)
-
-            reference_audio = None
-            if self.reference_audio_path:
-                reference_audio = self.reference_audio_path
-
-            logger.info(f"🌐 TTS: lang={current_language}, speaker={speaker}, model={model_name}")
-
-            # HTTP API를 직접 호출하여 WebSocket 완전 우회 및 deserialize 문제 해결
-            data = [
-                model_name,  # model_name
-                model_path,  # model_path
-                cleaned_text,  # text
-                current_language,  # language (auto-detected or default)
-                reference_audio,  # reference_audio_path
-                self.sdp_ratio,  # sdp_ratio
-                self.noise_scale,  # noise_scale
-                self.noise_scale_w,  # noise_scale_w
-                self.length_scale,  # length_scale
-                self.line_split,  # line_split
-                self.split_interval,  # split_interval
-                self.style_text if self.use_style_text else "",  # assist_text
-                self.style_text_weight,  # assist_text_weight
-                self.use_style_text,  # use_assist_text
-                style,  # style
-                style_weight,  # style_weight
-                "",  # kata_tone_json_str
-                False,  # use_tone
-                speaker,  # speaker
-            ]
-            
             # HTTP API 직접 호출
             # 수정: _predict_via_http가 (message, audio_tuple, kata_tone) 튜플을 반환함
             message, audio_tuple, kata_tone = self._predict_via_http(fn_index=16, data=data)
@@ -593,23 +760,15 @@ class TTSEngine(TTSInterface):
             # audio_tuple should be (sample_rate, audio_array)
             if audio_tuple is None:
                 logger.error(f"❌ TTS generation failed: {message}")
-                return ""
+                return None
 
             if not isinstance(audio_tuple, (tuple, list)) or len(audio_tuple) < 2:
                 logger.error(f"❌ TTS generation failed: Invalid audio format: {audio_tuple}")
-                return ""
+                return None
 
             sample_rate, audio_data = audio_tuple[0], audio_tuple[1]
-
-            # Save audio to file
-            file_name = self.generate_cache_file_name(file_name_no_ext, "wav")
-
-            import scipy.io.wavfile as wavfile
-
-            wavfile.write(file_name, sample_rate, audio_data)
-
-            logger.info(f"✅ Generated audio: {file_name} | {message}")
-            return file_name
+            logger.info(f"✅ Generated audio: {sample_rate}Hz | {message}")
+            return audio_data, sample_rate
 
         except Exception as e:
             import traceback
@@ -626,8 +785,102 @@ class TTSEngine(TTSInterface):
                 try:
                     self._get_client()
                     logger.info("✅ Client reset successful, retrying audio generation...")
-                    # 재시도는 호출자가 처리하도록 빈 문자열 반환
+                    # 재시도는 호출자가 처리하도록 None 반환
                 except Exception as retry_error:
                     logger.error(f"❌ Failed to reset client: {retry_error}")
             
+            return None
+
+    async def async_generate_pcm(self, text: str) -> Optional[tuple]:
+        """
+        Generate speech audio in memory natively on the event loop.
+
+        Uses a pooled keep-alive HTTP client and Gradio's queue event stream
+        instead of running the polling `generate_pcm` in a worker thread.
+
+        Args:
+            text: The text to speak
+
+        Returns:
+            Optional[tuple]: (audio_array, sample_rate), plus the downloaded
+            WAV bytes when they are 16-bit PCM, or None on failure
+        """
+        data = self._prepare_request(text)
+        if data is None:
+            return None
+
+        self._async_requests += 1
+        try:
+            message, audio_data, _ = await self._async_predict(fn_index=16, data=data)
+            if audio_data is None:
+                logger.error(f"❌ TTS generation failed: {message}")
+                return None
+
+            pcm = await self._async_download_audio(audio_data)
+            logger.info(f"✅ Generated audio: {pcm[1]}Hz | {message}")
+            return pcm
+
+        except httpx.TransportError as e:
+            logger.error(f"❌ Connection error generating audio with Bert-VITS2: {e}")
+            # Other sentences may still be using the pool; rebuild it once idle
+            self._async_client_broken = True
+            return None
+        except httpx.HTTPError as e:
+            # e.g. one 5xx; only this sentence fails, the pool stays usable
+            logger.error(f"❌ HTTP error generating audio with Bert-VITS2: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ Error generating audio with Bert-VITS2: {e}")
+            return None
+        finally:
+            self._async_requests -= 1
+            if self._async_client_broken and self._async_requests == 0:
+                self._async_client_broken = False
+                await self.aclose()
+
+    def _write_cache_file(self, pcm: Optional[tuple], file_name_no_ext: str | None) -> str:
+        """Write in-memory audio to a cache file for file-based callers."""
+        if pcm is None:
             return ""
+
+        audio_array, sample_rate, *wav_bytes = pcm
+        file_name = self.generate_cache_file_name(file_name_no_ext, "wav")
+        if wav_bytes:
+            with open(file_name, "wb") as f:
+                f.write(wav_bytes[0])
+            return file_name
+
+        import scipy.io.wavfile as wavfile
+
+        wavfile.write(file_name, sample_rate, audio_array)
+        return file_name
+
+    def generate_audio(self, text: str, file_name_no_ext: str | None = None) -> str:
+        """
+        Generate speech audio file using Bert-VITS2 TTS.
+
+        Args:
+            text: The text to speak
+            file_name_no_ext: Name of the file without file extension (optional)
+
+        Returns:
+            str: The path to the generated audio file
+        """
+        return self._write_cache_file(self.generate_pcm(text), file_name_no_ext)
+
+    async def async_generate_audio(
+        self, text: str, file_name_no_ext: str | None = None
+    ) -> str:
+        """
+        Generate speech audio file natively on the event loop.
+
+        Args:
+            text: The text to speak
+            file_name_no_ext: Name of the file without file extension (optional)
+
+        Returns:
+            str: The path to the generated audio file
+        """
+        return self._write_cache_file(
+            await self.async_generate_pcm(text), file_name_no_ext
+        )
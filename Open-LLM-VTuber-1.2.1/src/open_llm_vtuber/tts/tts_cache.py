@@ -0,0 +1,280 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class CachedAudio:
+    """Synthesized sentence ready to be turned into an audio payload."""
+
+    audio_bytes: bytes  # WAV file bytes
+    volumes: list  # normalized per-chunk RMS values
+
+    @property
+    def size(self) -> int:
+        return len(self.audio_bytes) + 8 * len(self.volumes)
+
+
+def normalize_tts_text(text: str) -> str:
+    """Normalize text so trivially different spellings share a cache entry."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class TTSResultCache:
+    """
+    Content-addressed cache of synthesized audio, shared by all sessions.
+
+    Entries are keyed on the normalized text plus the engine's full voice
+    parameter set, so a hit is byte-identical to what the backend would return.
+    A byte-budgeted in-memory LRU sits in front of an optional on-disk tier.
+    The event loop should use `aget`/`aput`, which do the disk I/O in a worker
+    thread.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        """
+        Args:
+            max_memory_bytes: Budget of the in-memory tier
+            disk_dir: Directory of the on-disk tier, or None to disable it
+            max_disk_bytes: Budget of the on-disk tier
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._entries: OrderedDict[str, CachedAudio] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        # Entries on disk, least recently written first (key -> bytes)
+        self._disk_entries: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._scan_disk()
+
+    @staticmethod
+    def make_key(text: str, voice_params: dict, slice_length: int) -> str:
+        """
+        Build the cache key for a sentence.
+
+        Args:
+            text: Text sent to the TTS engine
+            voice_params: Engine name and every parameter that affects the voice
+            slice_length: Chunk length (ms) the volumes were computed with
+
+        Returns:
+            str: Hex digest identifying the synthesized audio
+        """
+        material = json.dumps(
+            {
+                "text": normalize_tts_text(text),
+                "voice": voice_params,
+                "slice_length": slice_length,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedAudio]:
+        """Return the cached audio for key, or None on a miss."""
+        entry = self._get_memory(key)
+        if entry is not None:
+            return entry
+        return self._disk_lookup_done(key, self._read_disk(key))
+
+    async def aget(self, key: str) -> Optional[CachedAudio]:
+        """`get` that reads the disk tier in a worker thread."""
+        entry = self._get_memory(key)
+        if entry is not None:
+            return entry
+        if not self._on_disk(key):
+            return self._disk_lookup_done(key, None)
+        entry = await asyncio.to_thread(self._read_disk, key)
+        return self._disk_lookup_done(key, entry)
+
+    def put(self, key: str, entry: CachedAudio) -> None:
+        """Store synthesized audio in both tiers."""
+        with self._lock:
+            self._put_memory(key, entry)
+        self._write_disk(key, entry)
+
+    async def aput(self, key: str, entry: CachedAudio) -> None:
+        """`put` that writes the disk tier in a worker thread."""
+        with self._lock:
+            self._put_memory(key, entry)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, entry)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    # ==== Memory tier
+
+    def _get_memory(self, key: str) -> Optional[CachedAudio]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def _disk_lookup_done(
+        self, key: str, entry: Optional[CachedAudio]
+    ) -> Optional[CachedAudio]:
+        """Count a lookup that missed memory and promote a disk hit."""
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._put_memory(key, entry)
+        return entry
+
+    # Caller holds the lock
+    def _put_memory(self, key: str, entry: CachedAudio) -> None:
+        if entry.size > self.max_memory_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.size
+        self._entries[key] = entry
+        self._memory_bytes += entry.size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= evicted.size
+
+    # ==== Disk tier
+
+    def _disk_paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.disk_dir, key)
+        return f"{base}.wav", f"{base}.json"
+
+    def _on_disk(self, key: str) -> bool:
+        with self._disk_lock:
+            return key in self._disk_entries
+
+    def _scan_disk(self) -> None:
+        """Index the entries already on disk, oldest first."""
+        sizes: dict[str, int] = {}
+        written: dict[str, float] = {}
+        try:
+            files = list(os.scandir(self.disk_dir))
+        except OSError:
+            return
+        for f in files:
+            key, ext = os.path.splitext(f.name)
+            if ext not in (".wav", ".json"):
+                continue
+            try:
+                stat = f.stat()
+            except OSError:
+                continue
+            sizes[key] = sizes.get(key, 0) + stat.st_size
+            if ext == ".json":
+                written[key] = stat.st_mtime
+        # A metadata file marks a complete entry
+        for key in sorted(written, key=written.get):
+            self._disk_entries[key] = sizes[key]
+            self._disk_bytes += sizes[key]
+
+    def _read_disk(self, key: str) -> Optional[CachedAudio]:
+        if not self.disk_dir:
+            return None
+        wav_path, meta_path = self._disk_paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                volumes = json.load(f)["volumes"]
+            with open(wav_path, "rb") as f:
+                audio_bytes = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return CachedAudio(audio_bytes=audio_bytes, volumes=volumes)
+
+    def _write_disk(self, key: str, entry: CachedAudio) -> None:
+        if not self.disk_dir:
+            return
+        wav_path, meta_path = self._disk_paths(key)
+        meta_bytes = json.dumps({"volumes": entry.volumes}).encode("utf-8")
+        try:
+            # Write the WAV first: a metadata file marks a complete entry
+            self._write_file(wav_path, entry.audio_bytes)
+            self._write_file(meta_path, meta_bytes)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache entry to disk: {e}")
+            return
+
+        with self._disk_lock:
+            self._disk_bytes -= self._disk_entries.pop(key, 0)
+            self._disk_entries[key] = len(entry.audio_bytes) + len(meta_bytes)
+            self._disk_bytes += self._disk_entries[key]
+            stale = []
+            while self._disk_bytes > self.max_disk_bytes and self._disk_entries:
+                old_key, size = self._disk_entries.popitem(last=False)
+                self._disk_bytes -= size
+                stale.append(old_key)
+        for old_key in stale:
+            self._remove_disk(old_key)
+
+    def _write_file(self, path: str, data: bytes) -> None:
+        """Atomically replace path; unique temp names keep writers apart."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _remove_disk(self, key: str) -> None:
+        """Delete an entry evicted from the disk budget."""
+        for path in self._disk_paths(key)[::-1]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -191,6 +191,7 @@ class TTSFactory:
                 style_text=kwargs.get("style_text"),
                 style_text_weight=kwargs.get("style_text_weight"),
                 reference_audio_path=kwargs.get("reference_audio_path"),
+                max_concurrency=kwargs.get("max_concurrency", 8),
             )
         else:
             raise ValueError(f"Unknown TTS engine type: {engine_type}")
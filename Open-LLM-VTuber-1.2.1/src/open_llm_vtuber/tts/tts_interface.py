@@ -1,11 +1,25 @@
 import abc
 import os
 import asyncio
+from typing import Optional
 
+import numpy as np
 from loguru import logger
 
 
 class TTSInterface(metaclass=abc.ABCMeta):
+    # Engines that implement generate_pcm set this to True so callers can skip
+    # the cache file round trip (write, read back, remove) entirely.
+    supports_pcm: bool = False
+
+    # Engine name and every parameter that shapes the voice. Set by
+    # ServiceContext.init_tts; results are only cached when this is known.
+    voice_params: Optional[dict] = None
+
+    # Maximum simultaneous synthesis requests, shared by all sessions using
+    # this engine (see tts_scheduler.TTSScheduler)
+    max_concurrency: int = 4
+
     async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
         """
         Asynchronously generate speech audio file using TTS.
@@ -39,6 +53,38 @@ class TTSInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    async def async_generate_pcm(self, text: str) -> Optional[tuple[np.ndarray, int]]:
+        """
+        Asynchronously generate speech audio in memory.
+
+        By default, this runs the synchronous generate_pcm in a coroutine.
+        Only available when `supports_pcm` is True.
+
+        text: str
+            the text to speak
+
+        Returns:
+        Optional[tuple[np.ndarray, int]]: (PCM samples, sample rate), or None if generation failed.
+        Engines may append the 16-bit PCM WAV bytes the samples were read from,
+        which are then sent without re-encoding.
+
+        """
+        return await asyncio.to_thread(self.generate_pcm, text)
+
+    def generate_pcm(self, text: str) -> Optional[tuple[np.ndarray, int]]:
+        """
+        Generate speech audio in memory instead of writing a cache file.
+        Only available when `supports_pcm` is True.
+
+        text: str
+            the text to speak
+
+        Returns:
+        Optional[tuple[np.ndarray, int]]: (PCM samples, sample rate), or None if generation failed
+
+        """
+        raise NotImplementedError
+
     def remove_file(self, filepath: str, verbose: bool = True) -> None:
         """
         Remove a file from the file system.
@@ -0,0 +1,81 @@
+import asyncio
+import heapq
+import itertools
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from .tts_interface import TTSInterface
+
+
+class TTSScheduler:
+    """
+    Priority-aware concurrency limiter for one TTS engine.
+
+    At most `max_concurrency` synthesis requests run at once. When a slot
+    frees up it goes to the waiter with the lowest priority value (the
+    sentence sequence number), ties broken by arrival order, so the first
+    sentence of a reply is never stuck behind the rest of it.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold one synthesis slot for the duration of the block."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        if self._active < self.max_concurrency and not self.waiting:
+            self._active += 1
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed over just as we were cancelled
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        while self._waiters and self._active < self.max_concurrency:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            self._active += 1
+            fut.set_result(None)
+
+
+# One scheduler per engine instance; engines are shared across sessions
+_schedulers: "weakref.WeakKeyDictionary[TTSInterface, TTSScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_tts_scheduler(tts_engine: TTSInterface) -> TTSScheduler:
+    """Return the scheduler shared by every session using tts_engine."""
+    scheduler = _schedulers.get(tts_engine)
+    if scheduler is None:
+        scheduler = TTSScheduler(tts_engine.max_concurrency)
+        _schedulers[tts_engine] = scheduler
+    return scheduler
@@ -0,0 +1,113 @@
+"""
+Shared language identification for the streaming path.
+
+Language is classified from the Unicode script of the text with precompiled
+character-class regexes, so a lookup is a handful of C-level scans instead of
+a statistical model run. Results are memoized, and sentence segmenters are
+built once per language and reused.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+import pysbd
+
+# Set of languages directly supported by pysbd
+SUPPORTED_LANGUAGES = {
+    "am",
+    "ar",
+    "bg",
+    "da",
+    "de",
+    "el",
+    "en",
+    "es",
+    "fa",
+    "fr",
+    "hi",
+    "hy",
+    "it",
+    "ja",
+    "kk",
+    "mr",
+    "my",
+    "nl",
+    "pl",
+    "ru",
+    "sk",
+    "ur",
+    "zh",
+}
+
+_KANA = re.compile(r"[぀-ゟ゠-ヿ]")
+_HANGUL = re.compile(r"[가-힯ᄀ-ᇿ㄰-㆏]")
+_HAN = re.compile(r"[一-鿿]")
+
+# Alphabetic scripts: the one with the most letters wins
+_SCRIPTS = (
+    ("en", re.compile(r"[A-Za-zÀ-ɏ]")),
+    ("ru", re.compile(r"[Ѐ-ӿ]")),
+    ("ar", re.compile(r"[؀-ۿݐ-ݿ]")),
+    ("hi", re.compile(r"[ऀ-ॿ]")),
+    ("el", re.compile(r"[Ͱ-Ͽ]")),
+    ("hy", re.compile(r"[԰-֏]")),
+    ("am", re.compile(r"[ሀ-፿]")),
+    ("my", re.compile(r"[က-႟]")),
+)
+
+
+@lru_cache(maxsize=512)
+def identify_language(text: str) -> Optional[str]:
+    """
+    Identify the language of text from its script.
+
+    Any kana makes the text Japanese; Hangul makes it Korean; other Han text
+    is Chinese. Otherwise the alphabetic script with the most letters decides,
+    with every Latin-script language reported as "en".
+
+    Args:
+        text: Text to classify
+
+    Returns:
+        Optional[str]: ISO 639-1 code, or None if the text has no letters
+    """
+    if _KANA.search(text):
+        return "ja"
+    if _HANGUL.search(text):
+        return "ko"
+    if _HAN.search(text):
+        return "zh"
+
+    best_lang, best_count = None, 0
+    for lang, pattern in _SCRIPTS:
+        count = len(pattern.findall(text))
+        if count > best_count:
+            best_lang, best_count = lang, count
+    return best_lang
+
+
+def segmenter_language(text: str) -> Optional[str]:
+    """Language of text if pysbd can segment it, else None."""
+    lang = identify_language(text)
+    return lang if lang in SUPPORTED_LANGUAGES else None
+
+
+@lru_cache(maxsize=None)
+def get_segmenter(lang: str) -> pysbd.Segmenter:
+    """Return the shared pysbd Segmenter for lang, building it on first use."""
+    return pysbd.Segmenter(language=lang, clean=False)
+
+
+def tts_language(text: str) -> str:
+    """
+    Language code for EN/JP-only TTS engines such as Bert-VITS2.
+
+    Args:
+        text: Text to speak
+
+    Returns:
+        str: 'JP' if the text contains kana or kanji, otherwise 'EN'
+    """
+    # Kanji-only text is treated as Japanese; Chinese is not supported
+    return "JP" if identify_language(text) in ("ja", "zh") else "EN"
@@ -1,11 +1,12 @@
 import re
 from typing import List, Tuple, AsyncIterator, Optional, Union, Dict, Any
-import pysbd
 from loguru import logger
-from langdetect import detect
 from enum import Enum
 from dataclasses import dataclass
 
+from .language_id import get_segmenter, segmenter_language
+from .turn_trace import trace_event
+
 # Constants for additional checks
 COMMAS = [
     ",",
@@ -45,45 +46,17 @@ ABBREVIATIONS = [
     "Dr.",
 ]
 
-# Set of languages directly supported by pysbd
-SUPPORTED_LANGUAGES = {
-    "am",
-    "ar",
-    "bg",
-    "da",
-    "de",
-    "el",
-    "en",
-    "es",
-    "fa",
-    "fr",
-    "hi",
-    "hy",
-    "it",
-    "ja",
-    "kk",
-    "mr",
-    "my",
-    "nl",
-    "pl",
-    "ru",
-    "sk",
-    "ur",
-    "zh",
-}
-
-
-def detect_language(text: str) -> str:
+# Characters before the end of the buffer that segmentation may still need as
+# context when deciding a boundary; see SentenceDivider._segment_pending_text
+_SEGMENT_CONTEXT_CHARS = 32
+
+
+def detect_language(text: str) -> Optional[str]:
     """
     Detect text language and check if it's supported by pysbd.
     Returns None for unsupported languages.
     """
-    try:
-        detected = detect(text)
-        return detected if detected in SUPPORTED_LANGUAGES else None
-    except Exception as e:
-        logger.debug(f"Language detection failed, language not supported by pysdb: {e}")
-        return None
+    return segmenter_language(text)
 
 
 def is_complete_sentence(text: str) -> bool:
@@ -230,8 +203,7 @@ def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
 
         if lang is not None:
             # Use pysbd for supported languages
-            segmenter = pysbd.Segmenter(language=lang, clean=False)
-            sentences = segmenter.segment(text)
+            sentences = get_segmenter(lang).segment(text)
 
             if not sentences:
                 return [], text
@@ -321,6 +293,32 @@ class SentenceDivider:
         # Replace active_tags dict with a stack to handle nesting
         self._tag_stack = []
 
+        # One automaton for every <tag>, </tag> and <tag/> of the valid tags
+        names = "|".join(re.escape(tag) for tag in self.valid_tags)
+        self._tag_pattern = re.compile(rf"</({names})>|<({names})(/?)>")
+        self._max_tag_len = max(len(tag) for tag in self.valid_tags) + 3
+        # Scan cursors: the buffer before them has already been checked for
+        # tags / sentence boundaries, so only newly arrived text is inspected
+        self._tag_scan_pos = 0
+        self._text_scan_pos = 0
+        # Buffer prefix that segmentation already found no boundary in
+        self._segment_safe_pos = 0
+
+    def _set_buffer(self, text: str) -> None:
+        """Replace the buffer after consuming text, rewinding the scan cursors"""
+        self._buffer = text
+        self._tag_scan_pos = 0
+        self._text_scan_pos = 0
+        self._segment_safe_pos = 0
+
+    def _find_next_tag(self) -> Optional[re.Match]:
+        """Find the first tag in the buffer, scanning only unchecked text"""
+        # Back up far enough to catch a tag split across chunks
+        start = max(0, self._tag_scan_pos - self._max_tag_len + 1)
+        match = self._tag_pattern.search(self._buffer, start)
+        self._tag_scan_pos = match.start() if match else len(self._buffer)
+        return match
+
     def _get_current_tags(self) -> List[TagInfo]:
         """
         Get all current active tags from outermost to innermost.
@@ -351,44 +349,17 @@ class SentenceDivider:
             Tuple of (TagInfo if tag found else None, remaining text)
         """
         # Find the first occurrence of any tag
-        first_tag = None
-        first_pos = len(text)
-        tag_type = None
-        matched_tag = None
-
-        # Check for self-closing tags
-        for tag in self.valid_tags:
-            pattern = f"<{tag}/>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.SELF_CLOSING
-                matched_tag = tag
-
-        # Check for opening tags
-        for tag in self.valid_tags:
-            pattern = f"<{tag}>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.START
-                matched_tag = tag
-
-        # Check for closing tags
-        for tag in self.valid_tags:
-            pattern = f"</{tag}>"
-            match = re.search(pattern, text)
-            if match and match.start() < first_pos:
-                first_pos = match.start()
-                first_tag = match
-                tag_type = TagState.END
-                matched_tag = tag
-
+        first_tag = self._tag_pattern.search(text)
         if not first_tag:
             return None, text
 
+        if first_tag.group(1):
+            tag_type, matched_tag = TagState.END, first_tag.group(1)
+        elif first_tag.group(3):
+            tag_type, matched_tag = TagState.SELF_CLOSING, first_tag.group(2)
+        else:
+            tag_type, matched_tag = TagState.START, first_tag.group(2)
+
         # Handle the found tag
         if tag_type == TagState.START:
             # Push new tag onto stack
@@ -417,15 +388,9 @@ class SentenceDivider:
                 break
 
             # Find the next tag position
-            next_tag_pos = len(self._buffer)
-            tag_pattern_found = None
-            for tag in self.valid_tags:
-                patterns = [f"<{tag}>", f"</{tag}>", f"<{tag}/>"]
-                for pattern in patterns:
-                    pos = self._buffer.find(pattern)
-                    if pos != -1 and pos < next_tag_pos:
-                        next_tag_pos = pos
-                        tag_pattern_found = pattern  # Store the found pattern
+            next_tag = self._find_next_tag()
+            next_tag_pos = next_tag.start() if next_tag else len(self._buffer)
+            tag_pattern_found = next_tag.group(0) if next_tag else None
 
             if next_tag_pos == 0:
                 # Tag is at the start of buffer
@@ -436,7 +401,7 @@ class SentenceDivider:
                     ].strip()
                     # Yield the tag itself, represented as a SentenceWithTags
                     yield SentenceWithTags(text=processed_text, tags=[tag_info])
-                    self._buffer = remaining
+                    self._set_buffer(remaining)
                     processed_something = True
                     continue  # Restart processing loop for the remaining buffer
 
@@ -457,7 +422,7 @@ class SentenceDivider:
                             )
                     # The part consumed includes sentences + what's left before the tag
                     processed_segment = text_before_tag
-                    self._buffer = self._buffer[len(processed_segment) :]
+                    self._set_buffer(self._buffer[len(processed_segment) :])
                     processed_something = True
                     continue  # Restart processing loop
 
@@ -468,7 +433,7 @@ class SentenceDivider:
                         text=text_before_tag.strip(),
                         tags=current_tags or [TagInfo("", TagState.NONE)],
                     )
-                    self._buffer = self._buffer[len(text_before_tag) :]
+                    self._set_buffer(self._buffer[len(text_before_tag) :])
                     processed_something = True
                     continue  # Restart processing loop
                 # --- If no tag found after text_before_tag, we wait for more input or end punctuation ---
@@ -480,7 +445,7 @@ class SentenceDivider:
                         : len(self._buffer) - len(remaining_after_tag)
                     ].strip()
                     yield SentenceWithTags(text=processed_tag_text, tags=[tag_info])
-                    self._buffer = remaining_after_tag
+                    self._set_buffer(remaining_after_tag)
                     processed_something = True
                     continue  # Restart processing loop
 
@@ -488,12 +453,18 @@ class SentenceDivider:
             # Process normal text if buffer has changed or punctuation exists
             if original_buffer_len > 0:
                 current_tags = self._get_current_tags()
+                # Only text that arrived since the last check can add a boundary;
+                # keep a few checked characters so the text right after an end
+                # punctuation (e.g. ". T") still re-triggers segmentation
+                new_text = self._buffer[self._text_scan_pos :]
+                lookahead_text = self._buffer[max(0, self._text_scan_pos - 3) :]
+                self._text_scan_pos = len(self._buffer)
 
                 # Handle first sentence with comma if enabled
                 if (
                     self._is_first_sentence
                     and self.faster_first_response
-                    and contains_comma(self._buffer)
+                    and contains_comma(new_text)
                 ):
                     sentence, remaining = comma_splitter(self._buffer)
                     if sentence.strip():
@@ -501,16 +472,16 @@ class SentenceDivider:
                             text=sentence.strip(),
                             tags=current_tags or [TagInfo("", TagState.NONE)],
                         )
-                        self._buffer = remaining
+                        self._set_buffer(remaining)
                         self._is_first_sentence = False
                         processed_something = True
                         continue  # Restart processing loop
 
                 # Process normal sentences based on end punctuation
-                if contains_end_punctuation(self._buffer):
-                    sentences, remaining = self._segment_text(self._buffer)
+                if contains_end_punctuation(lookahead_text):
+                    sentences, remaining = self._segment_pending_text()
                     if sentences:  # Only process if segmentation yielded sentences
-                        self._buffer = remaining
+                        self._set_buffer(remaining)
                         self._is_first_sentence = False
                         processed_something = True
                         for sentence in sentences:
@@ -544,7 +515,7 @@ class SentenceDivider:
                 text=self._buffer.strip(),
                 tags=current_tags or [TagInfo("", TagState.NONE)],
             )
-            self._buffer = ""  # Clear buffer after flushing
+            self._set_buffer("")  # Clear buffer after flushing
 
     async def process_stream(
         self, segment_stream: AsyncIterator[Union[str, Dict[str, Any]]]
@@ -566,9 +537,7 @@ class SentenceDivider:
             if isinstance(item, dict):
                 # Before yielding the dict, process and yield any complete sentences formed so far
                 async for sentence in self._process_buffer():
-                    self._full_response.append(
-                        sentence.text
-                    )  # Track for complete response
+                    self._track_sentence(sentence)
                     yield sentence
                 # Now yield the dictionary
                 yield item
@@ -576,9 +545,7 @@ class SentenceDivider:
                 self._buffer += item
                 # Process the buffer incrementally as string chunks arrive
                 async for sentence in self._process_buffer():
-                    self._full_response.append(
-                        sentence.text
-                    )  # Track for complete response
+                    self._track_sentence(sentence)
                     yield sentence
             else:
                 logger.warning(
@@ -587,14 +554,43 @@ class SentenceDivider:
 
         # After the stream finishes, flush any remaining text in the buffer
         async for sentence in self._flush_buffer():
-            self._full_response.append(sentence.text)
+            self._track_sentence(sentence)
             yield sentence
 
+    def _track_sentence(self, sentence: SentenceWithTags) -> None:
+        """Track an emitted sentence for the complete response and the turn trace"""
+        self._full_response.append(sentence.text)
+        trace_event("sentence", chars=len(sentence.text))
+
     @property
     def complete_response(self) -> str:
         """Get the complete response accumulated so far"""
         return "".join(self._full_response)
 
+    def _segment_pending_text(self) -> Tuple[List[str], str]:
+        """
+        Segment the buffer, skipping the prefix already known to hold no
+        sentence boundary so run-on output is not re-segmented from the start.
+        """
+        start = self._segment_safe_pos
+        prefix = self._buffer[:start]
+        sentences, remaining = self._segment_text(self._buffer[start:])
+        if sentences:
+            sentences[0] = prefix + sentences[0]
+            return sentences, remaining
+
+        # No boundary: everything except a margin for segmentation context
+        # stays boundary-free, so the next attempt can start after it
+        safe_end = len(self._buffer) - _SEGMENT_CONTEXT_CHARS
+        if safe_end > start:
+            space = max(
+                self._buffer.rfind(" ", start, safe_end),
+                self._buffer.rfind("\n", start, safe_end),
+            )
+            if space != -1:
+                self._segment_safe_pos = space + 1
+        return sentences, self._buffer
+
     def _segment_text(self, text: str) -> Tuple[List[str], str]:
         """Segment text using the configured method"""
         if self.segment_method == "regex":
@@ -604,5 +600,5 @@ class SentenceDivider:
     def reset(self):
         """Reset the divider state for a new conversation"""
         self._is_first_sentence = True
-        self._buffer = ""
+        self._set_buffer("")
         self._tag_stack = []
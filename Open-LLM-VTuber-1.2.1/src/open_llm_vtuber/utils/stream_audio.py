@@ -1,9 +1,16 @@
 import base64
+import io
+import wave
+
+import numpy as np
 from pydub import AudioSegment
 from pydub.utils import make_chunks
 from ..agent.output_types import Actions
 from ..agent.output_types import DisplayText
 
+# PCM sample widths (bytes) that can be viewed directly as a NumPy array
+_PCM_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
 
 def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
     """
@@ -24,12 +31,212 @@ def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
     return [volume / max_volume for volume in volumes]
 
 
+def _get_volume_by_chunks_np(
+    samples: np.ndarray, frame_rate: int, channels: int, chunk_length_ms: int
+) -> list:
+    """
+    Vectorized equivalent of `_get_volume_by_chunks` for decoded PCM samples.
+
+    Parameters:
+        samples (np.ndarray): Interleaved PCM samples
+        frame_rate (int): Sample rate in Hz
+        channels (int): Number of interleaved channels
+        chunk_length_ms (int): The length of each audio chunk in milliseconds
+
+    Returns:
+        list: Normalized volumes for each chunk.
+    """
+    chunk_size = max(1, int(frame_rate * chunk_length_ms / 1000)) * channels
+    samples = samples.astype(np.float64)
+    n_full = len(samples) // chunk_size
+
+    squares = samples[: n_full * chunk_size].reshape(n_full, chunk_size) ** 2
+    volumes = np.sqrt(squares.mean(axis=1))
+    tail = samples[n_full * chunk_size :]
+    if len(tail):
+        volumes = np.append(volumes, np.sqrt(np.mean(tail**2)))
+
+    max_volume = volumes.max() if len(volumes) else 0
+    if max_volume == 0:
+        raise ValueError("Audio is empty or all zero.")
+    return (volumes / max_volume).tolist()
+
+
+def _parse_pcm_wav(audio_bytes: bytes) -> tuple[np.ndarray, int, int] | None:
+    """
+    Parse PCM WAV bytes without transcoding.
+
+    Returns:
+        tuple | None: (interleaved samples in the file's own width, frame rate,
+        channels), or None if the bytes are not a PCM WAV NumPy can view directly.
+    """
+    if audio_bytes[:4] != b"RIFF" or audio_bytes[8:12] != b"WAVE":
+        return None
+
+    try:
+        with wave.open(io.BytesIO(audio_bytes)) as wav:
+            dtype = _PCM_DTYPES.get(wav.getsampwidth())
+            if dtype is None:
+                return None
+            frames = wav.readframes(wav.getnframes())
+            frame_rate = wav.getframerate()
+            channels = wav.getnchannels()
+    except (wave.Error, EOFError):
+        # e.g. IEEE float or extensible WAVs; let pydub/ffmpeg handle them
+        return None
+
+    return np.frombuffer(frames, dtype=dtype), frame_rate, channels
+
+
+def _read_pcm_wav(audio_path: str) -> tuple[bytes, np.ndarray, int, int] | None:
+    """
+    Read a PCM WAV file without transcoding.
+
+    Returns:
+        tuple | None: (original file bytes, interleaved samples, frame rate,
+        channels), or None if the file is not a PCM WAV NumPy can view directly.
+    """
+    with open(audio_path, "rb") as f:
+        audio_bytes = f.read()
+    pcm_wav = _parse_pcm_wav(audio_bytes)
+    if pcm_wav is None:
+        return None
+
+    samples, frame_rate, channels = pcm_wav
+    if samples.dtype == np.uint8:
+        samples = samples.astype(np.int16) - 128
+    return audio_bytes, samples, frame_rate, channels
+
+
+def read_pcm16_wav(audio_bytes: bytes) -> tuple[np.ndarray, int] | None:
+    """
+    Decode a 16-bit PCM WAV the way `scipy.io.wavfile.read` would.
+
+    Engines use this to check whether downloaded audio can be sent to the
+    client as-is (see `load_audio_data`).
+
+    Returns:
+        tuple | None: (int16 samples shaped (frames, channels) for
+        multi-channel audio, sample rate), or None for any other format
+    """
+    pcm_wav = _parse_pcm_wav(audio_bytes)
+    if pcm_wav is None or pcm_wav[0].dtype != np.int16:
+        return None
+
+    samples, frame_rate, channels = pcm_wav
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+    return samples, frame_rate
+
+
+def _encode_pcm_wav(
+    audio_array: np.ndarray, sample_rate: int
+) -> tuple[bytes, np.ndarray, int]:
+    """
+    Encode in-memory audio as a 16-bit PCM WAV without touching the disk.
+
+    Float arrays are assumed to be in [-1, 1]. Other integer widths are
+    rescaled to 16 bits (unsigned ones are centred first), so e.g. int32
+    samples keep their top 16 bits instead of wrapping around.
+
+    Returns:
+        tuple: (WAV bytes, interleaved int16 samples, channels)
+    """
+    audio_array = np.asarray(audio_array)
+    channels = 1 if audio_array.ndim == 1 else audio_array.shape[1]
+    if np.issubdtype(audio_array.dtype, np.floating):
+        samples = (np.clip(audio_array, -1.0, 1.0) * 32767).astype(np.int16)
+    elif audio_array.dtype == np.int16:
+        samples = audio_array
+    else:
+        bits = audio_array.dtype.itemsize * 8
+        samples = audio_array.astype(np.int64)
+        if np.issubdtype(audio_array.dtype, np.unsignedinteger):
+            samples -= 1 << (bits - 1)
+        if bits > 16:
+            samples >>= bits - 16
+        else:
+            samples <<= 16 - bits
+        samples = samples.astype(np.int16)
+    samples = np.ascontiguousarray(samples).reshape(-1)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(int(sample_rate))
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue(), samples, channels
+
+
+def _load_audio_file(audio_path: str, chunk_length_ms: int) -> tuple[bytes, list]:
+    """Read an audio file as WAV bytes and compute its chunk volumes."""
+    try:
+        # Fast path: PCM WAV is sent as-is and decoded only once for the volumes
+        pcm_wav = _read_pcm_wav(audio_path)
+    except OSError as e:
+        raise ValueError(f"Error reading generated audio file '{audio_path}': {e}")
+
+    if pcm_wav is not None:
+        audio_bytes, samples, frame_rate, channels = pcm_wav
+        volumes = _get_volume_by_chunks_np(
+            samples, frame_rate, channels, chunk_length_ms
+        )
+        return audio_bytes, volumes
+
+    try:
+        audio = AudioSegment.from_file(audio_path)
+        audio_bytes = audio.export(format="wav").read()
+    except Exception as e:
+        raise ValueError(
+            f"Error loading or converting generated audio file to wav file '{audio_path}': {e}"
+        )
+    return audio_bytes, _get_volume_by_chunks(audio, chunk_length_ms)
+
+
+def load_audio_data(
+    audio_path: str | None = None,
+    audio_pcm: tuple | None = None,
+    chunk_length_ms: int = 20,
+) -> tuple[bytes, list]:
+    """
+    Turn generated audio into WAV bytes and normalized chunk volumes.
+
+    Parameters:
+        audio_path (str | None): Path to a generated audio file
+        audio_pcm (tuple, optional): (audio_array, sample_rate), used instead of
+            audio_path. A third element holds the 16-bit PCM WAV the samples
+            were read from, which is then sent without re-encoding.
+        chunk_length_ms (int): The length of each audio chunk in milliseconds
+
+    Returns:
+        tuple: (WAV bytes, volumes)
+    """
+    if audio_pcm is not None:
+        # In-memory engine output: no cache file round trip
+        audio_array, frame_rate, *wav_bytes = audio_pcm
+        if wav_bytes:
+            audio_bytes = wav_bytes[0]
+            channels = 1 if audio_array.ndim == 1 else audio_array.shape[1]
+            samples = audio_array.reshape(-1)
+        else:
+            audio_bytes, samples, channels = _encode_pcm_wav(audio_array, frame_rate)
+        volumes = _get_volume_by_chunks_np(
+            samples, frame_rate, channels, chunk_length_ms
+        )
+        return audio_bytes, volumes
+    return _load_audio_file(audio_path, chunk_length_ms)
+
+
 def prepare_audio_payload(
     audio_path: str | None,
     chunk_length_ms: int = 20,
     display_text: DisplayText = None,
     actions: Actions = None,
     forwarded: bool = False,
+    encode_base64: bool = True,
+    audio_pcm: tuple | None = None,
+    audio_data: tuple[bytes, list] | None = None,
 ) -> dict[str, any]:
     """
     Prepares the audio payload for sending to a broadcast endpoint.
@@ -40,6 +247,12 @@ def prepare_audio_payload(
         chunk_length_ms (int): The length of each audio chunk in milliseconds
         display_text (DisplayText, optional): Text to be displayed with the audio
         actions (Actions, optional): Actions associated with the audio
+        encode_base64 (bool): If False, "audio" holds the raw WAV bytes for the
+            binary protocol (see `split_binary_audio_payload`)
+        audio_pcm (tuple, optional): (audio_array, sample_rate[, wav_bytes]) from
+            an engine's `async_generate_pcm`; used instead of audio_path when given
+        audio_data (tuple, optional): Precomputed (WAV bytes, volumes), e.g. from
+            `load_audio_data` or the TTS result cache
 
     Returns:
         dict: The audio payload to be sent
@@ -47,7 +260,7 @@ def prepare_audio_payload(
     if isinstance(display_text, DisplayText):
         display_text = display_text.to_dict()
 
-    if not audio_path:
+    if not audio_path and audio_pcm is None and audio_data is None:
         # Return payload for silent display
         return {
             "type": "audio",
@@ -59,19 +272,17 @@ def prepare_audio_payload(
             "forwarded": forwarded,
         }
 
-    try:
-        audio = AudioSegment.from_file(audio_path)
-        audio_bytes = audio.export(format="wav").read()
-    except Exception as e:
-        raise ValueError(
-            f"Error loading or converting generated audio file to wav file '{audio_path}': {e}"
-        )
-    audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
-    volumes = _get_volume_by_chunks(audio, chunk_length_ms)
+    if audio_data is None:
+        audio_data = load_audio_data(audio_path, audio_pcm, chunk_length_ms)
+    audio_bytes, volumes = audio_data
 
     payload = {
         "type": "audio",
-        "audio": audio_base64,
+        "audio": (
+            base64.b64encode(audio_bytes).decode("utf-8")
+            if encode_base64
+            else audio_bytes
+        ),
         "volumes": volumes,
         "slice_length": chunk_length_ms,
         "display_text": display_text,
@@ -82,5 +293,34 @@ def prepare_audio_payload(
     return payload
 
 
+def split_binary_audio_payload(
+    payload: dict[str, any], sequence_number: int
+) -> tuple[dict[str, any], bytes | None]:
+    """
+    Split an audio payload into the two frames of the binary protocol.
+
+    The header is a small JSON-serializable dict describing the audio; the raw
+    WAV bytes (if any) are sent right after it as a binary WebSocket frame.
+
+    Parameters:
+        payload (dict): Payload from `prepare_audio_payload(..., encode_base64=False)`
+        sequence_number (int): Position of the payload in the spoken response
+
+    Returns:
+        tuple: (header dict, audio bytes or None for silent display)
+    """
+    audio_bytes = payload.get("audio")
+    if isinstance(audio_bytes, str):
+        # Payload was built for the base64 protocol; decode it back
+        audio_bytes = base64.b64decode(audio_bytes)
+
+    header = {k: v for k, v in payload.items() if k != "audio"}
+    header["type"] = "audio-header" if audio_bytes else "audio"
+    header["audio"] = None
+    header["sequence"] = sequence_number
+    header["audio_length"] = len(audio_bytes) if audio_bytes else 0
+    return header, audio_bytes or None
+
+
 # Example usage:
 # payload, duration = prepare_audio_payload("path/to/audio.mp3", display_text="Hello", expression_list=[0,1,2])
@@ -0,0 +1,154 @@
+"""
+Per-turn latency tracing.
+
+A TurnTrace is started at the beginning of a conversation turn and stored in a
+context variable, so every stage of the turn (ASR, LLM, sentence division,
+TTS tasks, the payload sender) can timestamp itself with `trace_event` without
+the trace being threaded through every call. Tasks created with
+asyncio.create_task inherit the context, and therefore the trace.
+"""
+
+import statistics
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+
+@dataclass
+class TraceEvent:
+    stage: str
+    t_ms: float  # milliseconds since the start of the turn
+    detail: Dict[str, Any] = field(default_factory=dict)
+
+
+class TurnTrace:
+    """Timestamps of the stages of one conversation turn."""
+
+    def __init__(self, client_uid: str = "") -> None:
+        self.turn_id = uuid.uuid4().hex[:12]
+        self.client_uid = client_uid
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.events: List[TraceEvent] = []
+
+    def mark(self, stage: str, **detail: Any) -> None:
+        """Record that stage happened now."""
+        t_ms = (time.perf_counter() - self._t0) * 1000
+        self.events.append(TraceEvent(stage, round(t_ms, 2), detail))
+
+    def mark_once(self, stage: str, **detail: Any) -> None:
+        """Record stage only the first time it happens in this turn."""
+        if self.first(stage) is None:
+            self.mark(stage, **detail)
+
+    def first(self, stage: str, **match: Any) -> Optional[float]:
+        """Time (ms) of the first event of stage whose detail matches, or None."""
+        return next(
+            (
+                e.t_ms
+                for e in self.events
+                if e.stage == stage
+                and all(e.detail.get(k) == v for k, v in match.items())
+            ),
+            None,
+        )
+
+    def count(self, stage: str) -> int:
+        return sum(1 for e in self.events if e.stage == stage)
+
+    def summary(self) -> Dict[str, Any]:
+        """Headline latencies of the turn (ms, None if the stage never happened)."""
+        asr_start, asr_end = self.first("asr_start"), self.first("asr_end")
+        asr_ms = None
+        if asr_start is not None and asr_end is not None:
+            asr_ms = round(asr_end - asr_start, 2)
+        return {
+            "asr_ms": asr_ms,
+            "llm_first_token_ms": self.first("llm_first_token"),
+            "first_sentence_ms": self.first("sentence"),
+            "first_tts_done_ms": self.first("tts_end"),
+            "time_to_first_audio_ms": self.first("payload_sent", audio=True),
+            "total_ms": self.events[-1].t_ms if self.events else 0.0,
+            "sentences": self.count("sentence"),
+            "tts_requests": self.count("tts_start"),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "turn_id": self.turn_id,
+            "client_uid": self.client_uid,
+            "started_at": self.started_at,
+            "summary": self.summary(),
+            "events": [
+                {"stage": e.stage, "t_ms": e.t_ms, **e.detail} for e in self.events
+            ],
+        }
+
+
+class TurnTraceStats:
+    """Rolling aggregate of recent turn summaries."""
+
+    def __init__(self, max_turns: int = 200) -> None:
+        self._summaries: deque = deque(maxlen=max_turns)
+
+    def record(self, trace: TurnTrace) -> None:
+        self._summaries.append(trace.summary())
+
+    def percentiles(self, metric: str) -> Dict[str, Optional[float]]:
+        """p50/p95 of a summary metric over the recent turns."""
+        values = sorted(s[metric] for s in self._summaries if s.get(metric) is not None)
+        if not values:
+            return {"p50": None, "p95": None, "n": 0}
+        if len(values) == 1:
+            return {"p50": values[0], "p95": values[0], "n": 1}
+        cuts = statistics.quantiles(values, n=20, method="inclusive")
+        return {"p50": statistics.median(values), "p95": cuts[18], "n": len(values)}
+
+
+_current_trace: ContextVar[Optional[TurnTrace]] = ContextVar(
+    "current_turn_trace", default=None
+)
+turn_trace_stats = TurnTraceStats()
+
+
+def start_turn_trace(client_uid: str = "") -> TurnTrace:
+    """Start a trace for the current turn and make it the active one."""
+    trace = TurnTrace(client_uid)
+    _current_trace.set(trace)
+    return trace
+
+
+def get_turn_trace() -> Optional[TurnTrace]:
+    return _current_trace.get()
+
+
+def trace_event(stage: str, **detail: Any) -> None:
+    """Timestamp stage on the active turn trace, if any."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.mark(stage, **detail)
+
+
+def trace_event_once(stage: str, **detail: Any) -> None:
+    """Timestamp stage on the active turn trace unless already recorded."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.mark_once(stage, **detail)
+
+
+def finish_turn_trace(trace: TurnTrace) -> Dict[str, Any]:
+    """Log the turn, add it to the rolling stats and return its record."""
+    turn_trace_stats.record(trace)
+    summary = trace.summary()
+    ttfa = turn_trace_stats.percentiles("time_to_first_audio_ms")
+    logger.info(
+        f"⏱️ Turn {trace.turn_id}: "
+        + ", ".join(f"{k}={v}" for k, v in summary.items())
+        + f" | TTFA p50={ttfa['p50']} p95={ttfa['p95']} (n={ttfa['n']})"
+    )
+    return trace.to_dict()
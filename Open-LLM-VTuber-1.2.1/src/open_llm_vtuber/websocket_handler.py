@@ -20,8 +20,10 @@ from .chat_history_manager import (
     get_history,
     delete_history,
     get_history_list,
+    get_history_page,
 )
 from .config_manager.utils import scan_config_alts_directory, scan_bg_directory
+from .conversations.types import AUDIO_PROTOCOLS
 from .conversations.conversation_handler import (
     handle_conversation_trigger,
     handle_group_interrupt,
@@ -36,11 +38,12 @@ class MessageType(Enum):
     HISTORY = [
         "fetch-history-list",
         "fetch-and-set-history",
+        "fetch-history-page",
         "create-new-history",
         "delete-history",
     ]
     CONVERSATION = ["mic-audio-end", "text-input", "ai-speak-signal"]
-    CONFIG = ["fetch-configs", "switch-config"]
+    CONFIG = ["fetch-configs", "switch-config", "set-audio-protocol"]
     CONTROL = ["interrupt-signal", "audio-play-start"]
     DATA = ["mic-audio-data"]
 
@@ -56,6 +59,9 @@ class WSMessage(TypedDict, total=False):
     history_uid: Optional[str]
     file: Optional[str]
     display_text: Optional[dict]
+    protocol: Optional[str]
+    limit: Optional[int]
+    before: Optional[int]
 
 
 class WebSocketHandler:
@@ -81,6 +87,7 @@ class WebSocketHandler:
             "request-group-info": self._handle_group_info,
             "fetch-history-list": self._handle_history_list_request,
             "fetch-and-set-history": self._handle_fetch_history,
+            "fetch-history-page": self._handle_fetch_history_page,
             "create-new-history": self._handle_create_history,
             "delete-history": self._handle_delete_history,
             "interrupt-signal": self._handle_interrupt,
@@ -94,6 +101,7 @@ class WebSocketHandler:
             "fetch-backgrounds": self._handle_fetch_backgrounds,
             "audio-play-start": self._handle_audio_play_start,
             "request-init-config": self._handle_init_config_request,
+            "set-audio-protocol": self._handle_set_audio_protocol,
             "heartbeat": self._handle_heartbeat,
         }
 
@@ -191,11 +199,14 @@ class WebSocketHandler:
             live2d_model=self.default_context_cache.live2d_model,
             asr_engine=self.default_context_cache.asr_engine,
             tts_engine=self.default_context_cache.tts_engine,
+            tts_cache=self.default_context_cache.tts_cache,
+            history_writer=self.default_context_cache.history_writer,
             vad_engine=self.default_context_cache.vad_engine,
             agent_engine=self.default_context_cache.agent_engine,
             translate_engine=self.default_context_cache.translate_engine,
             mcp_server_registery=self.default_context_cache.mcp_server_registery,
             tool_adapter=self.default_context_cache.tool_adapter,
+            mcp_session_pool=self.default_context_cache.mcp_session_pool,
             send_text=send_text,
             client_uid=client_uid,
         )
@@ -299,7 +310,7 @@ class WebSocketHandler:
 
         # Clean up other client data
         self.client_connections.pop(client_uid, None)
-        self.client_contexts.pop(client_uid, None)
+        context = self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
         if client_uid in self.current_conversation_tasks:
             task = self.current_conversation_tasks[client_uid]
@@ -308,7 +319,6 @@ class WebSocketHandler:
             self.current_conversation_tasks.pop(client_uid, None)
 
         # Call context close to clean up resources (e.g., MCPClient)
-        context = self.client_contexts.get(client_uid)
         if context:
             await context.close()
 
@@ -391,12 +401,21 @@ class WebSocketHandler:
                 heard_response=heard_response,
             )
 
+    @staticmethod
+    async def _flush_history(context: ServiceContext) -> None:
+        """Make queued chat history writes visible before reading the files"""
+        if context.history_writer:
+            await context.history_writer.flush()
+
     async def _handle_history_list_request(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle request for chat history list"""
         context = self.client_contexts[client_uid]
-        histories = get_history_list(context.character_config.conf_uid)
+        await self._flush_history(context)
+        histories = await asyncio.to_thread(
+            get_history_list, context.character_config.conf_uid
+        )
         await websocket.send_text(
             json.dumps({"type": "history-list", "histories": histories})
         )
@@ -410,34 +429,83 @@ class WebSocketHandler:
             return
 
         context = self.client_contexts[client_uid]
+        await self._flush_history(context)
         # Update history_uid in service context
         context.history_uid = history_uid
-        context.agent_engine.set_memory_from_history(
+        await context.agent_engine.aset_memory_from_history(
             conf_uid=context.character_config.conf_uid,
             history_uid=history_uid,
         )
 
-        messages = [
-            msg
-            for msg in get_history(
+        # With a limit only the newest page is sent; older pages are
+        # requested with "fetch-history-page"
+        limit = data.get("limit")
+        if limit is not None:
+            page = await asyncio.to_thread(
+                get_history_page,
                 context.character_config.conf_uid,
                 history_uid,
+                limit,
+            )
+            await websocket.send_text(
+                json.dumps({"type": "history-data", **self._display_page(page)})
             )
-            if msg["role"] != "system"
-        ]
+            return
+
+        history = await asyncio.to_thread(
+            get_history, context.character_config.conf_uid, history_uid
+        )
+        messages = [msg for msg in history if msg["role"] != "system"]
         await websocket.send_text(
             json.dumps({"type": "history-data", "messages": messages})
         )
 
+    async def _handle_fetch_history_page(
+        self, websocket: WebSocket, client_uid: str, data: WSMessage
+    ) -> None:
+        """Handle fetching one page of a chat history without setting it"""
+        history_uid = data.get("history_uid")
+        if not history_uid:
+            return
+
+        context = self.client_contexts[client_uid]
+        await self._flush_history(context)
+        page = await asyncio.to_thread(
+            get_history_page,
+            context.character_config.conf_uid,
+            history_uid,
+            data.get("limit") or 50,
+            data.get("before"),
+        )
+        await websocket.send_text(
+            json.dumps(
+                {
+                    "type": "history-page",
+                    "history_uid": history_uid,
+                    **self._display_page(page),
+                }
+            )
+        )
+
+    @staticmethod
+    def _display_page(page: dict) -> dict:
+        """Drop system messages from a history page; positions are unchanged"""
+        return {
+            **page,
+            "messages": [msg for msg in page["messages"] if msg["role"] != "system"],
+        }
+
     async def _handle_create_history(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle creation of new chat history"""
         context = self.client_contexts[client_uid]
-        history_uid = create_new_history(context.character_config.conf_uid)
+        history_uid = await asyncio.to_thread(
+            create_new_history, context.character_config.conf_uid
+        )
         if history_uid:
             context.history_uid = history_uid
-            context.agent_engine.set_memory_from_history(
+            await context.agent_engine.aset_memory_from_history(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=history_uid,
             )
@@ -459,6 +527,8 @@ class WebSocketHandler:
             return
 
         context = self.client_contexts[client_uid]
+        # Queued messages would otherwise recreate the deleted file
+        await self._flush_history(context)
         success = delete_history(
             context.character_config.conf_uid,
             history_uid,
@@ -602,6 +672,28 @@ class WebSocketHandler:
             )
         )
 
+    async def _handle_set_audio_protocol(
+        self, websocket: WebSocket, client_uid: str, data: WSMessage
+    ) -> None:
+        """
+        Negotiate how TTS audio is delivered to this client.
+
+        "binary" sends a JSON "audio-header" frame followed by a raw WAV binary
+        frame; anything unsupported falls back to base64-in-JSON.
+        """
+        context = self.client_contexts[client_uid]
+        protocol = data.get("protocol", "base64")
+        if protocol not in AUDIO_PROTOCOLS:
+            logger.warning(f"Unsupported audio protocol '{protocol}', using base64")
+            protocol = "base64"
+
+        context.audio_protocol = protocol
+        context.send_bytes = websocket.send_bytes
+        logger.info(f"Audio protocol for client {client_uid}: {protocol}")
+        await websocket.send_text(
+            json.dumps({"type": "audio-protocol-set", "protocol": protocol})
+        )
+
     async def _handle_heartbeat(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
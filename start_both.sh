@@ -6,6 +6,8 @@
 # Default paths
 VITS2_DIR="/home/yujin/llm_partner/Hololive-Style-Bert-VITS2"
 OPEN_LLM_DIR="/home/yujin/llm_partner/Open-LLM-VTuber-1.2.1"
+# Voices kept resident in Bert-VITS2 (EN/JP models from conf.yaml bert_vits2_tts)
+PINNED_MODELS="SBV2_HoloHi SBV2_HoloJPTest3"
 
 # Parse arguments
 while [[ "$#" -gt 0 ]]; do
@@ -52,10 +54,10 @@ fi
 if [ -d ".venv" ]; then
     echo "Using .venv for Bert-VITS2"
     # 수정: .venv 환경의 python을 직접 사용하여 실행
-    ./.venv/bin/python app.py --server-name 0.0.0.0 --no-autolaunch --share &
+    ./.venv/bin/python app.py --server-name 0.0.0.0 --no-autolaunch --share --pin-models $PINNED_MODELS &
 else
     echo "Using system python3 for Bert-VITS2"
-    python3 app.py --server-name 0.0.0.0 --no-autolaunch --share &
+    python3 app.py --server-name 0.0.0.0 --no-autolaunch --share --pin-models $PINNED_MODELS &
 fi
 BERT_VITS2_PID=$!
 
@@ -0,0 +1,120 @@
+"""Partial-depth BERT feature extraction matches the full-model path.
+
+`text.bert_layers.load_feature_extractor` loads only the encoder layers up to
+`hidden_states[-3]`. Its `last_hidden_state` must equal, bit for bit, what
+`japanese_bert` / `english_bert_mock` used to take from a full model run with
+`output_hidden_states=True`.
+
+A tiny random DeBERTa-v2 is always checked. The real models under
+`Hololive-Style-Bert-VITS2/bert/` are checked too when their weights exist.
+"""
+
+import pathlib
+import sys
+import tempfile
+
+ROOT = pathlib.Path(__file__).parent / "Hololive-Style-Bert-VITS2"
+sys.path.insert(0, str(ROOT))
+
+import torch
+from transformers import (
+    AutoModel,
+    AutoModelForMaskedLM,
+    AutoTokenizer,
+    DebertaV2Config,
+    DebertaV2ForMaskedLM,
+    DebertaV2Model,
+    DebertaV2Tokenizer,
+)
+
+from text.bert_layers import feature_num_layers, load_feature_extractor
+
+MIN_WEIGHTS_BYTES = 1 << 20  # smaller files are LFS pointers
+
+
+def reference_features(model, inputs) -> torch.Tensor:
+    """The feature as computed before partial-depth loading."""
+    with torch.no_grad():
+        res = model(**inputs, output_hidden_states=True)
+        return torch.cat(res["hidden_states"][-3:-2], -1)[0]
+
+
+def partial_features(model, inputs) -> torch.Tensor:
+    with torch.no_grad():
+        return model(**inputs).last_hidden_state[0]
+
+
+def check_tiny_model() -> None:
+    config = DebertaV2Config(
+        vocab_size=128,
+        hidden_size=64,
+        num_hidden_layers=6,
+        num_attention_heads=4,
+        intermediate_size=128,
+        relative_attention=True,
+        pos_att_type=["p2c", "c2p"],
+        position_buckets=32,
+        max_relative_positions=-1,
+        position_biased_input=False,
+        norm_rel_ebd="layer_norm",
+        share_att_key=True,
+        conv_kernel_size=3,
+    )
+    torch.manual_seed(0)
+    full = DebertaV2ForMaskedLM(config).eval()
+    inputs = {
+        "input_ids": torch.randint(1, 128, (1, 23)),
+        "attention_mask": torch.ones(1, 23, dtype=torch.long),
+    }
+    with tempfile.TemporaryDirectory() as path:
+        full.save_pretrained(path)
+        assert feature_num_layers(path) == 4
+        partial = load_feature_extractor(AutoModel, path).eval()
+
+    assert len(partial.encoder.layer) == 4, len(partial.encoder.layer)
+    assert not hasattr(partial, "cls"), "MLM head was loaded"
+    expected = reference_features(full, inputs)
+    actual = partial_features(partial, inputs)
+    assert actual.shape == expected.shape, (actual.shape, expected.shape)
+    assert torch.equal(actual, expected), (actual - expected).abs().max()
+    print(f"tiny DeBERTa-v2: hidden_states[-3] identical, {actual.shape}")
+
+
+def check_real_model(name, full_cls, partial_cls, tokenizer_cls, text) -> None:
+    path = ROOT / "bert" / name
+    weights = path / "pytorch_model.bin"
+    if not weights.exists() or weights.stat().st_size < MIN_WEIGHTS_BYTES:
+        print(f"{name}: weights not downloaded, skipped")
+        return
+    tokenizer = tokenizer_cls.from_pretrained(str(path))
+    inputs = tokenizer(text, return_tensors="pt")
+    full = full_cls.from_pretrained(str(path)).eval()
+    expected = reference_features(full, inputs)
+    del full
+    partial = load_feature_extractor(partial_cls, str(path)).eval()
+    actual = partial_features(partial, inputs)
+    assert torch.equal(actual, expected), (actual - expected).abs().max()
+    print(f"{name}: hidden_states[-3] identical, {actual.shape}")
+
+
+def main() -> None:
+    check_tiny_model()
+    check_real_model(
+        "deberta-v2-large-japanese-char-wwm",
+        AutoModelForMaskedLM,
+        AutoModel,
+        AutoTokenizer,
+        "コンニチワ、キョウハイイテンキデスネ。",
+    )
+    check_real_model(
+        "deberta-v3-large",
+        DebertaV2Model,
+        DebertaV2Model,
+        DebertaV2Tokenizer,
+        "Hello there! This is a test of the partial-depth feature extractor.",
+    )
+    print("Partial-depth BERT parity checks passed.")
+
+
+if __name__ == "__main__":
+    main()
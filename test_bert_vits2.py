@@ -56,6 +56,7 @@ def test_connection():
             "",  # kata_tone_json_str
             False,  # use_tone
             "",  # speaker
+            "",  # job_id
             fn_index=16,
         )
         
@@ -0,0 +1,133 @@
+"""Sentences of one reply reach the Bert-VITS2 server together.
+
+The server (`app.py` `tts_fn_batch`) synthesizes the requests queued at the
+same time in one batch of up to `--max-batch-size`. Batches only exceed 1 if
+the VTuber has several sentences in flight, which the shared TTSScheduler
+allows up to `bert_vits2_tts.max_concurrency` (default 8).
+
+The offline check sends a reply's sentences through the scheduler to a fake
+Gradio queue and records how many jobs it held at once. With BERT_VITS2_URL
+set, the same is done against a live server (any configured voice, from
+BERT_VITS2_MODEL / BERT_VITS2_MODEL_PATH / BERT_VITS2_SPEAKER), whose
+/api/batch_stats/ must then report a batch larger than 1.
+"""
+
+import asyncio
+import json
+import os
+import pathlib
+import sys
+import uuid
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent / "Open-LLM-VTuber-1.2.1" / "src"))
+
+import httpx
+from loguru import logger
+
+from open_llm_vtuber.tts.bert_vits2_tts import TTSEngine
+from open_llm_vtuber.tts.tts_scheduler import get_tts_scheduler
+
+logger.remove()
+
+SENTENCES = [
+    "Hello there!",
+    "This is the second sentence.",
+    "And here comes the third one.",
+    "The fourth sentence is a little longer than the others.",
+    "Five.",
+    "Six sentences in a single reply.",
+]
+
+
+class FakeGradioQueue:
+    """Answers /queue/join and /queue/data, counting jobs held at once."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/queue/join":
+            return httpx.Response(200, json={"event_id": uuid.uuid4().hex})
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        message = {
+            "msg": "process_completed",
+            "success": True,
+            "output": {"data": ["Success", {"path": "/tmp/a.wav"}, ""]},
+        }
+        return httpx.Response(200, content=f"data: {json.dumps(message)}\n\n")
+
+
+async def speak_reply(engine: TTSEngine) -> None:
+    """Synthesize SENTENCES the way TTSTaskManager does, one task each."""
+    scheduler = get_tts_scheduler(engine)
+
+    async def speak(sequence: int, text: str) -> None:
+        data = engine._prepare_request(text)
+        async with scheduler.slot(sequence):
+            await engine._async_predict(fn_index=16, data=data)
+
+    await asyncio.gather(*(speak(i, text) for i, text in enumerate(SENTENCES)))
+
+
+async def peak_jobs(max_concurrency: int) -> int:
+    fake = FakeGradioQueue()
+    engine = TTSEngine(
+        client_url="http://bert-vits2",
+        auto_detect_language=False,
+        en={"model_name": "m", "model_path": "m.safetensors", "speaker": "s"},
+        max_concurrency=max_concurrency,
+    )
+    engine._async_http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(fake.handle)
+    )
+    await speak_reply(engine)
+    await engine.aclose()
+    return fake.peak
+
+
+async def check_offline() -> None:
+    assert await peak_jobs(1) == 1
+    default = TTSEngine(client_url="http://bert-vits2").max_concurrency
+    peak = await peak_jobs(default)
+    print(f"fake queue: {peak} of {len(SENTENCES)} sentences queued at once")
+    assert peak == min(default, len(SENTENCES)), peak
+
+
+async def check_live(url: str) -> None:
+    engine = TTSEngine(
+        client_url=url,
+        auto_detect_language=False,
+        en={
+            "model_name": os.environ["BERT_VITS2_MODEL"],
+            "model_path": os.environ["BERT_VITS2_MODEL_PATH"],
+            "speaker": os.environ["BERT_VITS2_SPEAKER"],
+        },
+        line_split=True,  # the config default; single lines still batch
+    )
+    await speak_reply(engine)
+    response = await engine._get_async_http_client().post(
+        f"{url.rstrip('/')}/api/batch_stats/", json={"data": []}
+    )
+    response.raise_for_status()
+    sizes = response.json()["data"][0]
+    await engine.aclose()
+    print(f"live server batch sizes: {sizes}")
+    assert max(int(size) for size in sizes) > 1, sizes
+
+
+def main() -> None:
+    asyncio.run(check_offline())
+    url = os.environ.get("BERT_VITS2_URL")
+    if url:
+        asyncio.run(check_live(url))
+    else:
+        print("BERT_VITS2_URL not set; live server check skipped")
+    print("Bert-VITS2 batching checks passed.")
+
+
+if __name__ == "__main__":
+    main()
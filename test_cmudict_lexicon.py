@@ -0,0 +1,87 @@
+"""The memory-mapped CMU lexicon matches the dictionary it replaces.
+
+`text.english` used to unpickle `cmudict_cache.pickle`, which was built from
+`cmudict.rep` by `read_dict`. The lexicon is compiled from the same file; the
+check compares every word against the pickle (or against a fresh parse of
+`cmudict.rep` when the pickle is only a Git LFS pointer) and checks lookups
+of words that are not in it.
+"""
+
+import os
+import pathlib
+import pickle
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).parent / "Hololive-Style-Bert-VITS2"
+sys.path.insert(0, str(ROOT))
+
+from text.cmudict_lexicon import CmuLexicon, build_lexicon, load_lexicon, read_rep
+
+REP_PATH = ROOT / "text" / "cmudict.rep"
+PICKLE_PATH = ROOT / "text" / "cmudict_cache.pickle"
+
+
+def reference_dict() -> dict:
+    with open(PICKLE_PATH, "rb") as f:
+        head = f.read(64)
+    if head.startswith(b"version https://git-lfs"):
+        print("cmudict_cache.pickle is an LFS pointer; comparing with cmudict.rep")
+        return read_rep(str(REP_PATH))
+    with open(PICKLE_PATH, "rb") as f:
+        reference = pickle.load(f)
+    assert reference == read_rep(str(REP_PATH)), "pickle and cmudict.rep differ"
+    return reference
+
+
+def check_parity(lexicon: CmuLexicon, reference: dict) -> None:
+    assert len(lexicon) == len(reference), (len(lexicon), len(reference))
+    assert set(lexicon) == set(reference)
+    for word, syllables in reference.items():
+        assert word in lexicon, word
+        assert lexicon[word] == syllables, (word, lexicon[word], syllables)
+    print(f"{len(reference)} words identical")
+
+
+def check_misses(lexicon: CmuLexicon, reference: dict) -> None:
+    for word in ["", "HOLOLIVEZ", "A" * 40, "ZZZZZZZ", "hello", "ÄPFEL"]:
+        assert word not in reference
+        assert word not in lexicon, word
+        assert lexicon.get(word) is None
+    first, last = min(reference), max(reference)
+    assert lexicon[first] == reference[first] and lexicon[last] == reference[last]
+    try:
+        lexicon["NOT-A-WORD-AT-ALL"]
+        raise AssertionError("missing word did not raise KeyError")
+    except KeyError:
+        pass
+
+
+def check_lookup_speed(lexicon: CmuLexicon, reference: dict) -> None:
+    words = list(reference)[::50]
+    start = time.perf_counter()
+    for word in words:
+        lexicon.get(word)
+    per_lookup = (time.perf_counter() - start) / len(words) * 1e6
+    print(f"lookup: {per_lookup:.1f} us per word")
+
+
+def main() -> None:
+    reference = reference_dict()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cmudict.lex")
+        count = build_lexicon(str(REP_PATH), path)
+        assert count == len(reference), (count, len(reference))
+        print(f"lexicon: {os.path.getsize(path)} bytes on disk")
+
+        lexicon = load_lexicon(path, str(REP_PATH))
+        check_parity(lexicon, reference)
+        check_misses(lexicon, reference)
+        check_lookup_speed(lexicon, reference)
+        lexicon.close()
+    print("CMU lexicon parity checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""StreamJSONDetector correctness checks and per-chunk cost benchmark."""
+
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent / "Open-LLM-VTuber-1.2.1" / "src"))
+
+from loguru import logger
+
+from open_llm_vtuber.mcpp.json_detector import StreamJSONDetector
+
+logger.remove()
+
+
+def feed(chunks):
+    detector = StreamJSONDetector()
+    found = []
+    for chunk in chunks:
+        found.extend(detector.process_chunk(chunk))
+    return found, detector
+
+
+def check_correctness() -> None:
+    # Example from the module: objects split across chunks, nested object
+    found, detector = feed(
+        [
+            "This is some plain text ",
+            "Here comes JSON: {",
+            '"name": "test", "values": [1, 2, ',
+            '3]} This is text after JSON {"another": "json", ',
+            '"nested": {"key": "value"}}',
+        ]
+    )
+    assert found == [
+        {"name": "test", "values": [1, 2, 3]},
+        {"another": "json", "nested": {"key": "value"}},
+    ], found
+    assert detector.get_all_jsons() == found
+
+    # Braces inside strings do not end the object
+    found, _ = feed(['{"tool": "echo", "args": {"text": "a } b { c"}}'])
+    assert found == [{"tool": "echo", "args": {"text": "a } b { c"}}], found
+
+    # Escaped quotes inside strings
+    found, _ = feed(['{"q": "say \\"hi\\" }"', "}"])
+    assert found == [{"q": 'say "hi" }'}], found
+
+    # Invalid outer object falls back to the valid inner one
+    found, _ = feed(["{not json ", '{"a": 1}', "}"])
+    assert found == [{"a": 1}], found
+
+    # An unmatched "{" in prose does not hide a later tool call
+    found, _ = feed(["I like {braces. ", '{"name": "x"}'])
+    assert found == [{"name": "x"}], found
+
+    # A candidate the model never closes does not hide a later tool call
+    found, detector = feed(
+        [
+            'Sure {"name": "x", oops I stopped. ',
+            'Now the call: {"tool": "t", "args": {}}',
+            " done",
+        ]
+    )
+    assert found == [{"tool": "t", "args": {}}], found
+    assert detector.buffer == "", detector.buffer
+
+    # Objects closed inside a stale candidate are still reported
+    found, _ = feed(['{"a": {"b": 1}, ', "and then prose"])
+    assert found == [{"b": 1}], found
+
+    # A quoted "{" in prose does not hide a tool call after it
+    found, _ = feed(['outer "{" {"a":1}'])
+    assert found == [{"a": 1}], found
+    found, _ = feed(['Type "{" then ', 'call {"tool": "t", "args": {"x": "y"}}', " ok"])
+    assert found == [{"tool": "t", "args": {"x": "y"}}], found
+
+    # A candidate open for too long is dropped and the buffer stays bounded
+    detector = StreamJSONDetector(max_object_chars=1000)
+    detector.process_chunk('{"log": [')
+    for _ in range(2000):
+        assert detector.process_chunk("1, ") == []
+        assert len(detector.buffer) <= 1000 + 3, len(detector.buffer)
+    assert detector.process_chunk('{"tool": "t"}') == [{"tool": "t"}]
+
+    # One character at a time
+    text = 'pre {"a": [1, {"b": 2}]} mid {"c": "}"} post'
+    found, _ = feed(list(text))
+    assert found == [{"a": [1, {"b": 2}]}, {"c": "}"}], found
+
+    # reset() starts over
+    detector = StreamJSONDetector()
+    detector.process_chunk('{"a": ')
+    detector.reset()
+    assert detector.process_chunk('{"b": 2}') == [{"b": 2}]
+
+
+def per_chunk_cost(n_chunks: int, chunk: str, prefix: str = "") -> float:
+    """Average seconds per process_chunk over the last 1000 chunks of a stream."""
+    detector = StreamJSONDetector()
+    detector.process_chunk(prefix)
+    for _ in range(n_chunks - 1000):
+        detector.process_chunk(chunk)
+    start = time.perf_counter()
+    for _ in range(1000):
+        detector.process_chunk(chunk)
+    return (time.perf_counter() - start) / 1000
+
+
+def benchmark() -> None:
+    # Plain streamed reply, and one where an object stays open the whole time
+    for label, prefix, chunk in (
+        ("closed", "", 'word {"k": 1} text, '),
+        ("open", '{"log": [', '{"k": 1}, 2, '),
+    ):
+        short = per_chunk_cost(2_000, chunk, prefix)
+        long = per_chunk_cost(50_000, chunk, prefix)
+        print(
+            f"per-chunk cost ({label}): 2k chunks {short * 1e6:.1f} us"
+            f" | 50k chunks {long * 1e6:.1f} us"
+        )
+        # Quadratic behaviour would make the long stream ~25x slower per chunk
+        assert long < short * 3, "per-chunk cost grows with response length"
+
+
+def main() -> None:
+    check_correctness()
+    benchmark()
+    print("StreamJSONDetector checks passed.")
+
+
+if __name__ == "__main__":
+    main()
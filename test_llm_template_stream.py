@@ -0,0 +1,208 @@
+"""AsyncLLMWithTemplate streaming against a local fake completion server.
+
+The fake server speaks the llama.cpp `/completion` streaming format and
+sleeps between tokens like a real model. The checks show that:
+- tokens arrive in order and the stream stops at the EOT token,
+- other coroutines (other sessions, VAD, TTS delivery) keep running while
+  a completion is streaming,
+- several sessions stream concurrently instead of one after another,
+- cancelling the consumer closes the connection, so the server stops.
+"""
+
+import asyncio
+import json
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent / "Open-LLM-VTuber-1.2.1" / "src"))
+
+from loguru import logger
+
+from open_llm_vtuber.agent.stateless_llm.stateless_llm_with_template import (
+    AsyncLLMWithTemplate,
+)
+
+logger.remove()
+
+TOKEN_DELAY = 0.02
+N_TOKENS = 40
+
+
+class FakeCompletionServer:
+    """Minimal HTTP/1.1 server streaming `data: {...}` lines, chunked."""
+
+    def __init__(self) -> None:
+        self.finished = 0  # streams written to the end
+        self.disconnected = 0  # streams abandoned by the client
+        self.active = 0  # streams being written
+        self._server = None
+        self.port = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer) -> None:
+        try:
+            while await self._serve_one(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _client_gone(reader, writer) -> bool:
+        # A close with unread data arrives as a reset rather than an EOF
+        return reader.at_eof() or reader.exception() is not None or writer.is_closing()
+
+    async def _serve_one(self, reader, writer) -> bool:
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for header in head.decode().split("\r\n"):
+            if header.lower().startswith("content-length:"):
+                length = int(header.split(":", 1)[1])
+        json.loads(await reader.readexactly(length))
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        chunks = [{"content": f"t{i} ", "stop": False} for i in range(N_TOKENS)]
+        chunks += [{"content": "<|im_end|>", "stop": False}, {"content": "", "stop": True}]
+        self.active += 1
+        try:
+            for chunk in chunks:
+                await asyncio.sleep(TOKEN_DELAY)
+                if self._client_gone(reader, writer):
+                    # The client hung up: a real server aborts the generation
+                    self.disconnected += 1
+                    return False
+                line = f"data: {json.dumps(chunk)}\n\n".encode()
+                writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except ConnectionError:
+            self.disconnected += 1
+            return False
+        finally:
+            self.active -= 1
+        if self._client_gone(reader, writer):
+            self.disconnected += 1
+            return False
+        self.finished += 1
+        return True
+
+
+def make_llm(server: FakeCompletionServer) -> AsyncLLMWithTemplate:
+    return AsyncLLMWithTemplate(
+        model="fake",
+        base_url=f"http://127.0.0.1:{server.port}/completion",
+        template="CHATML",
+    )
+
+
+async def collect(llm: AsyncLLMWithTemplate) -> list:
+    return [t async for t in llm.chat_completion([{"role": "user", "content": "hi"}])]
+
+
+async def check_stream(server) -> None:
+    llm = make_llm(server)
+    tokens = await collect(llm)
+    assert tokens == [f"t{i} " for i in range(N_TOKENS)], tokens
+    await llm.close()
+
+
+async def check_event_loop_not_blocked(server) -> None:
+    """A heartbeat standing in for other sessions keeps its cadence."""
+    llm = make_llm(server)
+    gaps = []
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    await collect(llm)
+    stop.set()
+    await beat
+    worst = max(gaps) * 1000
+    print(f"heartbeat during streaming: worst gap {worst:.1f} ms over {len(gaps)} beats")
+    # A blocking read would stall the loop for a whole token delay (20 ms) per token
+    assert worst < TOKEN_DELAY * 1000, "event loop stalled while streaming"
+    await llm.close()
+
+
+async def check_concurrent_sessions(server) -> None:
+    llm = make_llm(server)  # engines are shared by every session
+    start = time.perf_counter()
+    results = await asyncio.gather(*(collect(llm) for _ in range(4)))
+    elapsed = time.perf_counter() - start
+    one_stream = TOKEN_DELAY * (N_TOKENS + 1)
+    print(f"4 concurrent sessions: {elapsed:.2f} s (one stream ~{one_stream:.2f} s)")
+    assert all(len(r) == N_TOKENS for r in results)
+    assert elapsed < one_stream * 2, "sessions were served one after another"
+    await llm.close()
+
+
+async def check_cancel_closes_stream(server) -> None:
+    llm = make_llm(server)
+    received = []
+
+    async def consume():
+        async for token in llm.chat_completion([{"role": "user", "content": "hi"}]):
+            received.append(token)
+
+    async def wait_for(condition) -> None:
+        for _ in range(100):
+            if condition():
+                return
+            await asyncio.sleep(TOKEN_DELAY)
+
+    # Streams left by the earlier checks (stopped at EOT) settle first
+    await wait_for(lambda: server.active == 0)
+    before = server.disconnected
+    task = asyncio.create_task(consume())
+    await wait_for(lambda: len(received) >= 5)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    # The server notices within a token interval
+    await wait_for(lambda: server.active == 0)
+    assert 0 < len(received) < N_TOKENS, received
+    assert server.disconnected == before + 1, "server kept generating after cancel"
+    await llm.close()
+
+
+async def run() -> None:
+    server = FakeCompletionServer()
+    await server.start()
+    try:
+        await check_stream(server)
+        await check_event_loop_not_blocked(server)
+        await check_concurrent_sessions(server)
+        await check_cancel_closes_stream(server)
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    asyncio.run(run())
+    print("AsyncLLMWithTemplate streaming checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""SentenceDivider output checks and a 2k-token streaming microbenchmark."""
+
+import asyncio
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent / "Open-LLM-VTuber-1.2.1" / "src"))
+
+from loguru import logger
+
+from open_llm_vtuber.utils.sentence_divider import SentenceDivider
+
+logger.remove()
+
+
+async def _stream(tokens):
+    for token in tokens:
+        yield token
+
+
+async def divide(tokens, **kwargs):
+    divider = SentenceDivider(**kwargs)
+    return [
+        (s.text, [str(t) for t in s.tags])
+        async for s in divider.process_stream(_stream(tokens))
+    ]
+
+
+def tokenize(text: str) -> list:
+    """Split text into word-sized tokens the way an LLM stream arrives."""
+    return [t + " " for t in text.split(" ")]
+
+
+def check_output() -> None:
+    tokens = tokenize(
+        "Hello there, my friend. I am fine! <think>Let me think. Hmm.</think> "
+        "Dr. Smith paid 3.5 dollars... Then left."
+    )
+    result = asyncio.run(divide(tokens, faster_first_response=True))
+    texts = [text for text, _ in result]
+    assert texts[0] == "Hello there,", texts
+    assert "<think>" in texts and "</think>" in texts, texts
+    assert ("Let me think.", ["think:inside"]) in result, result
+    assert texts[-1] == "Then left.", texts
+
+    # Tags split across tokens are still detected
+    result = asyncio.run(
+        divide(["Ok. <th", "ink>inner", " text.</", "think> done."], segment_method="regex")
+    )
+    assert ("inner text.", ["think:inside"]) in result, result
+    assert result[-1] == ("done.", ["none"]), result
+
+
+def per_token_us(tokens) -> float:
+    start = time.perf_counter()
+    asyncio.run(divide(tokens, faster_first_response=False))
+    return (time.perf_counter() - start) / len(tokens) * 1e6
+
+
+def benchmark() -> None:
+    # Run-on output with no sentence end (a long comma list, a long <think>
+    # block) is the worst case for re-scanning the pending buffer per token
+    no_end = tokenize(" ".join(f"word{i}, and then" for i in range(700)))
+    thinking = ["<think>"] + tokenize(
+        " ".join(f"considering option {i} and" for i in range(600))
+    )
+    prose = tokenize(" ".join("This is a normal sentence." for _ in range(400)))
+
+    for label, tokens in (("no-end", no_end), ("think", thinking)):
+        short = per_token_us(tokens[:500])
+        long = per_token_us(tokens[:2000])
+        print(f"{label}: 500 tokens {short:.1f} us/token | 2000 tokens {long:.1f} us/token")
+        # Re-scanning the whole buffer would make 2k tokens ~4x slower per token
+        assert long < short * 2, "per-token cost grows with pending text length"
+
+    print(f"prose: 2000 tokens {per_token_us(prose[:2000]):.0f} us/token")
+
+
+def main() -> None:
+    check_output()
+    benchmark()
+    print("SentenceDivider checks passed.")
+
+
+if __name__ == "__main__":
+    main()